@@ -7,35 +7,41 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# Add the src directory to the path so we can import our models
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-# Import your models here so Alembic can detect them
-from app.models.base import Base
-from app.models import User  # Import all your models
-
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-# Get database URL from app config (which handles dynaconf + .env)
-from app.config import settings
-from app.database import db_url
+# When the app migrates in-process (app/migrations.py) it passes its own
+# connection and metadata, and keeps its logging configuration.
+target_metadata = config.attributes.get("target_metadata")
 
-if db_url:
-    config.set_main_option("sqlalchemy.url", db_url)
-else:
-    raise RuntimeError("DATABASE_URL not configured. Please set it in .secrets.toml or environment variables.")
+if target_metadata is None:
+    # Add the src directory to the path so we can import our models
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+    # Import your models here so Alembic can detect them
+    from app.models.base import Base
+    from app.models import User  # Import all your models
+
+    # This tells Alembic about all your models
+    target_metadata = Base.metadata
+
+if config.attributes.get("connection") is None:
+    # Get database URL from app config (which handles dynaconf + .env)
+    from app.database import db_url
+
+    if db_url:
+        config.set_main_option("sqlalchemy.url", db_url)
+    else:
+        raise RuntimeError("DATABASE_URL not configured. Please set it in .secrets.toml or environment variables.")
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
-# for 'autogenerate' support
-# This tells Alembic about all your models
-target_metadata = Base.metadata
+# for 'autogenerate' support (target_metadata above)
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -74,6 +80,11 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -81,12 +92,16 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        do_run_migrations(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
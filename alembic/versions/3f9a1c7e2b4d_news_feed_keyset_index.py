@@ -0,0 +1,45 @@
+"""news_feed_keyset_index
+
+Revision ID: 3f9a1c7e2b4d
+Revises: d8fca14cd7d8
+Create Date: 2026-10-18 09:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e2b4d'
+down_revision: Union[str, Sequence[str], None] = 'd8fca14cd7d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partial index for keyset pagination of the live news feed.
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_news_feed',
+            'news',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_news_feed',
+            table_name='news',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
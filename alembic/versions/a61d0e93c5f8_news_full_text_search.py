@@ -0,0 +1,103 @@
+"""news_full_text_search
+
+Revision ID: a61d0e93c5f8
+Revises: 3f9a1c7e2b4d
+Create Date: 2026-10-18 10:02:47.881309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d0e93c5f8'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7e2b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows re-indexed per committed batch during the backfill
+BACKFILL_BATCH_SIZE = 5000
+
+# Must match TEXT_SEARCH_CONFIGS in app/services/news_service.py
+SEARCH_CONFIG_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_search_config(lang text) RETURNS regconfig AS $$
+    SELECT CASE lower(coalesce(lang, 'en'))
+        WHEN 'en' THEN 'english'
+        WHEN 'es' THEN 'spanish'
+        WHEN 'fr' THEN 'french'
+        WHEN 'de' THEN 'german'
+        WHEN 'it' THEN 'italian'
+        WHEN 'pt' THEN 'portuguese'
+        WHEN 'ru' THEN 'russian'
+        ELSE 'simple'
+    END::regconfig
+$$ LANGUAGE sql STABLE;
+"""
+
+SEARCH_DOCUMENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_search_document(lang text, headline text, content text) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector(news_search_config(lang), coalesce(headline, '')), 'A')
+        || setweight(to_tsvector(news_search_config(lang), coalesce(content, '')), 'B')
+$$ LANGUAGE sql STABLE;
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := news_search_document(NEW.language, NEW.headline, NEW.content);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER = """
+CREATE TRIGGER news_search_vector_trg
+    BEFORE INSERT OR UPDATE OF headline, content, language ON news
+    FOR EACH ROW EXECUTE FUNCTION news_search_vector_update();
+"""
+
+BACKFILL_BATCH = sa.text("""
+UPDATE news SET search_vector = news_search_document(language, headline, content)
+WHERE id IN (SELECT id FROM news WHERE search_vector IS NULL LIMIT :batch_size)
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('news', sa.Column('language', sa.String(length=10), server_default='en', nullable=False))
+    op.add_column('news', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(SEARCH_CONFIG_FUNCTION)
+    op.execute(SEARCH_DOCUMENT_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(TRIGGER)
+
+    # Backfill existing rows in short committed batches so a large table is
+    # never locked by one long UPDATE; new writes are covered by the trigger.
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while conn.execute(BACKFILL_BATCH, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+        op.create_index(
+            'ix_news_search_vector',
+            'news',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_news_search_vector', table_name='news', postgresql_using='gin')
+    op.execute('DROP TRIGGER IF EXISTS news_search_vector_trg ON news')
+    op.execute('DROP FUNCTION IF EXISTS news_search_vector_update()')
+    op.execute('DROP FUNCTION IF EXISTS news_search_document(text, text, text)')
+    op.execute('DROP FUNCTION IF EXISTS news_search_config(text)')
+    op.drop_column('news', 'search_vector')
+    op.drop_column('news', 'language')
@@ -0,0 +1,80 @@
+"""news_embedding_vector_index
+
+Revision ID: b7e2d4f91c36
+Revises: a61d0e93c5f8
+Create Date: 2026-10-18 11:20:05.318842
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4f91c36'
+down_revision: Union[str, Sequence[str], None] = 'a61d0e93c5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_DIM = 1536
+
+
+def _use_pgvector(bind) -> bool:
+    # Same switch as app/models/news.py; without the extension the column stays JSONB
+    if os.getenv("USE_PGVECTOR", "false").lower() != "true":
+        return False
+    return bind.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")).scalar() is not None
+
+
+def _embedding_type(bind) -> str:
+    return bind.execute(sa.text(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = 'news'::regclass AND attname = 'embedding'"
+    )).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if not _use_pgvector(bind):
+        # JSONB mode ranks in-process (app/services/embedding_index.py)
+        return
+
+    # The initial schema created embedding as JSONB; JSON arrays parse as vectors
+    # and JSON nulls become SQL NULL. This rewrites the table under an exclusive lock.
+    if not _embedding_type(bind).startswith('vector'):
+        op.execute(
+            f"ALTER TABLE news ALTER COLUMN embedding TYPE vector({EMBEDDING_DIM}) "
+            "USING CASE WHEN jsonb_typeof(embedding) = 'array' THEN embedding::text::vector END"
+        )
+
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_news_embedding_hnsw',
+            'news',
+            ['embedding'],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_news_embedding_hnsw',
+            table_name='news',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    if _embedding_type(bind).startswith('vector'):
+        op.execute("ALTER TABLE news ALTER COLUMN embedding TYPE jsonb USING embedding::text::jsonb")
@@ -0,0 +1,101 @@
+"""news_embedding_binary_storage
+
+Revision ID: c4d8e2a7f913
+Revises: b7e2d4f91c36
+Create Date: 2026-10-18 12:41:19.073265
+
+Adds news.embedding_bin, the bytea column used when EMBEDDING_STORAGE is
+float32 or float16, and fills it from the JSONB embedding online:
+
+1. Add the nullable column (no table rewrite).
+2. Install a trigger that packs every JSONB embedding written by app
+   instances still running in jsonb mode, so no write is missed while
+   the rollout is in progress.
+3. Backfill existing rows in short committed batches.
+
+Once every instance runs with EMBEDDING_STORAGE=float32/float16, the JSONB
+column and the trigger can be dropped in a follow-up migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2a7f913'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4f91c36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows packed per committed batch during the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+# Big-endian float32 bytes, the layout app/models/types.py PackedVector decodes
+PACK_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_embedding_pack(embedding jsonb) RETURNS bytea AS $$
+    SELECT string_agg(float4send(x::float4), ''::bytea ORDER BY ord)
+    FROM jsonb_array_elements_text(embedding) WITH ORDINALITY AS t(x, ord)
+    WHERE jsonb_typeof(embedding) = 'array'
+$$ LANGUAGE sql IMMUTABLE;
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_embedding_bin_update() RETURNS trigger AS $$
+BEGIN
+    IF NEW.embedding IS NOT NULL THEN
+        NEW.embedding_bin := news_embedding_pack(NEW.embedding);
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER = """
+CREATE TRIGGER news_embedding_bin_trg
+    BEFORE INSERT OR UPDATE OF embedding ON news
+    FOR EACH ROW EXECUTE FUNCTION news_embedding_bin_update();
+"""
+
+BACKFILL_BATCH = sa.text("""
+UPDATE news SET embedding_bin = news_embedding_pack(embedding)
+WHERE id IN (
+    SELECT id FROM news
+    WHERE embedding_bin IS NULL AND jsonb_typeof(embedding) = 'array' AND embedding <> '[]'::jsonb
+    LIMIT :batch_size
+)
+""")
+
+
+def _embedding_is_jsonb(bind) -> bool:
+    # With pgvector (b7e2d4f91c36) the column is vector and nothing needs packing
+    return bind.execute(sa.text(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = 'news'::regclass AND attname = 'embedding'"
+    )).scalar() == 'jsonb'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('news', sa.Column('embedding_bin', sa.LargeBinary(), nullable=True))
+    if not _embedding_is_jsonb(op.get_bind()):
+        return
+
+    op.execute(PACK_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(TRIGGER)
+
+    # Short committed batches, so a large table is never locked by one long
+    # UPDATE; new JSONB writes are covered by the trigger.
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while conn.execute(BACKFILL_BATCH, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS news_embedding_bin_trg ON news')
+    op.execute('DROP FUNCTION IF EXISTS news_embedding_bin_update()')
+    op.execute('DROP FUNCTION IF EXISTS news_embedding_pack(jsonb)')
+    op.drop_column('news', 'embedding_bin')
@@ -0,0 +1,191 @@
+"""news_location_tagging
+
+Revision ID: e3b7c1d9a4f2
+Revises: c4d8e2a7f913
+Create Date: 2026-10-18 15:06:52.418907
+
+Tags news with a location and precomputes location paths for the local feed:
+
+1. Add news.location_id, news.location_ancestors and locations.ancestor_ids
+   (nullable, no table rewrite), and the news.location_id foreign key as
+   NOT VALID, then validate it in its own step, which scans news without
+   blocking writes.
+2. Build the GIN index on news.location_ancestors and the btree on
+   news.location_id concurrently.
+3. Install the triggers that keep the paths current: a location's
+   ancestor_ids is [state, district, self], matched by the state and
+   district strings; news copy it on write, and adding a state or district
+   row (or changing a path) refreshes the rows below it.
+4. Backfill locations.ancestor_ids in short committed batches. News has no
+   tagged rows yet, so it needs no backfill.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7c1d9a4f2'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2a7f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ADD_FOREIGN_KEY = """
+ALTER TABLE news ADD CONSTRAINT news_location_id_fkey
+    FOREIGN KEY (location_id) REFERENCES locations (id) NOT VALID
+"""
+
+# Locations filled per committed batch during the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+# State row: no district and no mandal_or_village; district row: no
+# mandal_or_village. Outermost first, ending with the row itself.
+ANCESTORS_FUNCTION = """
+CREATE OR REPLACE FUNCTION locations_ancestors_update() RETURNS trigger AS $$
+BEGIN
+    NEW.ancestor_ids := ARRAY(
+        SELECT l.id FROM locations l
+        WHERE l.state = NEW.state
+          AND l.id <> NEW.id
+          AND l.mandal_or_village IS NULL
+          AND (
+              (l.district IS NULL AND (NEW.district IS NOT NULL OR NEW.mandal_or_village IS NOT NULL))
+              OR (l.district = NEW.district AND NEW.mandal_or_village IS NOT NULL)
+          )
+        ORDER BY l.district NULLS FIRST
+    ) || NEW.id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+ANCESTORS_TRIGGER = """
+CREATE TRIGGER locations_ancestors_trg
+    BEFORE INSERT OR UPDATE OF state, district, mandal_or_village ON locations
+    FOR EACH ROW EXECUTE FUNCTION locations_ancestors_update();
+"""
+
+# Rows inserted before their state or district row pick it up once it exists
+DESCENDANTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION locations_descendants_refresh() RETURNS trigger AS $$
+BEGIN
+    IF NEW.mandal_or_village IS NULL THEN
+        UPDATE locations SET state = state
+        WHERE state = NEW.state AND id <> NEW.id
+          AND (NEW.district IS NULL OR district = NEW.district);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DESCENDANTS_TRIGGER = """
+CREATE TRIGGER locations_descendants_trg
+    AFTER INSERT ON locations
+    FOR EACH ROW EXECUTE FUNCTION locations_descendants_refresh();
+"""
+
+# Served by ix_news_location_id
+NEWS_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION locations_news_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE news SET location_ancestors = NEW.ancestor_ids WHERE location_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+NEWS_REFRESH_TRIGGER = """
+CREATE TRIGGER locations_news_refresh_trg
+    AFTER UPDATE ON locations
+    FOR EACH ROW WHEN (OLD.ancestor_ids IS DISTINCT FROM NEW.ancestor_ids)
+    EXECUTE FUNCTION locations_news_refresh();
+"""
+
+NEWS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_location_ancestors_update() RETURNS trigger AS $$
+BEGIN
+    NEW.location_ancestors := (SELECT ancestor_ids FROM locations WHERE id = NEW.location_id);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+NEWS_TRIGGER = """
+CREATE TRIGGER news_location_ancestors_trg
+    BEFORE INSERT OR UPDATE OF location_id ON news
+    FOR EACH ROW EXECUTE FUNCTION news_location_ancestors_update();
+"""
+
+# Touching state fires locations_ancestors_trg, which fills ancestor_ids
+BACKFILL_BATCH = sa.text("""
+UPDATE locations SET state = state
+WHERE id IN (SELECT id FROM locations WHERE ancestor_ids IS NULL LIMIT :batch_size)
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('locations', sa.Column('ancestor_ids', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True))
+    op.add_column('news', sa.Column('location_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('news', sa.Column('location_ancestors', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True))
+    # Checked for new writes right away; existing rows are validated below
+    op.execute(ADD_FOREIGN_KEY)
+
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # SHARE UPDATE EXCLUSIVE: reads and writes continue during the scan
+        op.execute('ALTER TABLE news VALIDATE CONSTRAINT news_location_id_fkey')
+        op.create_index(
+            'ix_news_location_ancestors',
+            'news',
+            ['location_ancestors'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_news_location_id',
+            'news',
+            ['location_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    op.execute(ANCESTORS_FUNCTION)
+    op.execute(ANCESTORS_TRIGGER)
+    op.execute(DESCENDANTS_FUNCTION)
+    op.execute(DESCENDANTS_TRIGGER)
+    op.execute(NEWS_REFRESH_FUNCTION)
+    op.execute(NEWS_REFRESH_TRIGGER)
+    op.execute(NEWS_FUNCTION)
+    op.execute(NEWS_TRIGGER)
+
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while conn.execute(BACKFILL_BATCH, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS news_location_ancestors_trg ON news')
+    op.execute('DROP TRIGGER IF EXISTS locations_news_refresh_trg ON locations')
+    op.execute('DROP TRIGGER IF EXISTS locations_descendants_trg ON locations')
+    op.execute('DROP TRIGGER IF EXISTS locations_ancestors_trg ON locations')
+    op.execute('DROP FUNCTION IF EXISTS news_location_ancestors_update()')
+    op.execute('DROP FUNCTION IF EXISTS locations_news_refresh()')
+    op.execute('DROP FUNCTION IF EXISTS locations_descendants_refresh()')
+    op.execute('DROP FUNCTION IF EXISTS locations_ancestors_update()')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_news_location_id', table_name='news', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_news_location_ancestors', table_name='news', postgresql_concurrently=True, if_exists=True)
+    op.drop_constraint('news_location_id_fkey', 'news', type_='foreignkey')
+    op.drop_column('news', 'location_ancestors')
+    op.drop_column('news', 'location_id')
+    op.drop_column('locations', 'ancestor_ids')
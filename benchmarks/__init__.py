@@ -0,0 +1,2 @@
+# Standalone benchmark scripts; run from the repo root, e.g.
+#   python -m benchmarks.bench_rbac_signup
@@ -0,0 +1,130 @@
+"""
+Recall and latency of related-article search over news embeddings.
+
+Compares the in-process NumPy index used in JSONB mode (exact search) with
+pgvector's HNSW index. Recall@k is measured against exact cosine ranking.
+The pgvector part needs a Postgres with the vector extension and is skipped
+without ``--database-url``:
+
+    python -m benchmarks.bench_embedding_index
+    python -m benchmarks.bench_embedding_index --database-url postgresql://...
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+import numpy as np
+
+from src.app.services.embedding_index import EmbeddingIndex
+
+DIM = 1536
+K = 10
+
+
+def make_embeddings(n: int, seed: int = 0) -> np.ndarray:
+    # Clustered like real topic embeddings, rather than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, n // 100), DIM), dtype=np.float32)
+    out = np.empty((n, DIM), dtype=np.float32)
+    for start in range(0, n, 10_000):
+        end = min(n, start + 10_000)
+        out[start:end] = centers[rng.integers(0, len(centers), end - start)]
+        out[start:end] += 0.5 * rng.standard_normal((end - start, DIM), dtype=np.float32)
+    return out
+
+
+def exact_top_k(embeddings: np.ndarray, queries: np.ndarray) -> list:
+    normed = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    results = []
+    for q in queries:
+        scores = normed @ (q / np.linalg.norm(q))
+        top = np.argpartition(-scores, K)[:K]
+        results.append(set(top[np.argsort(-scores[top])].tolist()))
+    return results
+
+
+def report(name: str, latencies_ms: list, recall: float):
+    p50 = statistics.median(latencies_ms)
+    p95 = sorted(latencies_ms)[int(len(latencies_ms) * 0.95) - 1]
+    print(f"{name:>24} {recall:>10.3f} {p50:>10.2f} {p95:>10.2f}")
+
+
+def bench_numpy(embeddings: np.ndarray, queries: np.ndarray, truth: list):
+    ids = [uuid.UUID(int=i) for i in range(len(embeddings))]
+    index = EmbeddingIndex(DIM)
+    start = time.perf_counter()
+    index.build(zip(ids, embeddings))
+    print(f"numpy index build: {time.perf_counter() - start:.2f}s")
+
+    latencies, hits = [], 0
+    for q, expected in zip(queries, truth):
+        start = time.perf_counter()
+        found = index.search(q, K)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len({news_id.int for news_id, _ in found} & expected)
+    report("numpy (exact)", latencies, hits / (K * len(queries)))
+
+
+def bench_pgvector(url: str, embeddings: np.ndarray, queries: np.ndarray, truth: list):
+    from pgvector.sqlalchemy import Vector
+    from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+
+    engine = create_engine(url)
+    table = Table("bench_news_embeddings", MetaData(), Column("id", Integer, primary_key=True), Column("embedding", Vector(DIM)))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        table.drop(conn, checkfirst=True)
+        table.create(conn)
+        for start in range(0, len(embeddings), 1000):
+            conn.execute(insert(table), [
+                {"id": start + i, "embedding": v} for i, v in enumerate(embeddings[start:start + 1000])
+            ])
+        start = time.perf_counter()
+        conn.execute(text(
+            "CREATE INDEX ON bench_news_embeddings USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        ))
+        print(f"pgvector hnsw build: {time.perf_counter() - start:.2f}s")
+
+    try:
+        for ef_search in (40, 100, 200):
+            latencies, hits = [], 0
+            with engine.connect() as conn:
+                conn.execute(text(f"SET hnsw.ef_search = {ef_search}"))
+                for q, expected in zip(queries, truth):
+                    stmt = select(table.c.id).order_by(table.c.embedding.cosine_distance(q)).limit(K)
+                    start = time.perf_counter()
+                    found = conn.execute(stmt).scalars().all()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    hits += len(set(found) & expected)
+            report(f"pgvector hnsw ef={ef_search}", latencies, hits / (K * len(queries)))
+    finally:
+        with engine.begin() as conn:
+            table.drop(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--database-url", help="Postgres with pgvector; enables the HNSW benchmark")
+    args = parser.parse_args()
+
+    embeddings = make_embeddings(args.articles)
+    # Queries near existing articles, as for "related articles"
+    rng = np.random.default_rng(1)
+    queries = embeddings[rng.integers(0, args.articles, args.queries)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape, dtype=np.float32)
+    truth = exact_top_k(embeddings, queries)
+
+    print(f"{args.articles} articles, {DIM} dims, top {K}")
+    print(f"{'backend':>24} {'recall@10':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    bench_numpy(embeddings, queries, truth)
+    if args.database_url:
+        bench_pgvector(args.database_url, embeddings, queries, truth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Articles per second: NewsService.create_news one by one versus
+bulk_create_news in batches (the POST /news/bulk write path).
+
+Needs a migrated Postgres (the news triggers and ARRAY columns do not
+exist in SQLite). Rows and the benchmark user are deleted afterwards:
+
+    python -m benchmarks.bench_news_bulk --database-url postgresql://...
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from src.app.models.news import News, NewsMedia
+from src.app.models.user import User
+from src.app.schemas.news import NewsCreate, NewsMediaCreate
+from src.app.services.news_service import NewsService
+
+
+def make_articles(n: int, author: uuid.UUID):
+    return [
+        NewsCreate(
+            headline=f"Benchmark story {i}",
+            content="Wire copy " * 100,
+            categories=["benchmark"],
+            created_by=author,
+            media=[NewsMediaCreate(media_type="image", url=f"https://cdn.example/{i}.jpg")],
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    Session = sessionmaker(bind=create_engine(args.database_url))
+    service = NewsService()
+    with Session() as db:
+        author = User(username=f"bench_{uuid.uuid4().hex[:8]}", mobile_e164=f"+1{uuid.uuid4().int % 10**10:010d}", role="reporter")
+        db.add(author)
+        db.commit()
+        author_id = author.id
+
+    try:
+        articles = make_articles(args.articles, author_id)
+        with Session() as db:
+            start = time.perf_counter()
+            for article in articles:
+                service.create_news(db, article)
+            single = args.articles / (time.perf_counter() - start)
+
+        with Session() as db:
+            start = time.perf_counter()
+            for i in range(0, len(articles), args.batch_size):
+                service.bulk_create_news(db, articles[i:i + args.batch_size])
+            bulk = args.articles / (time.perf_counter() - start)
+
+        print(f"{'path':>20} {'articles/s':>12}")
+        print(f"{'create_news':>20} {single:>12.0f}")
+        print(f"{'bulk_create_news':>20} {bulk:>12.0f}")
+        print(f"speedup: {bulk / single:.1f}x")
+    finally:
+        with Session() as db:
+            ids = db.query(News.id).filter(News.created_by == author_id)
+            db.execute(delete(NewsMedia).where(NewsMedia.news_id.in_(ids.scalar_subquery())))
+            db.execute(delete(News).where(News.created_by == author_id))
+            db.execute(delete(User).where(User.id == author_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
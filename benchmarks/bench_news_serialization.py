@@ -0,0 +1,98 @@
+"""
+Serialization cost of a 100-item GET /news/ page.
+
+Compares the schema path (ORM objects validated against
+response_model=List[News] and encoded by FastAPI) with the fast path
+(column rows built into dicts and encoded with orjson). Both run through a
+real FastAPI app with the database taken out, so only the response
+building differs:
+
+    python -m benchmarks.bench_news_serialization
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.app.models.news import News, NewsMedia, NewsModeration
+from src.app.schemas.news import News as NewsSchema
+from src.app.services.news_service import MEDIA_COLUMNS, MODERATION_COLUMNS, NEWS_LIST_COLUMNS, build_news_dicts
+
+PAGE_SIZE = 100
+REQUESTS = 300
+
+
+def make_page():
+    now = datetime.now(timezone.utc)
+    page = []
+    for i in range(PAGE_SIZE):
+        news = News(
+            id=uuid.uuid4(), headline=f"Headline {i}", content="Body text " * 80, categories=["politics", "local"],
+            url=f"https://example.com/{i}", created_by=uuid.uuid4(), language="en", created_at=now,
+            updated_at=now, deleted_at=None, likes_count=i, comments_count=i // 2, shares_count=i // 3,
+        )
+        news.media = [
+            NewsMedia(id=uuid.uuid4(), news_id=news.id, media_type="image", url=f"https://cdn.example/{i}-{j}.jpg",
+                      metadata_={"width": 1280, "height": 720}, created_at=now)
+            for j in range(2)
+        ]
+        news.moderation = NewsModeration(id=uuid.uuid4(), news_id=news.id, status="approved", reason=None,
+                                         acted_by=uuid.uuid4(), acted_at=now)
+        page.append(news)
+    return page
+
+
+def as_rows(page):
+    rows, media = [], []
+    for news in page:
+        row = SimpleNamespace(**{c.key: getattr(news, c.key) for c in NEWS_LIST_COLUMNS})
+        for c in MODERATION_COLUMNS:
+            setattr(row, f"moderation_{c.key}", getattr(news.moderation, c.key))
+        rows.append(row)
+        media += [SimpleNamespace(**{c.key: getattr(m, c.key) for c in MEDIA_COLUMNS}) for m in news.media]
+    return rows, media
+
+
+def main():
+    page = make_page()
+    rows, media = as_rows(page)
+    app = FastAPI()
+
+    @app.get("/schema", response_model=List[NewsSchema])
+    def schema_path():
+        return page
+
+    @app.get("/fast")
+    def fast_path():
+        return Response(orjson.dumps(build_news_dicts(rows, media), option=orjson.OPT_UTC_Z), media_type="application/json")
+
+    @app.get("/empty")
+    def empty():
+        return Response(b"[]", media_type="application/json")
+
+    client = TestClient(app)
+    results = {}
+    for path in ("/empty", "/schema", "/fast"):
+        for _ in range(20):
+            client.get(path)
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            client.get(path)
+        results[path] = (time.perf_counter() - start) / REQUESTS * 1000
+
+    overhead = results["/empty"]
+    print(f"{PAGE_SIZE}-item page, {REQUESTS} requests; framework overhead {overhead:.2f} ms subtracted")
+    print(f"{'path':>10} {'ms/page':>10}")
+    for path in ("/schema", "/fast"):
+        print(f"{path.strip('/'):>10} {results[path] - overhead:>10.2f}")
+    print(f"speedup: {(results['/schema'] - overhead) / (results['/fast'] - overhead):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+OTP requests per second per core for each hasher.
+
+One OTP request is one hash (send-otp) plus one verify (verify-otp). Runs
+on a single thread, so the figure is per core:
+
+    python -m benchmarks.bench_otp_hashers
+"""
+
+import secrets
+import time
+
+from passlib.context import CryptContext
+
+from src.app.services.otp_hasher import HMACOTPHasher, PasslibOTPHasher
+
+DURATION = 2.0  # Seconds per hasher
+
+
+def otp_requests_per_second(hasher) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        otp = f"{secrets.randbelow(10**6):06d}"
+        assert hasher.verify(otp, hasher.hash(otp))
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    hashers = {
+        "pbkdf2_sha256": PasslibOTPHasher(CryptContext(schemes=["pbkdf2_sha256"])),
+        "hmac-sha256": HMACOTPHasher(secrets.token_bytes(32)),
+    }
+    print(f"{'hasher':>14} {'OTP req/s/core':>16}")
+    for name, hasher in hashers.items():
+        print(f"{name:>14} {otp_requests_per_second(hasher):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Signup cost of the Casbin role assignment as the casbin_rule table grows.
+
+Compares the old path (add_grouping_policy followed by save_policy, which
+rewrites every rule) with incremental adapter writes. Uses an in-memory
+SQLite database so it runs without Postgres:
+
+    python -m benchmarks.bench_rbac_signup
+"""
+
+import os
+import time
+import uuid
+
+import casbin
+from casbin_sqlalchemy_adapter import CasbinRule
+from sqlalchemy import create_engine, insert
+from sqlalchemy.pool import StaticPool
+
+from src.app.services.rbac_service import BatchAdapter
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "app", "rbac", "rbac_model.conf")
+RULE_COUNTS = (1_000, 10_000, 50_000)
+SIGNUPS = 20
+
+
+def make_enforcer(existing_rules: int) -> casbin.Enforcer:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CasbinRule.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(CasbinRule),
+            [{"ptype": "g", "v0": str(uuid.uuid4()), "v1": "user"} for _ in range(existing_rules)],
+        )
+    return casbin.Enforcer(MODEL_PATH, BatchAdapter(engine))
+
+
+def time_signups(enforcer: casbin.Enforcer, save_policy: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(SIGNUPS):
+        enforcer.add_grouping_policy(str(uuid.uuid4()), "user")
+        if save_policy:
+            enforcer.save_policy()
+    return (time.perf_counter() - start) / SIGNUPS * 1000
+
+
+def main():
+    print(f"{'rules':>8} {'save_policy ms/signup':>22} {'incremental ms/signup':>22}")
+    for count in RULE_COUNTS:
+        full = time_signups(make_enforcer(count), save_policy=True)
+        incremental = time_signups(make_enforcer(count), save_policy=False)
+        print(f"{count:>8} {full:>22.2f} {incremental:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
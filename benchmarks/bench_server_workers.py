@@ -0,0 +1,113 @@
+"""
+Requests per second as server workers scale.
+
+Starts uvicorn with 1, 2, 4... worker processes (the loop and HTTP parser the
+production server picks) serving a database-free endpoint that does the CPU
+work of a GET /news/ page: building 100 article dicts and encoding them with
+orjson. Keep-alive clients in separate processes hammer it for a fixed time:
+
+    python -m benchmarks.bench_server_workers --workers 1 2 4 --clients 8
+
+The load generator shares the machine, so numbers flatten once workers plus
+clients exceed the CPU count; run it on a box with spare cores.
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import orjson
+from fastapi import FastAPI, Response
+
+from benchmarks.bench_news_serialization import as_rows, make_page
+from src.app.server import HTTP, LOOP
+from src.app.services.news_service import build_news_dicts
+
+app = FastAPI()
+_page = None
+
+
+@app.get("/page")
+def page():
+    global _page
+    if _page is None:
+        _page = as_rows(make_page())
+    return Response(orjson.dumps(build_news_dicts(*_page), option=orjson.OPT_UTC_Z), media_type="application/json")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/page")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def _client(port: int, duration: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    count, deadline = 0, time.monotonic() + duration
+    while time.monotonic() < deadline:
+        conn.request("GET", "/page")
+        conn.getresponse().read()
+        count += 1
+    results.put(count)
+
+
+def measure(workers: int, clients: int, duration: float) -> float:
+    port = _free_port()
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.bench_server_workers:app",
+        "--port", str(port), "--workers", str(workers), "--loop", LOOP, "--http", HTTP, "--log-level", "warning",
+    ])
+    try:
+        _wait_ready(port)
+        # Every worker has served (and warmed up) once before timing starts
+        for _ in range(workers * 20):
+            _wait_ready(port)
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_client, args=(port, duration, results)) for _ in range(clients)]
+        for p in procs:
+            p.start()
+        total = sum(results.get() for _ in procs)
+        for p in procs:
+            p.join()
+        return total / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} keep-alive clients, {args.duration:.0f}s per run, loop={LOOP} http={HTTP}")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        rps = measure(workers, args.clients, args.duration)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
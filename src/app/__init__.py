@@ -0,0 +1,4 @@
+import time
+
+# Taken before any app module is imported; main() reports startup timings from it
+IMPORT_STARTED = time.perf_counter()
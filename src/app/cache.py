@@ -0,0 +1,97 @@
+"""
+In-process caching primitives.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Thread-safe: sync routes run in the threadpool. ``clear()`` and
+    ``delete()`` bump ``generation``; pass the generation read before
+    computing a value to ``set()`` so a result computed against state that
+    was invalidated meanwhile is dropped instead of cached. ``delete()`` only
+    invalidates loads of its own key; ``clear()`` invalidates them all.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        # Generation of the last clear() and of each delete() since then
+        self._cleared_at = 0
+        self._deleted_at: "dict[Hashable, int]" = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def is_stale(self, key: Hashable, generation: Optional[int]) -> bool:
+        """True if ``key`` was invalidated after ``generation`` was read."""
+        if generation is None:
+            return False
+        return generation < self._cleared_at or generation < self._deleted_at.get(key, 0)
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if self.is_stale(key, generation):
+                return
+            expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self.generation += 1
+            if len(self._deleted_at) >= self.maxsize:
+                # Bound the bookkeeping: forget per-key marks at the cost of
+                # dropping whatever loads are in flight right now
+                self._cleared_at = self.generation
+                self._deleted_at.clear()
+            self._deleted_at[key] = self.generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+            self._cleared_at = self.generation
+            self._deleted_at.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
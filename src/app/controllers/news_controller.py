@@ -1,42 +1,189 @@
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from ..services.news_service import NewsService
-from ..services.moderation_service import ModerationService
-from ..schemas.news import NewsCreate, NewsUpdate, NewsFilter, NewsModerationCreate
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator
+from ..config import settings
+from ..database import DBSession
+from ..services.news_service import NewsService, AsyncNewsService, encode_cursor, decode_cursor
+from ..services.moderation_service import ModerationService, AsyncModerationService
+from ..services.article_cache import article_cache, snapshot
+from ..schemas.news import NewsCreate, NewsUpdate, NewsFilter, NewsModerationCreate, SemanticSearchRequest
+from .. import http_cache
 import uuid
 
+BULK_BATCH_SIZE = settings.get("NEWS_BULK_BATCH_SIZE", 500)
+BULK_MAX_LINE_BYTES = settings.get("NEWS_BULK_MAX_LINE_BYTES", 1024 * 1024)
+
+# Split a byte stream into (line number, line) pairs as it arrives,
+# so an NDJSON upload is never held in memory as a whole
+async def ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = BULK_MAX_LINE_BYTES):
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Line {line_no + 1} exceeds {max_line_bytes} bytes"
+            )
+    if buffer.strip():
+        yield line_no + 1, buffer
+
 class NewsController:
     def __init__(self):
         self.news_service = NewsService()
         self.moderation_service = ModerationService()
+        self.async_news_service = AsyncNewsService()
+        self.async_moderation_service = AsyncModerationService()
+
+    # Await the async service on an AsyncSession; otherwise keep the blocking
+    # sync service off the event loop by running it in the threadpool.
+    async def _call(self, sync_service, async_service, method: str, db: DBSession, *args, **kwargs):
+        if isinstance(db, AsyncSession):
+            return await getattr(async_service, method)(db, *args, **kwargs)
+        return await run_in_threadpool(getattr(sync_service, method), db, *args, **kwargs)
+
+    async def _news(self, method: str, db: DBSession, *args, **kwargs):
+        return await self._call(self.news_service, self.async_news_service, method, db, *args, **kwargs)
 
     # Create News Logic
-    def create_news(self, db: Session, news_data: NewsCreate):
+    async def create_news(self, db: DBSession, news_data: NewsCreate):
         try:
-            return self.news_service.create_news(db, news_data)
+            return await self._news("create_news", db, news_data)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Could not create news: {str(e)}"
             )
 
+    # Bulk Create News Logic
+    # Rows are validated as they stream in and written in batches; each row
+    # gets its own result, so one bad row does not fail the upload.
+    async def bulk_create_news(self, db: DBSession, chunks: AsyncIterator[bytes]):
+        results = []
+        batch = []  # (index into results, NewsCreate)
+        async for line_no, line in ndjson_lines(chunks):
+            try:
+                item = NewsCreate.model_validate_json(line)
+            except ValidationError as e:
+                results.append({"line": line_no, "status": "error", "errors": e.errors(include_url=False, include_context=False, include_input=False)})
+                continue
+            results.append({"line": line_no, "status": "pending"})
+            batch.append((len(results) - 1, item))
+            if len(batch) >= BULK_BATCH_SIZE:
+                await self._write_bulk(db, batch, results)
+                batch = []
+        if batch:
+            await self._write_bulk(db, batch, results)
+
+        created = sum(1 for r in results if r["status"] == "created")
+        return {"created": created, "failed": len(results) - created, "results": results}
+
+    async def _write_bulk(self, db: DBSession, batch, results):
+        try:
+            ids = await self._news("bulk_create_news", db, [item for _, item in batch])
+            for (i, _), news_id in zip(batch, ids):
+                results[i].update(status="created", id=news_id)
+        except Exception as e:
+            # The service rolled the batch back
+            if len(batch) == 1:
+                results[batch[0][0]].update(status="error", errors=str(getattr(e, "orig", e)))
+                return
+            # Retry row by row to find the bad ones
+            for entry in batch:
+                await self._write_bulk(db, [entry], results)
+
     # List News Logic
-    def list_news(self, db: Session, filter_params: NewsFilter, skip: int = 0, limit: int = 100):
-        return self.news_service.get_all_news(db, filter_params, skip, limit)
+    # fast=True returns plain dicts for orjson instead of News rows
+    async def list_news(self, db: DBSession, filter_params: NewsFilter, skip: int = 0, limit: int = 100, cursor: str = None, fast: bool = False):
+        if cursor:
+            if filter_params.search_query:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Search results are ranked; page them with skip instead of cursor"
+                )
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+        method = "list_news_rows" if fast else "get_all_news"
+        return await self._news(method, db, filter_params, skip, limit, cursor=cursor)
+
+    # Cursor for the page after `rows`, None once the feed is exhausted
+    def next_cursor(self, rows, limit: int, filter_params: NewsFilter):
+        if filter_params.search_query or limit <= 0 or len(rows) < limit:
+            return None
+        return encode_cursor(rows[-1])
+
+    # Local Feed Logic
+    # Stories around a location: its mandal, then its district, then its state
+    async def local_news(self, db: DBSession, location_id: uuid.UUID, skip: int = 0, limit: int = 100):
+        if location_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Set a location on your profile or pass location_id to get the local feed"
+            )
+        rows = await self._news("list_local_news_rows", db, location_id, skip, limit)
+        if rows is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Location not found"
+            )
+        return rows
 
     # Get Single News Logic
-    def get_news(self, db: Session, news_id: uuid.UUID):
-        news = self.news_service.get_news_by_id(db, news_id)
+    # Read-through: cache entries are response-shaped dicts, not ORM objects
+    async def get_news(self, db: DBSession, news_id: uuid.UUID):
+        cached = await article_cache.get_async(news_id)
+        if cached is not None:
+            return cached
+        generation = article_cache.generation()
+        news = await self._news("get_news_by_id", db, news_id)
         if not news:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="News article not found"
             )
-        return news
+        entry = snapshot(news)
+        await article_cache.put_async(news_id, entry, generation)
+        return entry
+
+    # Validators (ETag / Last-Modified) of a single article, without loading it
+    async def news_validators(self, db: DBSession, news_id: uuid.UUID):
+        row = await self._news("get_news_validators", db, news_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="News article not found"
+            )
+        return http_cache.article_validators(row)
+
+    # Related News Logic
+    async def related_news(self, db: DBSession, news_id: uuid.UUID, limit: int = 10):
+        related = await self._news("related_news", db, news_id, limit)
+        if related is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="News article not found"
+            )
+        return related
+
+    # Semantic Search Logic
+    async def semantic_search(self, db: DBSession, request: SemanticSearchRequest):
+        return await self._news("semantic_search", db, request.embedding, request.limit)
 
     # Update News Logic
-    def update_news(self, db: Session, news_id: uuid.UUID, news_data: NewsUpdate):
-        news = self.news_service.update_news(db, news_id, news_data)
+    async def update_news(self, db: DBSession, news_id: uuid.UUID, news_data: NewsUpdate):
+        news = await self._news("update_news", db, news_id, news_data)
         if not news:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -45,8 +192,8 @@ class NewsController:
         return news
 
     # Delete News Logic (Soft Delete)
-    def delete_news(self, db: Session, news_id: uuid.UUID, user_id: uuid.UUID = None):
-        success = self.news_service.delete_news(db, news_id, deleted_by_id=user_id)
+    async def delete_news(self, db: DBSession, news_id: uuid.UUID, user_id: uuid.UUID = None):
+        success = await self._news("delete_news", db, news_id, deleted_by_id=user_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -55,9 +202,11 @@ class NewsController:
         return {"message": "News article deleted successfully"}
 
     # --- Moderation ---
-    
-    def moderate_news(self, db: Session, news_id: uuid.UUID, mod_data: NewsModerationCreate):
-        result = self.moderation_service.moderate_news(db, news_id, mod_data)
+
+    async def moderate_news(self, db: DBSession, news_id: uuid.UUID, mod_data: NewsModerationCreate):
+        result = await self._call(
+            self.moderation_service, self.async_moderation_service, "moderate_news", db, news_id, mod_data
+        )
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,44 +1,104 @@
+import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from .database import get_db
-from .services.rbac_service import get_enforcer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from .database import get_session, get_read_session, DBSession
+from .request_context import span
+from .services import rbac_service, principal_cache
+from .services.principal_cache import Principal
 from .config import settings
 from .models.user import User
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
-    credentials_exception = HTTPException(
+# Read endpoints may trust the signed token claims instead of looking the user
+# up. Role or status changes then take effect when the token expires.
+CLAIMS_ONLY_READS = bool(settings.get("AUTH_CLAIMS_ONLY_READS", False))
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_token(credentials: HTTPAuthorizationCredentials) -> dict:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user
+        payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
+        if payload.get("sub") is None:
+            raise _credentials_exception()
+        payload["sub"] = uuid.UUID(payload["sub"])
+        return payload
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+
+async def _load_user(db: DBSession, user_id: uuid.UUID):
+    if isinstance(db, AsyncSession):
+        return (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+    return await run_in_threadpool(lambda: db.query(User).filter(User.id == user_id).first())
+
+def _ensure_active(principal: Principal) -> Principal:
+    if not principal.is_active or principal.is_deleted:
+        raise _credentials_exception()
+    return principal
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: DBSession = Depends(get_session)) -> Principal:
+    with span("auth"):
+        user_id = _decode_token(credentials)["sub"]
+
+        # Served from the principal cache; the users row is read only on a miss
+        principal = principal_cache.get(user_id)
+        if principal is None:
+            generation = principal_cache.generation()
+            user = await _load_user(db, user_id)
+            if user is None:
+                raise _credentials_exception()
+            principal = Principal.from_user(user)
+            principal_cache.put(principal, generation)
+        return _ensure_active(principal)
+
+async def get_read_principal(credentials: HTTPAuthorizationCredentials = Depends(security), db: DBSession = Depends(get_read_session)) -> Principal:
+    """Principal for read endpoints: from token claims alone in claims-only mode."""
+    if not CLAIMS_ONLY_READS:
+        return await get_current_user(credentials, db)
+
+    with span("auth"):
+        payload = _decode_token(credentials)
+    try:
+        location_id = uuid.UUID(payload["loc"]) if payload.get("loc") else None
+    except ValueError:
+        raise _credentials_exception()
+    return Principal(
+        id=payload["sub"],
+        role=payload.get("role", "user"),
+        preferred_language=payload.get("lang", "en"),
+        location_id=location_id,
+    )
 
 class PermissionChecker:
     def __init__(self, action: str = "read", obj: str = "data"):
         self.action = action
         self.obj = obj
 
-    async def __call__(self, user: User = Depends(get_current_user)):
-        enforcer = get_enforcer()
+    async def __call__(self, user: Principal = Depends(get_current_user)):
+        return self.check(user)
+
+    def check(self, user: Principal):
         # Check permission: sub, obj, act
         # We pass user.id (as string) as the subject. Casbin will look up roles via 'g' policies.
         # e.g. g(user_id, "admin") && p("admin", "news", "delete")
-        if not enforcer.enforce(str(user.id), self.obj, self.action):
+        # Decisions are cached per (sub, obj, act) until the policy changes.
+        with span("casbin"):
+            allowed = rbac_service.enforce(str(user.id), self.obj, self.action)
+        if not allowed:
             raise HTTPException(status_code=403, detail="Operation not permitted")
-        return True
\ No newline at end of file
+        return True
+
+class ReadPermissionChecker(PermissionChecker):
+    """PermissionChecker for read endpoints, honouring claims-only mode."""
+
+    async def __call__(self, user: Principal = Depends(get_read_principal)):
+        return self.check(user)
@@ -0,0 +1,107 @@
+"""
+HTTP validators (ETag / Last-Modified) and conditional GET helpers.
+
+An article's validators come from the fields that change its
+representation: ``updated_at`` (or ``created_at`` if never updated), the
+moderation ``acted_at`` and the engagement counters, which are flushed
+without touching ``updated_at``. Last-Modified only tracks the timestamps,
+so it is sent for information but If-Modified-Since is not honoured for
+articles: a counter change would otherwise be answered with a 304. Clients
+revalidate with If-None-Match.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Mapping, Optional
+
+from .schemas import news as news_schemas
+
+COUNTER_FIELDS = ("likes_count", "comments_count", "shares_count")
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: Optional[datetime] = None
+    # False when the ETag covers fields that Last-Modified does not
+    last_modified_complete: bool = True
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def _get(obj, key):
+    return obj.get(key) if isinstance(obj, Mapping) else getattr(obj, key, None)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    # Stored naive values are UTC (datetime.utcnow defaults)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _fingerprint(article) -> tuple:
+    """Version-relevant fields of an ORM row, a metadata row or a fast-path dict."""
+    moderation = _get(article, "moderation")
+    acted_at = _get(moderation, "acted_at") if moderation is not None else _get(article, "moderation_acted_at")
+    counts = [_get(article, field) or 0 for field in COUNTER_FIELDS]
+    # Responses include unflushed counter deltas when live counts are on
+    deltas = news_schemas.pending_counts(_get(article, "id")) if news_schemas.pending_counts else None
+    if deltas:
+        counts = [count + deltas.get(field, 0) for count, field in zip(counts, COUNTER_FIELDS)]
+    modified = _get(article, "updated_at") or _get(article, "created_at")
+    return str(_get(article, "id")), _utc(modified), _utc(acted_at), *counts
+
+
+def _digest(parts: Iterable) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(repr(part).encode())
+    return h.hexdigest()
+
+
+def article_validators(article) -> Validators:
+    fingerprint = _fingerprint(article)
+    timestamps = [ts for ts in fingerprint[1:3] if ts is not None]
+    last_modified = max(timestamps).replace(microsecond=0) if timestamps else None
+    # Counters change without a timestamp, so the date alone cannot validate
+    return Validators(etag=f'"{_digest(fingerprint)}"', last_modified=last_modified, last_modified_complete=False)
+
+
+def list_validators(rows, *extra) -> Validators:
+    """Weak ETag for a list page: equivalent pages, not byte-identical ones."""
+    return Validators(etag=f'W/"{_digest([*(_fingerprint(r) for r in rows), *extra])}"')
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request_headers: Mapping[str, str], validators: Validators) -> bool:
+    """True if a GET with these headers should get 304 Not Modified."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since; weak comparison per RFC 9110
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(validators.etag) in {_opaque(t) for t in if_none_match.split(",")}
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None and validators.last_modified_complete:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return validators.last_modified <= _utc(since)
+    return False
+
+
+def has_conditions(request_headers: Mapping[str, str]) -> bool:
+    return "if-none-match" in request_headers or "if-modified-since" in request_headers
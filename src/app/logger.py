@@ -1,37 +1,119 @@
+import json
 import logging
+import os
+import queue
+import random
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+from . import metrics
 from .config import settings
+from .request_context import get_request_id
 
-def setup_logger(name: str = "app") -> logging.Logger:
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request ID, in the caller's thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            request_id = get_request_id()
+            record.request_id = str(request_id) if request_id else None
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Let through a ``rate`` fraction of records, for high-volume debug lines."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
     """
-    Setup application logger with console and file handlers.
-    
-    Args:
-        name: Logger name (default: "app")
-        
-    Returns:
-        Configured logger instance
+    QueueHandler over a bounded queue. When the listener falls behind, the
+    "drop" policy discards records (counted in ``dropped``) and "block" makes
+    the logging thread wait for room.
     """
-    logger = logging.getLogger(name)
-    
-    # Set log level based on environment
-    log_level = logging.DEBUG if settings.debug else logging.INFO
-    logger.setLevel(log_level)
-    
-    # Prevent duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
+
+    def __init__(self, maxsize: int = 10000, policy: str = "drop"):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.block = policy == "block"
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _formatters():
+    if settings.get("LOG_FORMAT", "text") == "json":
+        json_formatter = JsonFormatter()
+        return json_formatter, json_formatter
+
+    # Formatter
+    formatter = logging.Formatter(
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Detailed formatter for file logs
+    detailed_formatter = logging.Formatter(
+        fmt="%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    return formatter, detailed_formatter
+
+
+def _log_files() -> bool:
+    # Several processes rotating the same files lose or garble records, so
+    # the multi-worker server logs to stdout only unless told otherwise
+    return bool(settings.get("LOG_FILES", settings.get("SERVER_MODE", "development") != "production"))
+
+
+def _output_handlers(log_level: int) -> List[logging.Handler]:
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
-    
+    formatter, detailed_formatter = _formatters()
+    console_handler.setFormatter(formatter)
+    if not _log_files():
+        return [console_handler]
+
+    # Create logs directory if it doesn't exist
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+
     # File handler (rotating)
     file_handler = RotatingFileHandler(
         log_dir / "app.log",
@@ -39,7 +121,7 @@ def setup_logger(name: str = "app") -> logging.Logger:
         backupCount=5,
     )
     file_handler.setLevel(log_level)
-    
+
     # Error file handler (only errors)
     error_file_handler = RotatingFileHandler(
         log_dir / "error.log",
@@ -47,31 +129,107 @@ def setup_logger(name: str = "app") -> logging.Logger:
         backupCount=5,
     )
     error_file_handler.setLevel(logging.ERROR)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    
-    # Detailed formatter for file logs
-    detailed_formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    
+
     # Set formatters
-    console_handler.setFormatter(formatter)
     file_handler.setFormatter(detailed_formatter)
     error_file_handler.setFormatter(detailed_formatter)
-    
+    return [console_handler, file_handler, error_file_handler]
+
+
+# One set of handlers is shared by every logger setup_logger() configures, so
+# the rotating files have a single writer within the process (see _log_files()
+# for the multi-worker server).
+_handlers: Optional[List[logging.Handler]] = None
+queue_handler: Optional[BoundedQueueHandler] = None
+listener: Optional[QueueListener] = None
+
+
+def start_listener() -> None:
+    """Start (or, in a forked worker, restart) the thread writing queued records."""
+    if listener is not None and (listener._thread is None or not listener._thread.is_alive()):
+        listener._thread = None
+        listener.start()
+
+
+def stop_listener() -> None:
+    """Write out the queued records and stop the listener thread."""
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
+def _shared_handlers(log_level: int) -> List[logging.Handler]:
+    global _handlers, queue_handler, listener
+    if _handlers is None:
+        outputs = _output_handlers(log_level)
+        if settings.get("LOG_ASYNC", True):
+            # Callers only enqueue; formatting, writes and rotation happen on
+            # the listener thread, so a disk stall does not block requests
+            queue_handler = BoundedQueueHandler(
+                maxsize=settings.get("LOG_QUEUE_SIZE", 10000),
+                policy=settings.get("LOG_QUEUE_POLICY", "drop"),
+            )
+            listener = QueueListener(queue_handler.queue, *outputs, respect_handler_level=True)
+            start_listener()
+            # Threads do not survive fork(): each worker restarts its own
+            os.register_at_fork(after_in_child=start_listener)
+            metrics.register(lambda: metrics.family(
+                "log_queue_dropped_total", "counter", "Log records dropped because the queue was full",
+                [({}, queue_handler.dropped)],
+            ))
+            _handlers = [queue_handler]
+        else:
+            _handlers = outputs
+        for handler in _handlers:
+            handler.addFilter(RequestIdFilter())
+    return _handlers
+
+
+def setup_logger(name: str = "app") -> logging.Logger:
+    """
+    Setup application logger with console and file handlers.
+
+    Args:
+        name: Logger name (default: "app")
+
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+
+    # Set log level based on environment
+    log_level = logging.DEBUG if settings.debug else logging.INFO
+    logger.setLevel(log_level)
+
+    # Prevent duplicate handlers
+    if logger.handlers:
+        return logger
+
     # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(error_file_handler)
-    
+    for handler in _shared_handlers(log_level):
+        logger.addHandler(handler)
+    # The shared handlers already write everything; do not repeat on root
+    logger.propagate = False
+
+    return logger
+
+
+def sampled_logger(name: str, rate: Optional[float] = None) -> logging.Logger:
+    """
+    Child logger of ``name`` that keeps only a ``rate`` fraction of its
+    records (LOG_DEBUG_SAMPLE_RATE by default). Guard calls with
+    ``isEnabledFor`` so the sampling is skipped when the level is off.
+    """
+    logger = logging.getLogger(f"{name}.sampled")
+    if not any(isinstance(f, SampleFilter) for f in logger.filters):
+        logger.addFilter(SampleFilter(settings.get("LOG_DEBUG_SAMPLE_RATE", 0.01) if rate is None else rate))
     return logger
 
 
 # Create default logger instance
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
+# Module loggers (logging.getLogger(__name__)) go through the same pipeline
+setup_logger(__package__)
+# SQLAlchemy names pool loggers after the pool class, and the timed pools are
+# defined in .database, so they would inherit DEBUG and log every checkout.
+# DATABASE_ECHO / echo_pool still turn that logging on explicitly.
+logging.getLogger(f"{__package__}.database").setLevel(logging.INFO)
@@ -1,16 +1,23 @@
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from . import IMPORT_STARTED
 from .config import settings
-from .logger import logger
-from .database import engine
+from .logger import logger, start_listener, stop_listener
+from .database import engine, replicas
+from .middleware import RequestInstrumentationMiddleware
+from .migrations import ensure_schema
+from . import server
 import sqlalchemy as sa
+from sqlalchemy.engine import make_url
 from .models import Base
-from .routes import api_router, auth
-from .services.rbac_service import init_rbac
+from .routes import api_router, auth, metrics as metrics_routes
+from .services.rbac_service import init_rbac, stop_policy_sync
+from .services.engagement_service import engagement_buffer
+from .services.counter_service import counter_flusher, enable_live_counts
 import logging
-import subprocess
 import uvicorn
 
 # Database Initialization
@@ -18,8 +25,21 @@ import uvicorn
 async def lifespan(app: FastAPI):
     # Database initialization is handled in main() before startup to ensure proper order with Alembic
     # Initialize RBAC (ensure adapter is ready)
+    start_listener()
     init_rbac()
+    replicas.start()
+    engagement_buffer.start()
+    counter_flusher.start()
+    if settings.get("COUNTER_LIVE_READS", False):
+        enable_live_counts()
     yield
+    # Write out buffered engagement events and counter deltas before the process exits
+    await engagement_buffer.stop()
+    await counter_flusher.stop()
+    await replicas.stop()
+    stop_policy_sync()
+    # Last: write out the queued log records
+    stop_listener()
 
 # Main FastAPI App
 app = FastAPI(
@@ -37,9 +57,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request ID, per-route latency and per-request SQL cost (outermost middleware)
+app.add_middleware(RequestInstrumentationMiddleware)
+
 # Include all our Routes (the URL endpoints)
 app.include_router(api_router)
 app.include_router(auth.router)
+app.include_router(metrics_routes.router)
 
 # Welcome Message
 @app.get("/")
@@ -71,6 +95,14 @@ def init_db():
     # Base.metadata.create_all(bind=engine)
     logger.info("Database extensions checked!")
 
+def _init_db_or_continue():
+    try:
+        init_db()
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+        # We might want to continue if it's just table already exists, but critical extensions failure is bad.
+        # Proceeding to alembic anyway.
+
 def main():
     """Run the app"""
     logging.basicConfig(level=logging.INFO)
@@ -79,25 +111,27 @@ def main():
     # Log app details
     logger.info(f"App starting in Environment: {settings.environment}")
 
-    # Initialize DB (Extensions + Tables)
+    # Migrate in-process, and only when alembic_version is behind the scripts.
+    # Extensions are created first, under the same migration lock.
+    timings = {"import_ms": (time.perf_counter() - IMPORT_STARTED) * 1000}
     try:
-        init_db()
-    except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
-        # We might want to continue if it's just table already exists, but critical extensions failure is bad.
-        # Proceeding to alembic anyway.
+        timings.update(ensure_schema(engine, before_upgrade=_init_db_or_continue))
+    except Exception:
+        logger.exception("Failed to apply Alembic migrations.")
+        raise
+    timings["startup_ms"] = (time.perf_counter() - IMPORT_STARTED) * 1000
+    logger.info(
+        "Startup timings: %s",
+        ", ".join(f"{phase}={ms:.0f}" for phase, ms in timings.items()),
+        extra={"startup": timings},
+    )
 
-    # Run Alembic migrations before starting the server
-    try:
-        logger.info("Checking and applying Alembic migrations...")
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
-        logger.info("Alembic migrations applied successfully.")
-    except subprocess.CalledProcessError as e:
-        logger.error("Failed to apply Alembic migrations.")
-        raise e
-
-    print(f"Starting app on http://localhost:{settings.port}/... in {settings.environment} mode")
-    print(f"Database URL: {settings.DATABASE_URL}")
+    logger.info(f"Starting app on http://localhost:{settings.port}/... in {settings.environment} mode")
+    logger.info(f"Database URL: {make_url(settings.DATABASE_URL).render_as_string(hide_password=True)}")
+    if settings.get("SERVER_MODE", "development") == "production":
+        # Multi-worker server; migrations above ran once, before any fork
+        server.run(host=settings.get("HOST", "0.0.0.0"), port=settings.port)
+        return
     # Start Uvicorn server
     uvicorn.run("src.app.main:app", host="0.0.0.0", port=settings.port, reload=True)
 
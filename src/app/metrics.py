@@ -0,0 +1,129 @@
+"""
+Prometheus metrics without a client library.
+
+Histograms are recorded into per-thread shards, so ``observe()`` on the
+request and query paths takes no lock: each thread (event loop, threadpool
+workers) only ever writes its own shard, and a scrape merges them. The lock
+below is taken once per thread, when its shard is created.
+
+Point-in-time values (pool gauges, cache and buffer stats) are read when
+``/metrics`` is scraped, through callbacks registered with ``register()``.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from sub-millisecond queries up to slow requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[Dict[str, str], float]
+
+_histograms: List["Histogram"] = []
+_collectors: List[Callable[[], Iterable[str]]] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+        _histograms.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One count per bucket (not cumulative), +Inf, then the sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> Dict[Tuple[str, ...], list]:
+        merged: Dict[Tuple[str, ...], list] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                total = merged.setdefault(labels, [0] * (len(series) - 1) + [0.0])
+                for i, value in enumerate(series):
+                    total[i] += value
+        return merged
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self.collect().items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels({**base, 'le': _number(bound)})} {cumulative}"
+            yield f"{self.name}_sum{_labels(base)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(base)} {cumulative}"
+
+
+def family(name: str, kind: str, documentation: str, samples: Iterable[Sample]) -> Iterable[str]:
+    """Text lines of one gauge or counter family."""
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{_labels(labels)} {_number(value)}"
+
+
+def register(collector: Callable[[], Iterable[str]]) -> None:
+    """Add a callback producing text lines (see ``family``) at scrape time."""
+    _collectors.append(collector)
+
+
+def stats_collector(prefix: str, source: Callable[[], dict], counters: Sequence[str] = ()) -> Callable[[], Iterable[str]]:
+    """Collector exposing the numeric fields of a ``stats()`` dict."""
+    def collect():
+        for key, value in source().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in counters:
+                yield from family(f"{prefix}_{key}_total", "counter", f"{prefix} {key}", [({}, value)])
+            else:
+                yield from family(f"{prefix}_{key}", "gauge", f"{prefix} {key}", [({}, value)])
+    return collect
+
+
+def render() -> str:
+    lines: List[str] = []
+    for histogram in _histograms:
+        lines.extend(histogram.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,106 @@
+"""
+Request instrumentation as a pure ASGI middleware.
+
+Every HTTP request gets an ID (a valid incoming ``X-Request-ID`` UUID is kept,
+otherwise a new one) that is echoed in the response headers and available as
+``request_context.get_request_id()``. Latency, SQL statement count and SQL
+time are recorded per route template on ``/metrics``; requests slower than
+``SLOW_REQUEST_THRESHOLD`` seconds are logged with their cost breakdown.
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Optional
+
+from . import metrics
+from .config import settings
+from .request_context import RequestContext, current_request
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+REQUEST_DURATION = metrics.Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route", "status"]
+)
+REQUEST_DB_STATEMENTS = metrics.Histogram(
+    "http_request_db_statements", "SQL statements executed per request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_TIME = metrics.Histogram(
+    "http_request_db_seconds", "Time spent in SQL per request", ["method", "route"]
+)
+
+
+def _incoming_request_id(scope) -> Optional[uuid.UUID]:
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER:
+            try:
+                return uuid.UUID(value.decode("latin-1"))
+            except ValueError:
+                return None
+    return None
+
+
+def _route(scope) -> str:
+    # The template, not the raw path, keeps label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestInstrumentationMiddleware:
+    def __init__(self, app, slow_request_threshold: Optional[float] = None):
+        self.app = app
+        if slow_request_threshold is None:
+            slow_request_threshold = settings.get("SLOW_REQUEST_THRESHOLD", 1.0)
+        self.slow_request_threshold = slow_request_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        ctx = RequestContext(request_id=_incoming_request_id(scope) or uuid.uuid4())
+        request_id_header = (REQUEST_ID_HEADER, str(ctx.request_id).encode("latin-1"))
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            await send(message)
+
+        token = current_request.set(ctx)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration = time.perf_counter() - start
+            current_request.reset(token)
+            self._record(scope, ctx, status_code, duration)
+
+    def _record(self, scope, ctx: RequestContext, status_code: int, duration: float) -> None:
+        method, route = scope["method"], _route(scope)
+        REQUEST_DURATION.observe(duration, (method, route, str(status_code)))
+        REQUEST_DB_STATEMENTS.observe(ctx.sql_count, (method, route))
+        REQUEST_DB_TIME.observe(ctx.sql_time, (method, route))
+
+        if self.slow_request_threshold and duration >= self.slow_request_threshold:
+            breakdown = {
+                "request_id": str(ctx.request_id),
+                "method": method,
+                "path": scope["path"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "db_statements": ctx.sql_count,
+                "db_ms": round(ctx.sql_time * 1000, 1),
+                "spans": {
+                    name: {"ms": round(elapsed * 1000, 1), "db_ms": round(sql * 1000, 1)}
+                    for name, (elapsed, sql) in ctx.spans.items()
+                },
+            }
+            # The JSON log format carries the breakdown as a field
+            logger.warning("slow_request %s", json.dumps(breakdown), extra={"slow_request": breakdown, "request_id": breakdown["request_id"]})
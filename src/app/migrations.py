@@ -0,0 +1,97 @@
+"""
+In-process schema check and Alembic upgrade for startup.
+
+The ``alembic_version`` row is compared with the script head first; when they
+match (the normal case) startup costs one small query. Otherwise the upgrade
+runs in this process under a Postgres advisory lock, so workers or containers
+starting together migrate once: the others wait on the lock, then see the
+schema is current and skip.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Base
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# pg_advisory_lock key shared by every process migrating this database
+MIGRATION_LOCK_KEY = 7_125_663_442_118_601
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    # env.py: keep the app's logging, reuse its models and our connection
+    config.attributes["configure_logger"] = False
+    config.attributes["target_metadata"] = Base.metadata
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def script_heads(config: Config) -> set:
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def current_heads(connection: Connection) -> set:
+    heads = set(MigrationContext.configure(connection).get_current_heads())
+    # Leave the connection outside a transaction for the next step
+    connection.commit()
+    return heads
+
+
+def ensure_schema(engine: Engine, before_upgrade: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """
+    Upgrade the database to head unless it is already there.
+
+    ``before_upgrade`` runs under the lock, only when an upgrade is due
+    (e.g. creating extensions). Returns phase timings in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    heads = script_heads(alembic_config())
+
+    with engine.connect() as conn:
+        current = current_heads(conn)
+        timings["schema_check_ms"] = (time.perf_counter() - start) * 1000
+        if current == heads:
+            logger.info("Database schema is current (%s); skipping migrations", ", ".join(sorted(heads)))
+            return timings
+
+        locking = conn.dialect.name == "postgresql"
+        lock_start = time.perf_counter()
+        if locking:
+            conn.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_KEY)))
+            conn.commit()
+        timings["lock_wait_ms"] = (time.perf_counter() - lock_start) * 1000
+        try:
+            # Another process may have migrated while we waited
+            if current_heads(conn) == heads:
+                logger.info("Database schema was upgraded by another process")
+                return timings
+
+            upgrade_start = time.perf_counter()
+            if before_upgrade is not None:
+                before_upgrade()
+            logger.info("Upgrading database schema from %s to %s", ", ".join(sorted(current)) or "empty", ", ".join(sorted(heads)))
+            command.upgrade(alembic_config(conn), "head")
+            conn.commit()
+            timings["upgrade_ms"] = (time.perf_counter() - upgrade_start) * 1000
+        finally:
+            if locking:
+                conn.rollback()
+                conn.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_KEY)))
+                conn.commit()
+    return timings
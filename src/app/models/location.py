@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, JSON, text, UniqueConstraint
+from sqlalchemy import Column, String, JSON, text, UniqueConstraint, ARRAY
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from .base import Base
 
@@ -19,3 +19,6 @@ class Location(Base):
     mandal_or_village = Column(String(200))
     postal_code = Column(String(20))
     geo = Column(JSONB) # Stores coordinates or extra data as JSON
+    # [state, district, self] location ids, outermost first; maintained by the
+    # locations_ancestors trigger (a district row stops at itself, a state row is [self])
+    ancestor_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
@@ -1,11 +1,14 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, ARRAY, DateTime, text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, ARRAY, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from datetime import datetime
 import os
+from .types import PackedVector
 
 # Check if we should use Vector type based on environment variable
 USE_PGVECTOR = os.getenv("USE_PGVECTOR", "false").lower() == "true"
 
+EMBEDDING_DIM = 1536
+
 if USE_PGVECTOR:
     try:
         from pgvector.sqlalchemy import Vector as VectorType
@@ -15,14 +18,51 @@ if USE_PGVECTOR:
         _embedding_factory = lambda dim: JSONB
 else:
     # Force JSONB when pgvector extension is not available
+    VectorType = None
     _embedding_factory = lambda dim: JSONB
 
+# True when News.embedding is a pgvector column that Postgres can rank with <=>
+PGVECTOR_ENABLED = VectorType is not None
+
+# Without pgvector: "jsonb" (legacy JSON array, ~30 KB per row) or the compact
+# "float32" / "float16" bytea encodings in the embedding_bin column
+EMBEDDING_STORAGE = os.getenv("EMBEDDING_STORAGE", "jsonb").lower()
+
+def _embedding_column():
+    if PGVECTOR_ENABLED or EMBEDDING_STORAGE not in ("float32", "float16"):
+        return Column(_embedding_factory(EMBEDDING_DIM), nullable=True)
+    return Column("embedding_bin", PackedVector(EMBEDDING_DIM, EMBEDDING_STORAGE), nullable=True)
+
+if PGVECTOR_ENABLED:
+    # Approximate nearest-neighbour index for cosine distance over live rows
+    _embedding_indexes = (
+        Index(
+            "ix_news_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+else:
+    _embedding_indexes = ()
+
 from .base import Base
 
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # Serves the (created_at, id) keyset feed over live rows only
+        Index("ix_news_feed", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves the local feed: location_ancestors && <reader's ancestor ids>
+        Index("ix_news_location_ancestors", "location_ancestors", postgresql_using="gin", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_news_location_id", "location_id"),
+        *_embedding_indexes,
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
     headline = Column(String(512), nullable=False)
@@ -37,7 +77,15 @@ class News(Base):
     likes_count = Column(Integer, default=0)
     comments_count = Column(Integer, default=0)
     shares_count = Column(Integer, default=0)
-    embedding = Column(_embedding_factory(1536), nullable=True)
+    # Only the similarity search reads embeddings; never loaded with the row
+    embedding = deferred(_embedding_column())
+    language = Column(String(10), nullable=False, default="en", server_default="en")
+    # Maintained by the news_search_vector_update trigger; never loaded by default
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id"), nullable=True)
+    # Copy of the location's ancestor_ids, maintained by the news_location_ancestors
+    # trigger; only the local feed filters on it
+    location_ancestors = deferred(Column(ARRAY(UUID(as_uuid=True)), nullable=True))
     
     # Relationships
     media = relationship("NewsMedia", back_populates="news", cascade="all, delete-orphan")
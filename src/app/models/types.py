@@ -0,0 +1,37 @@
+import numpy as np
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# Big-endian so Postgres can produce the same bytes with float4send()
+_DTYPES = {"float32": np.dtype(">f4"), "float16": np.dtype(">f2")}
+
+
+class PackedVector(TypeDecorator):
+    """
+    Fixed-size float vector stored as raw bytes in a bytea column.
+
+    Values are written in ``dtype`` (float32 or float16). On read the dtype
+    is inferred from the byte length, so rows written under either setting
+    decode correctly. Decoding is a zero-copy, read-only np.frombuffer view.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dim: int, dtype: str = "float32"):
+        super().__init__()
+        self.dim = dim
+        self.dtype = _DTYPES[dtype]
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        array = np.asarray(value, dtype=self.dtype)
+        if array.shape != (self.dim,):
+            raise ValueError(f"Expected a {self.dim}-dim vector, got shape {array.shape}")
+        return array.tobytes()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        dtype = _DTYPES["float16"] if len(value) == self.dim * 2 else _DTYPES["float32"]
+        return np.frombuffer(value, dtype=dtype)
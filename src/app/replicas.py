@@ -0,0 +1,142 @@
+"""
+Read replicas and read/write session routing.
+
+``RoutingSession`` sends plain SELECTs to a healthy replica and everything
+else (flushes, INSERT/UPDATE/DELETE, locking reads, raw SQL) to the primary.
+After the first write a session stays on the primary, so a request reads
+its own writes. ``ReplicaSet`` tracks replication lag; replicas behind by
+more than ``max_lag`` seconds, or failing the probe, are skipped until they
+catch up, and with none left reads go to the primary.
+"""
+
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.selectable import CompoundSelect
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 when it has replayed everything received
+# (an idle replica's last replay timestamp would otherwise look like lag)
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replication_lag(engine: Engine) -> float:
+    with engine.connect() as conn:
+        return float(conn.execute(LAG_QUERY).scalar() or 0)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine  # sync engine; also used for lag probes
+    async_engine: Any = None  # AsyncEngine when DATABASE_ASYNC is on
+    healthy: bool = True
+    lag: Optional[float] = None
+
+
+@dataclass
+class ReplicaSet:
+    replicas: List[Replica]
+    max_lag: float = 5.0
+    check_interval: float = 2.0
+    probe: Callable[[Engine], float] = replication_lag
+    _next: Any = field(default_factory=itertools.count, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """Round-robin over healthy replicas; None sends reads to the primary."""
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                replica.lag = self.probe(replica.engine)
+            except Exception:
+                replica.lag = None
+                if replica.healthy:
+                    logger.warning("Replica %s failed its lag probe; reading from the primary", replica.name, exc_info=True)
+                replica.healthy = False
+                continue
+            healthy = replica.lag <= self.max_lag
+            if healthy != replica.healthy:
+                logger.warning("Replica %s is %s (lag %.1fs)", replica.name, "back" if healthy else "lagging", replica.lag)
+            replica.healthy = healthy
+
+    def start(self) -> None:
+        if self.replicas and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="replica-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.check)
+            await asyncio.sleep(self.check_interval)
+
+    def stats(self) -> List[dict]:
+        return [{"name": r.name, "healthy": r.healthy, "lag": r.lag} for r in self.replicas]
+
+
+class RoutingSession(Session):
+    """
+    Session whose reads go to a replica until it writes.
+
+    Pass ``replicas`` through the sessionmaker; ``async_binds`` picks the
+    replicas' async engines for sessions wrapped by an AsyncSession.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, async_binds: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.async_binds = async_binds
+        self._replica: Optional[Replica] = None
+
+    @property
+    def on_primary(self) -> bool:
+        return self.info.get("on_primary", False)
+
+    def use_primary(self) -> None:
+        """Route the rest of this session to the primary."""
+        self.info["on_primary"] = True
+
+    def _is_read(self, clause) -> bool:
+        if not isinstance(clause, (Select, CompoundSelect)):
+            return False
+        # SELECT ... FOR UPDATE takes row locks, which only the primary has
+        return getattr(clause, "_for_update_arg", None) is None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas and not self.on_primary:
+            if not self._flushing and self._is_read(clause):
+                if self._replica is None:
+                    self._replica = self.replicas.choose()
+                if self._replica is not None:
+                    replica = self._replica
+                    return replica.async_engine.sync_engine if self.async_binds else replica.engine
+            else:
+                self.use_primary()
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
@@ -0,0 +1,53 @@
+"""
+Per-request context: request ID, SQL cost and timed spans.
+
+The middleware in ``middleware.py`` sets ``current_request`` for each HTTP
+request. Context variables follow the request into ``run_in_threadpool`` and
+``asyncio.to_thread``, and the context object itself is shared, so SQL
+executed from the threadpool or through an AsyncSession is counted too.
+"""
+
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class RequestContext:
+    request_id: uuid.UUID
+    sql_count: int = 0
+    sql_time: float = 0.0
+    # name -> [seconds, seconds of SQL inside the span]
+    spans: Dict[str, list] = field(default_factory=dict)
+
+    def record_query(self, elapsed: float) -> None:
+        self.sql_count += 1
+        self.sql_time += elapsed
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+def get_request_id() -> Optional[uuid.UUID]:
+    """ID of the request being served (the value for AuditLog.request_id)."""
+    ctx = current_request.get()
+    return ctx.request_id if ctx is not None else None
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block of the current request; a no-op outside requests."""
+    ctx = current_request.get()
+    if ctx is None:
+        yield
+        return
+    start, sql_start = time.perf_counter(), ctx.sql_time
+    try:
+        yield
+    finally:
+        totals = ctx.spans.setdefault(name, [0.0, 0.0])
+        totals[0] += time.perf_counter() - start
+        totals[1] += ctx.sql_time - sql_start
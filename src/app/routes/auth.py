@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..services.auth_service import AuthService
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from ..database import get_session, DBSession
+from ..services.auth_service import AuthService, AsyncAuthService
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -16,30 +17,42 @@ class OTPVerifyModel(BaseModel):
     purpose: str = "login"
 
 @router.post("/send-otp")
-def send_otp(
+async def send_otp(
     req: OTPRequestModel,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    service = AuthService(db)
     # in dummy mode, we return the OTP
-    otp = service.generate_otp(req.mobile, req.purpose)
+    if isinstance(db, AsyncSession):
+        otp = await AsyncAuthService(db).generate_otp(req.mobile, req.purpose)
+    else:
+        otp = await run_in_threadpool(AuthService(db).generate_otp, req.mobile, req.purpose)
     return {"message": "OTP sent successfully", "dummy_otp": otp} # remove dummy_otp in prod
 
 @router.post("/verify-otp")
-def verify_otp(
+async def verify_otp(
     req: OTPVerifyModel,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    service = AuthService(db)
-    user = service.verify_otp(req.mobile, req.otp, req.purpose)
+    if isinstance(db, AsyncSession):
+        service = AsyncAuthService(db)
+        user = await service.verify_otp(req.mobile, req.otp, req.purpose)
+    else:
+        service = AuthService(db)
+        user = await run_in_threadpool(service.verify_otp, req.mobile, req.otp, req.purpose)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid OTP or expired")
-    
+
     # Create token
-    access_token = service.create_access_token(data={"sub": str(user.id), "role": user.role})
-    
+    # lang/loc let read endpoints run from the claims alone (AUTH_CLAIMS_ONLY_READS)
+    access_token = service.create_access_token(data={
+        "sub": str(user.id),
+        "role": user.role,
+        "lang": user.preferred_language,
+        "loc": str(user.location_id) if user.location_id else None,
+    })
+
     return {
-        "access_token": access_token, 
+        "access_token": access_token,
         "token_type": "bearer",
         "user": user.to_dict()
     }
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+
+from ..config import settings
+from ..dependencies import PermissionChecker, get_current_user
+from ..schemas.engagement import UserEngagementCreate
+from ..services import counter_service
+from ..services.engagement_service import BufferFull, engagement_buffer, engagement_row
+from ..services.principal_cache import Principal
+
+router = APIRouter(prefix="/engagements", tags=["Engagements"])
+
+MAX_BATCH_EVENTS = settings.get("ENGAGEMENT_MAX_BATCH_EVENTS", 1000)
+
+# Operational numbers, for roles granted (metrics, read) only
+read_metrics_permission = PermissionChecker(action="read", obj="metrics")
+
+# Events are acknowledged once buffered (202) and written in batches.
+# The user is taken from the token, never from the payload, and is checked
+# against the users table (through the principal cache) as on other writes.
+
+def _enqueue(events: List[UserEngagementCreate], current_user: Principal):
+    rows = [engagement_row(e, current_user.id) for e in events]
+    try:
+        accepted = engagement_buffer.submit(rows)
+    except BufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Engagement ingestion is busy, retry later",
+            headers={"Retry-After": "1"},
+        )
+    # Likes/comments/shares reach news counters through the sharded counter
+    counter_service.record_events(rows)
+    return {"accepted": accepted}
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def record_engagement(
+    event: UserEngagementCreate,
+    current_user: Principal = Depends(get_current_user),
+):
+    return _enqueue([event], current_user)
+
+@router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def record_engagements(
+    events: List[UserEngagementCreate],
+    current_user: Principal = Depends(get_current_user),
+):
+    if len(events) > MAX_BATCH_EVENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_EVENTS} events per batch")
+    return _enqueue(events, current_user)
+
+@router.get("/stats", dependencies=[Depends(read_metrics_permission)])
+async def engagement_stats():
+    # Queue depth, flush latency and ingest lag of the write-behind buffer;
+    # the plain counters are also on /metrics
+    return engagement_buffer.stats()
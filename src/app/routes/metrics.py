@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response
+
+from .. import metrics
+from ..services import principal_cache, rbac_service
+from ..services.article_cache import article_cache
+from ..services.engagement_service import engagement_buffer
+
+router = APIRouter(tags=["metrics"])
+
+CACHE_COUNTERS = ("hits", "misses", "evictions", "local_hits", "remote_hits", "remote_errors")
+ENGAGEMENT_COUNTERS = ("accepted", "rejected", "written", "dropped", "retries", "flushes")
+
+metrics.register(metrics.stats_collector("rbac_decision_cache", rbac_service.get_decision_cache_stats, CACHE_COUNTERS))
+metrics.register(metrics.stats_collector("principal_cache", principal_cache.stats, CACHE_COUNTERS))
+metrics.register(metrics.stats_collector("article_cache", article_cache.stats, CACHE_COUNTERS))
+metrics.register(metrics.stats_collector("engagement_buffer", engagement_buffer.stats, ENGAGEMENT_COUNTERS))
+
+# Prometheus scrape endpoint (text exposition format)
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
 import uuid
+import logging
+import orjson
 from datetime import datetime
 
-from ..database import get_db
-from ..schemas.news import NewsCreate, NewsUpdate, News as NewsSchema, NewsFilter, NewsModerationCreate, NewsModeration
+from ..config import settings
+from ..logger import sampled_logger
+from ..database import get_session, get_read_session, DBSession
+from ..schemas.news import NewsCreate, NewsUpdate, News as NewsSchema, NewsFilter, NewsModerationCreate, NewsModeration, SemanticSearchRequest
 from ..controllers.news_controller import NewsController
+from ..services import export_service
+from .. import http_cache
 
-from ..dependencies import get_current_user, PermissionChecker
-from ..models.user import User
+from ..dependencies import get_read_principal, PermissionChecker, ReadPermissionChecker
+from ..services.principal_cache import Principal
 
 # Dependency to check permissions
 # For example, listing news requires "read" access to "news"
-read_news_permission = PermissionChecker(action="read", obj="news")
+read_news_permission = ReadPermissionChecker(action="read", obj="news")
 create_news_permission = PermissionChecker(action="create", obj="news")
 update_news_permission = PermissionChecker(action="update", obj="news")
 delete_news_permission = PermissionChecker(action="delete", obj="news")
@@ -24,26 +30,77 @@ router = APIRouter(prefix="/news", tags=["news"])
 # Initialize the controller
 controller = NewsController()
 
+# Per-request debug lines on the list path; only a sample is kept
+debug_log = sampled_logger(__name__)
+
+# List pages skip ORM objects and response_model validation, and are encoded with orjson
+FAST_LIST = bool(settings.get("NEWS_FAST_LIST", True))
+
 # Create News Route
 @router.post("/", response_model=NewsSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(create_news_permission)])
 async def create_news(
     news_data: NewsCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
+):
+    return await controller.create_news(db, news_data)
+
+# Bulk Create News Route (NDJSON body: one NewsCreate object per line)
+@router.post("/bulk", status_code=status.HTTP_200_OK, dependencies=[Depends(create_news_permission)])
+async def bulk_create_news(
+    request: Request,
+    db: DBSession = Depends(get_session)
 ):
-    return controller.create_news(db, news_data)
+    return await controller.bulk_create_news(db, request.stream())
 
 # List All News Route (with filters)
 @router.get("/", response_model=List[NewsSchema], dependencies=[Depends(read_news_permission)])
 async def list_news(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    categories: Optional[List[str]] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    search_query: Optional[str] = Query(None),
+    created_by: Optional[uuid.UUID] = Query(None),
+    db: DBSession = Depends(get_read_session),
+    current_user: Principal = Depends(get_read_principal)
+):
+    filters = NewsFilter(
+        categories=categories,
+        start_date=start_date,
+        end_date=end_date,
+        search_query=search_query,
+        created_by=created_by
+    )
+    if debug_log.isEnabledFor(logging.DEBUG):
+        debug_log.debug("list_news user role: %s", current_user.role)
+    rows = await controller.list_news(db, filters, skip, limit, cursor, fast=FAST_LIST)
+    # Keyset pagination: pass this back as ?cursor= for the next page
+    next_cursor = controller.next_cursor(rows, limit, filters)
+    validators = http_cache.list_validators(rows, next_cursor)
+    headers = validators.headers()
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if http_cache.is_not_modified(request.headers, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if FAST_LIST:
+        # OPT_UTC_Z writes UTC as "Z", as pydantic does for the schema path
+        response = Response(orjson.dumps(rows, option=orjson.OPT_UTC_Z), media_type="application/json")
+    response.headers.update(headers)
+    return response if FAST_LIST else rows
+
+# Export News Route (streams every matching row; declared before /{news_id})
+@router.get("/export", dependencies=[Depends(read_news_permission)])
+async def export_news(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
     categories: Optional[List[str]] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     search_query: Optional[str] = Query(None),
     created_by: Optional[uuid.UUID] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
 ):
     filters = NewsFilter(
         categories=categories,
@@ -52,34 +109,77 @@ async def list_news(
         search_query=search_query,
         created_by=created_by
     )
-    print(f"user role: {current_user.role}")
-    return controller.list_news(db, filters, skip, limit)
+    return StreamingResponse(
+        export_service.stream_export(filters, format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="news.{format}"'},
+    )
+
+# Local Feed Route (declared before /{news_id})
+@router.get("/local", response_model=List[NewsSchema], dependencies=[Depends(read_news_permission)])
+async def local_news(
+    skip: int = 0,
+    limit: int = 100,
+    location_id: Optional[uuid.UUID] = Query(None, description="Defaults to the reader's location"),
+    db: DBSession = Depends(get_read_session),
+    current_user: Principal = Depends(get_read_principal)
+):
+    rows = await controller.local_news(db, location_id or current_user.location_id, skip, limit)
+    # Always fast-path dicts with the live counter deltas already merged;
+    # validating them against NewsSchema again would add the deltas twice
+    return Response(orjson.dumps(rows, option=orjson.OPT_UTC_Z), media_type="application/json")
+
+# Semantic Search Route (articles closest to a query embedding)
+@router.post("/semantic-search", response_model=List[NewsSchema], dependencies=[Depends(read_news_permission)])
+async def semantic_search(
+    search: SemanticSearchRequest,
+    db: DBSession = Depends(get_read_session)
+):
+    return await controller.semantic_search(db, search)
 
 # Get Single News Route
 @router.get("/{news_id}", response_model=NewsSchema, dependencies=[Depends(read_news_permission)])
 async def get_news(
     news_id: uuid.UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session)
+):
+    if http_cache.has_conditions(request.headers):
+        # Revalidation only needs the version columns, not the article
+        validators = await controller.news_validators(db, news_id)
+        if http_cache.is_not_modified(request.headers, validators):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers())
+    news = await controller.get_news(db, news_id)
+    response.headers.update(http_cache.article_validators(news).headers())
+    return news
+
+# Related News Route (nearest neighbours by embedding)
+@router.get("/{news_id}/related", response_model=List[NewsSchema], dependencies=[Depends(read_news_permission)])
+async def related_news(
+    news_id: uuid.UUID,
+    limit: int = Query(10, ge=1, le=100),
+    db: DBSession = Depends(get_read_session)
 ):
-    return controller.get_news(db, news_id)
+    return await controller.related_news(db, news_id, limit)
 
 # Update News Route
 @router.put("/{news_id}", response_model=NewsSchema, dependencies=[Depends(update_news_permission)])
 async def update_news(
     news_id: uuid.UUID,
     news_data: NewsUpdate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    return controller.update_news(db, news_id, news_data)
+    return await controller.update_news(db, news_id, news_data)
 
 # Delete News Route
 @router.delete("/{news_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(delete_news_permission)])
 async def delete_news(
     news_id: uuid.UUID,
     user_id: Optional[uuid.UUID] = Query(None, description="User performing the deletion"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    return controller.delete_news(db, news_id, user_id)
+    return await controller.delete_news(db, news_id, user_id)
 
 # --- Moderation ---
 
@@ -87,6 +187,6 @@ async def delete_news(
 async def moderate_news(
     news_id: uuid.UUID,
     mod_data: NewsModerationCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    return controller.moderate_news(db, news_id, mod_data)
+    return await controller.moderate_news(db, news_id, mod_data)
@@ -3,9 +3,13 @@ from pydantic import BaseModel
 from typing import List
 from ..dependencies import get_current_user
 from ..models.user import User
+from ..services.principal_cache import Principal
 from ..services import rbac_service
 from ..database import get_db
 from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
 
 # NOTE: In production, you would add a permission check here!
 # For example: dependencies=[Depends(PermissionChecker("rbac", "write"))]
@@ -22,7 +26,7 @@ class RoleAssignment(BaseModel):
     role: str
 
 @router.post("/policies", status_code=status.HTTP_201_CREATED)
-def create_policy(policy: PolicyCreate, current_user: User = Depends(get_current_user)):
+def create_policy(policy: PolicyCreate, current_user: Principal = Depends(get_current_user)):
     # Simple check: only allow if user_role == 'admin' or something equivalent
     # For this dummy setup, we trust the caller if they are logged in.
     added = rbac_service.add_policy_to_role(policy.role, policy.obj, policy.action)
@@ -31,26 +35,28 @@ def create_policy(policy: PolicyCreate, current_user: User = Depends(get_current
     return {"message": "Policy added successfully"}
 
 @router.get("/policies")
-def list_policies(current_user: User = Depends(get_current_user)):
+def list_policies(current_user: Principal = Depends(get_current_user)):
     return {
         "policies": rbac_service.get_all_policies(),
         "grouping_policies": rbac_service.get_all_grouping_policies()
     }
 
+@router.get("/cache-stats")
+def decision_cache_stats(current_user: Principal = Depends(get_current_user)):
+    # Hit/miss counters of the permission decision cache
+    return rbac_service.get_decision_cache_stats()
+
 @router.post("/users/roles", status_code=status.HTTP_201_CREATED)
 def assign_role_to_user(
     assignment: RoleAssignment,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)  # Need DB access to update user table
 ):
-    print(f"Assigning role(s) {assignment.role} to user {assignment.user_id}")
+    logger.info("Assigning role(s) %s to user %s", assignment.role, assignment.user_id)
     roles = assignment.role if isinstance(assignment.role, list) else [assignment.role]
-    added_any = False
-    
-    # Update Casbin
-    for r in roles:
-        added = rbac_service.add_role_to_user(assignment.user_id, r)
-        added_any = added_any or bool(added)
+
+    # Update Casbin (one transaction for all roles)
+    added_any = rbac_service.add_roles_to_users([(assignment.user_id, r) for r in roles]) > 0
     
     # Update User Table (Sync)
     # Note: If multiple roles are assigned, we might only be able to store one 'primary' role 
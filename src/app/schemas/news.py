@@ -1,7 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, ValidationInfo, model_validator
+from typing import Optional, List, Dict, Any, Callable, Annotated
 from datetime import datetime
 import uuid
+from ..models.news import EMBEDDING_DIM
+
+# A News.embedding vector; must match the column dimension
+Embedding = Annotated[List[float], Field(min_length=EMBEDDING_DIM, max_length=EMBEDDING_DIM)]
 
 # --- News Media Schemas ---
 
@@ -44,6 +48,9 @@ class NewsCreate(BaseModel):
     categories: List[str]
     url: Optional[str] = None
     created_by: uuid.UUID
+    language: str = "en"
+    location_id: Optional[uuid.UUID] = None
+    embedding: Optional[Embedding] = None
     media: Optional[List[NewsMediaCreate]] = None
 
 class NewsUpdate(BaseModel):
@@ -51,6 +58,9 @@ class NewsUpdate(BaseModel):
     content: Optional[str] = None
     categories: Optional[List[str]] = None
     url: Optional[str] = None
+    language: Optional[str] = None
+    location_id: Optional[uuid.UUID] = None
+    embedding: Optional[Embedding] = None
     media: Optional[List[NewsMediaCreate]] = None
 
 class NewsFilter(BaseModel):
@@ -60,6 +70,18 @@ class NewsFilter(BaseModel):
     search_query: Optional[str] = None
     created_by: Optional[uuid.UUID] = None
 
+class SemanticSearchRequest(BaseModel):
+    embedding: Embedding
+    limit: int = Field(10, ge=1, le=100)
+
+# Set by counter_service.enable_live_counts(): returns the unflushed counter
+# deltas of a news id so responses show counts that look live.
+pending_counts: Optional[Callable[[uuid.UUID], Optional[Dict[str, int]]]] = None
+
+# Validation context that keeps the stored counts (used for cache entries,
+# which get the live deltas merged when they are served)
+RAW_COUNTS = {"raw_counts": True}
+
 class News(BaseModel):
     id: uuid.UUID
     headline: str
@@ -67,6 +89,8 @@ class News(BaseModel):
     categories: List[str]
     url: Optional[str]
     created_by: uuid.UUID
+    language: str = "en"
+    location_id: Optional[uuid.UUID] = None
     created_at: datetime
     updated_at: Optional[datetime]
     deleted_at: Optional[datetime]
@@ -79,3 +103,13 @@ class News(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @model_validator(mode="after")
+    def _merge_pending_counts(self, info: ValidationInfo):
+        if info.context and info.context.get("raw_counts"):
+            return self
+        deltas = pending_counts(self.id) if pending_counts else None
+        if deltas:
+            for field, delta in deltas.items():
+                setattr(self, field, (getattr(self, field) or 0) + delta)
+        return self
@@ -0,0 +1,86 @@
+"""
+Production server launch (``server_mode = "production"``).
+
+Runs gunicorn with uvicorn workers when gunicorn is installed (the
+``server`` extra): the app is imported once in the master (``preload_app``)
+and forked into ``SERVER_WORKERS`` workers, each of which sizes its pools
+with ``database.pool_limits`` and drops the inherited connections after
+fork. SIGTERM stops accepting connections and gives in-flight requests
+``SERVER_GRACEFUL_TIMEOUT`` seconds before the lifespan shutdown flushes the
+engagement and counter buffers.
+
+Without gunicorn, uvicorn's own process manager runs the same number of
+workers; they are spawned rather than forked, so each imports the app itself.
+"""
+
+import importlib.util
+import logging
+
+import uvicorn
+
+from .config import settings
+from .database import worker_count
+
+logger = logging.getLogger(__name__)
+
+APP = "src.app.main:app"
+
+# uvloop and httptools ship with uvicorn[standard]; uvloop is not on Windows
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def _worker_class():
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": LOOP, "http": HTTP}
+
+    return Worker
+
+
+def _run_gunicorn(host: str, port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    from .main import app
+
+    class Application(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": _worker_class(),
+                "preload_app": True,
+                "graceful_timeout": settings.get("SERVER_GRACEFUL_TIMEOUT", 30),
+                "keepalive": settings.get("SERVER_KEEPALIVE", 5),
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    Application().run()
+
+
+def run(host: str = "0.0.0.0", port: int = 8000) -> None:
+    workers = worker_count()
+    logger.info("Starting %d workers on %s:%d (loop=%s, http=%s)", workers, host, port, LOOP, HTTP)
+    if importlib.util.find_spec("gunicorn"):
+        _run_gunicorn(host, port, workers)
+        return
+
+    logger.warning("gunicorn is not installed; using uvicorn workers without preloading")
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=LOOP,
+        http=HTTP,
+        timeout_keep_alive=settings.get("SERVER_KEEPALIVE", 5),
+        timeout_graceful_shutdown=settings.get("SERVER_GRACEFUL_TIMEOUT", 30),
+    )
@@ -0,0 +1,167 @@
+"""
+Read-through cache of single articles for GET /news/{id}.
+
+Two tiers: an in-process LRU (``TTLCache``) in front of an optional shared
+Redis-protocol backend (``REDIS_URL``). Entries are plain dicts in the
+``News`` response shape with the stored counter values; unflushed counter
+deltas are merged when the response is validated, as for a DB read.
+
+Writers evict explicitly (update, delete, moderation, counter flushes). The
+local tier of other workers is only bounded by its short TTL; the shared
+tier is evicted for everyone.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Optional
+
+import orjson
+
+from ..cache import TTLCache
+from ..config import settings
+from ..schemas.news import RAW_COUNTS, News as NewsSchema
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "news:article:"
+
+
+def snapshot(news) -> dict:
+    """Cacheable dict of an ORM article (or of a decoded cache entry)."""
+    return NewsSchema.model_validate(news, context=RAW_COUNTS).model_dump()
+
+
+def encode(entry: dict) -> bytes:
+    return orjson.dumps(entry)
+
+
+def decode(raw: bytes) -> dict:
+    return NewsSchema.model_validate_json(raw, context=RAW_COUNTS).model_dump()
+
+
+class ArticleCache:
+    """
+    ``remote`` is anything with redis-py's ``get`` / ``set(ex=)`` / ``delete``.
+    Backend errors are counted and treated as misses, so a Redis outage
+    falls back to the database instead of failing reads.
+    """
+
+    def __init__(self, local: TTLCache, remote: Any = None, remote_ttl: int = 300):
+        self.local = local
+        self.remote = remote
+        self.remote_ttl = remote_ttl
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.remote_errors = 0
+
+    @staticmethod
+    def _key(news_id) -> str:
+        return f"{KEY_PREFIX}{news_id}"
+
+    def generation(self) -> int:
+        """Read before loading an article; pass to put() so stale loads are dropped."""
+        return self.local.generation
+
+    def get(self, news_id: uuid.UUID) -> Optional[dict]:
+        entry = self.local.get(news_id)
+        if entry is not None or self.remote is None:
+            return entry
+        generation = self.local.generation
+        try:
+            raw = self.remote.get(self._key(news_id))
+        except Exception:
+            self.remote_errors += 1
+            logger.warning("Article cache backend read failed", exc_info=True)
+            return None
+        if raw is None:
+            self.remote_misses += 1
+            return None
+        self.remote_hits += 1
+        entry = decode(raw)
+        self.local.set(news_id, entry, generation=generation)
+        return entry
+
+    def put(self, news_id: uuid.UUID, entry: dict, generation: Optional[int] = None) -> None:
+        if self.local.is_stale(news_id, generation):
+            return
+        self.local.set(news_id, entry, generation=generation)
+        if self.remote is not None:
+            try:
+                self.remote.set(self._key(news_id), encode(entry), ex=self.remote_ttl)
+            except Exception:
+                self.remote_errors += 1
+                logger.warning("Article cache backend write failed", exc_info=True)
+
+    def invalidate(self, *news_ids: uuid.UUID) -> None:
+        if not news_ids:
+            return
+        for news_id in news_ids:
+            self.local.delete(news_id)
+        if self.remote is not None:
+            try:
+                self.remote.delete(*(self._key(news_id) for news_id in news_ids))
+            except Exception:
+                self.remote_errors += 1
+                logger.warning("Article cache backend eviction failed", exc_info=True)
+
+    # The shared tier is a network call; keep it off the event loop
+    async def get_async(self, news_id: uuid.UUID) -> Optional[dict]:
+        if self.remote is None:
+            return self.get(news_id)
+        entry = self.local.get(news_id)
+        if entry is not None:
+            return entry
+        return await asyncio.to_thread(self.get, news_id)
+
+    async def put_async(self, news_id: uuid.UUID, entry: dict, generation: Optional[int] = None) -> None:
+        if self.remote is None:
+            return self.put(news_id, entry, generation)
+        await asyncio.to_thread(self.put, news_id, entry, generation)
+
+    async def invalidate_async(self, *news_ids: uuid.UUID) -> None:
+        if self.remote is None:
+            return self.invalidate(*news_ids)
+        await asyncio.to_thread(self.invalidate, *news_ids)
+
+    def clear(self) -> None:
+        # Only the local tier; shared entries expire after remote_ttl
+        self.local.clear()
+
+    def stats(self) -> dict:
+        local = self.local.stats()
+        hits = local["hits"] + self.remote_hits
+        return {
+            "size": local["size"],
+            "maxsize": local["maxsize"],
+            "evictions": local["evictions"],
+            "hits": hits,
+            "local_hits": local["hits"],
+            "remote_hits": self.remote_hits,
+            "misses": local["misses"] - self.remote_hits,
+            "hit_ratio": hits / (local["hits"] + local["misses"]) if local["hits"] + local["misses"] else 0.0,
+            "remote": self.remote is not None,
+            "remote_errors": self.remote_errors,
+        }
+
+
+def _remote_backend():
+    url = settings.get("REDIS_URL")
+    if not url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using the local cache only")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=settings.get("ARTICLE_CACHE_REMOTE_TIMEOUT", 0.05))
+
+
+article_cache = ArticleCache(
+    TTLCache(
+        maxsize=settings.get("ARTICLE_CACHE_SIZE", 10000),
+        ttl=settings.get("ARTICLE_CACHE_TTL", 5),
+    ),
+    remote=_remote_backend(),
+    remote_ttl=settings.get("ARTICLE_CACHE_REMOTE_TTL", 300),
+)
@@ -2,15 +2,15 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 from ..models.user import User
 from ..models.auth import OTPRequest
-from . import rbac_service
+from . import rbac_service, otp_hasher
 from ..config import settings
 import random
 import string
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 class AuthService:
     def __init__(self, db: Session):
@@ -22,7 +22,7 @@ class AuthService:
         
         # Check if we should hash it. For now, we store plain or hashed? 
         # Ideally store hashed.
-        otp_hash = pwd_context.hash(otp)
+        otp_hash = otp_hasher.hash_otp(otp)
         
         # Expiration
         expires_at = datetime.utcnow() + timedelta(minutes=5)
@@ -52,7 +52,7 @@ class AuthService:
         if not otp_req:
             return None
             
-        if not pwd_context.verify(otp, otp_req.otp_hash):
+        if not otp_hasher.verify_otp(otp, otp_req.otp_hash):
             return None
             
         # Mark used
@@ -89,4 +89,63 @@ class AuthService:
             expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-        return encoded_jwt
\ No newline at end of file
+        return encoded_jwt
+
+class AsyncAuthService(AuthService):
+    """AuthService for AsyncSession. Expensive OTP hashers run in their own
+    bounded executor and Casbin writes in the threadpool, off the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def generate_otp(self, mobile_e164: str, purpose: str = "login") -> str:
+        otp = "".join(random.choices(string.digits, k=6))
+        otp_hash = await otp_hasher.hash_otp_async(otp)
+
+        otp_request = OTPRequest(
+            mobile_e164=mobile_e164,
+            otp_hash=otp_hash,
+            purpose=purpose,
+            expires_at=datetime.utcnow() + timedelta(minutes=5)
+        )
+        self.db.add(otp_request)
+        await self.db.commit()
+        return otp
+
+    async def verify_otp(self, mobile_e164: str, otp: str, purpose: str = "login") -> Optional[User]:
+        otp_req = (await self.db.execute(
+            select(OTPRequest).where(
+                OTPRequest.mobile_e164 == mobile_e164,
+                OTPRequest.purpose == purpose,
+                OTPRequest.used == False,
+                OTPRequest.expires_at > datetime.utcnow()
+            ).order_by(OTPRequest.issued_at.desc()).limit(1)
+        )).scalars().first()
+
+        if not otp_req:
+            return None
+
+        if not await otp_hasher.verify_otp_async(otp, otp_req.otp_hash):
+            return None
+
+        otp_req.used = True
+        await self.db.commit()
+
+        user = (await self.db.execute(
+            select(User).where(User.mobile_e164 == mobile_e164)
+        )).scalars().first()
+        if not user:
+            user = User(
+                mobile_e164=mobile_e164,
+                username=f"user_{mobile_e164[-4:]}",
+                role="user",
+                location_id=None
+            )
+            self.db.add(user)
+            await self.db.commit()
+            await self.db.refresh(user)
+
+            # Same default 'g' policy as the sync path
+            await run_in_threadpool(rbac_service.add_role_to_user, str(user.id), "user")
+
+        return user
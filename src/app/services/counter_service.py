@@ -0,0 +1,315 @@
+"""
+Like/comment/share counters for news.
+
+Bumping ``news.likes_count`` per event serializes every writer of a viral
+story on its row lock. Instead, engagement events add deltas to sharded
+in-process counters, and a background task writes all accumulated deltas
+with one ``UPDATE news ... FROM (VALUES ...)`` per batch. A slower
+reconciliation pass recomputes the columns from ``user_engagements`` so
+deltas lost to a crash converge. It skips stories engaged with in the last
+``COUNTER_RECONCILE_SETTLE`` seconds: their rows or deltas may still be
+queued in some worker, and recounting them would drop or double count
+those events. Only one process reconciles: the one holding
+``RECONCILE_LOCK_KEY``.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Integer, case, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import aliased
+
+from ..config import settings
+from ..database import SessionLocal, engine
+from ..models.engagement import UserEngagement
+from ..models.news import News
+from ..schemas import news as news_schemas
+from .article_cache import article_cache
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("likes_count", "comments_count", "shares_count")
+
+# event_type -> (counter field, delta)
+EVENT_DELTAS = {
+    "like": ("likes_count", 1),
+    "unlike": ("likes_count", -1),
+    "comment": ("comments_count", 1),
+    "share": ("shares_count", 1),
+}
+
+
+class ShardedCounter:
+    """
+    Per-news deltas spread over ``shards`` lock-protected dicts, so
+    concurrent increments for different stories rarely share a lock.
+    A story always maps to the same shard.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards: List[Dict[uuid.UUID, Dict[str, int]]] = [{} for _ in range(shards)]
+
+    def _index(self, news_id: uuid.UUID) -> int:
+        return hash(news_id) % len(self._shards)
+
+    def add(self, news_id: uuid.UUID, field: str, delta: int = 1) -> None:
+        i = self._index(news_id)
+        with self._locks[i]:
+            counts = self._shards[i].setdefault(news_id, defaultdict(int))
+            counts[field] += delta
+
+    def pending(self, news_id: uuid.UUID) -> Optional[Dict[str, int]]:
+        """Unflushed deltas for one story, or None."""
+        i = self._index(news_id)
+        with self._locks[i]:
+            counts = self._shards[i].get(news_id)
+            return dict(counts) if counts else None
+
+    def drain(self) -> Dict[uuid.UUID, Dict[str, int]]:
+        """Take all deltas, leaving the counter empty."""
+        drained = {}
+        for i, lock in enumerate(self._locks):
+            with lock:
+                shard, self._shards[i] = self._shards[i], {}
+            drained.update(shard)
+        return drained
+
+    def restore(self, deltas: Dict[uuid.UUID, Dict[str, int]]) -> None:
+        """Put drained deltas back, e.g. after a failed flush."""
+        for news_id, counts in deltas.items():
+            for field, delta in counts.items():
+                self.add(news_id, field, delta)
+
+
+counter = ShardedCounter(settings.get("COUNTER_SHARDS", 16))
+
+
+def record_events(rows: Iterable[dict]) -> None:
+    """Count accepted engagement rows that target news."""
+    for row in rows:
+        delta = EVENT_DELTAS.get(row["event_type"])
+        if delta and row["entity_type"] == "news":
+            counter.add(row["entity_id"], *delta)
+
+
+def build_flush_statement(batch: Dict[uuid.UUID, Dict[str, int]]):
+    """UPDATE news ... FROM (VALUES ...) adding one batch of deltas."""
+    deltas = values(
+        column("id", UUID(as_uuid=True)),
+        *(column(field, Integer) for field in COUNTER_FIELDS),
+        name="deltas",
+    ).data([
+        (news_id, *(counts.get(field, 0) for field in COUNTER_FIELDS))
+        # Sorted so concurrent flushes from other workers lock rows in the same order
+        for news_id, counts in sorted(batch.items(), key=lambda item: item[0])
+    ])
+    return (
+        update(News)
+        .where(News.id == deltas.c.id)
+        .values({
+            field: func.coalesce(getattr(News, field), 0) + deltas.c[field]
+            for field in COUNTER_FIELDS
+        })
+        # Counter traffic is not an edit of the story; keep updated_at as is
+        .values(updated_at=News.updated_at)
+    )
+
+
+def flush_counters(batch_size: int = 1000) -> int:
+    """Write pending deltas; returns the number of stories updated."""
+    deltas = counter.drain()
+    if not deltas:
+        return 0
+    items = list(deltas.items())
+    for start in range(0, len(items), batch_size):
+        batch = dict(items[start:start + batch_size])
+        try:
+            with SessionLocal() as db:
+                db.execute(build_flush_statement(batch))
+                db.commit()
+            # Cached articles carry the stored counts
+            article_cache.invalidate(*batch)
+        except Exception:
+            # Keep the unwritten deltas for the next flush
+            counter.restore(dict(items[start:]))
+            raise
+    return len(items)
+
+
+def build_reconcile_statement(settle: float = 60.0):
+    """
+    Recompute the counter columns from user_engagements where they drifted,
+    including stories whose engagement rows are all gone (reset to 0).
+    Stories with an engagement in the last ``settle`` seconds are left for
+    a later pass. Returns the ids of the updated stories.
+    """
+    def count(event_type):
+        return func.count(case((UserEngagement.event_type == event_type, 1)))
+
+    totals = (
+        select(
+            UserEngagement.entity_id.label("news_id"),
+            (count("like") - count("unlike")).label("likes_count"),
+            count("comment").label("comments_count"),
+            count("share").label("shares_count"),
+            func.max(UserEngagement.created_at).label("last_event_at"),
+        )
+        .where(UserEngagement.entity_type == "news")
+        .group_by(UserEngagement.entity_id)
+        .subquery("totals")
+    )
+    # Every story, with 0 where no engagement rows are left
+    story = aliased(News, name="story")
+    expected = (
+        select(story.id, *(func.coalesce(totals.c[field], 0).label(field) for field in COUNTER_FIELDS))
+        .outerjoin(totals, totals.c.news_id == story.id)
+        # Settled: every row and delta of these stories has been written
+        .where(or_(
+            totals.c.last_event_at.is_(None),
+            totals.c.last_event_at < func.now() - timedelta(seconds=settle),
+        ))
+        .subquery("expected")
+    )
+    drifted = [
+        func.coalesce(getattr(News, field), 0) != expected.c[field]
+        for field in COUNTER_FIELDS
+    ]
+    return (
+        update(News)
+        .where(News.id == expected.c.id, or_(*drifted))
+        .values({field: expected.c[field] for field in COUNTER_FIELDS})
+        .values(updated_at=News.updated_at)
+        .returning(News.id)
+    )
+
+
+# pg_advisory_lock key held by the one process that reconciles counters
+RECONCILE_LOCK_KEY = 7_125_663_442_118_602
+
+
+class ReconcileLeader:
+    """
+    Elects one process, across workers and hosts, to run the reconcile.
+
+    The leader is whoever holds a session-level advisory lock on a
+    dedicated connection. When it exits or its connection drops, the lock
+    is released and the next worker to try takes over.
+    """
+
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        if self._conn is not None:
+            try:
+                self._conn.execute(select(1))
+                return True
+            except Exception:
+                logger.warning("Lost the counter reconcile lock connection", exc_info=True)
+                self.release()
+        # Autocommit, so the held connection never sits idle in a transaction
+        conn = self.bind.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            if conn.execute(select(func.pg_try_advisory_lock(RECONCILE_LOCK_KEY))).scalar():
+                self._conn = conn
+                return True
+        except Exception:
+            conn.invalidate()
+            conn.close()
+            raise
+        conn.close()
+        return False
+
+    def release(self) -> None:
+        if self._conn is not None:
+            # A pooled connection would keep the session lock; discard it instead
+            self._conn.invalidate()
+            self._conn.close()
+            self._conn = None
+
+
+reconcile_leader = ReconcileLeader()
+
+
+def reconcile_counters(settle: float = 60.0) -> Optional[int]:
+    """Reconcile in the elected process; None (nothing run) everywhere else."""
+    if not reconcile_leader.acquire():
+        return None
+    with SessionLocal() as db:
+        fixed = db.execute(build_reconcile_statement(settle)).scalars().all()
+        db.commit()
+    if fixed:
+        # Cached articles carry the stored counts
+        article_cache.invalidate(*fixed)
+    return len(fixed)
+
+
+class CounterFlusher:
+    """Background task flushing counters and, less often, reconciling them."""
+
+    def __init__(self, flush_interval: float = 5.0, reconcile_interval: float = 600.0, batch_size: int = 1000,
+                 reconcile_settle: float = 60.0):
+        self.flush_interval = flush_interval
+        self.reconcile_interval = reconcile_interval
+        self.batch_size = batch_size
+        self.reconcile_settle = reconcile_settle
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="counter-flush")
+
+    async def stop(self) -> None:
+        """Stop the loop and write the remaining deltas."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+        await asyncio.to_thread(reconcile_leader.release)
+
+    async def _flush(self) -> None:
+        try:
+            await asyncio.to_thread(flush_counters, self.batch_size)
+        except Exception:
+            logger.exception("Failed to flush news counters")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_reconcile = loop.time() + self.reconcile_interval
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+            if self.reconcile_interval and loop.time() >= next_reconcile:
+                next_reconcile = loop.time() + self.reconcile_interval
+                try:
+                    fixed = await asyncio.to_thread(reconcile_counters, self.reconcile_settle)
+                    if fixed:
+                        logger.info("Reconciled counters of %d news rows", fixed)
+                except Exception:
+                    logger.exception("Failed to reconcile news counters")
+
+
+counter_flusher = CounterFlusher(
+    flush_interval=settings.get("COUNTER_FLUSH_INTERVAL", 5.0),
+    reconcile_interval=settings.get("COUNTER_RECONCILE_INTERVAL", 600),
+    batch_size=settings.get("COUNTER_FLUSH_BATCH", 1000),
+    reconcile_settle=settings.get("COUNTER_RECONCILE_SETTLE", 60),
+)
+
+
+def enable_live_counts() -> None:
+    """Make the News schema add unflushed deltas to the counts it returns."""
+    news_schemas.pending_counts = counter.pending
@@ -0,0 +1,156 @@
+"""
+In-process nearest-neighbour index over news embeddings.
+
+Used when News.embedding is stored as JSONB and Postgres cannot rank by
+vector distance. Embeddings are kept L2-normalized in one float32 matrix,
+so cosine similarity for a query is a single matrix-vector product. The
+matrix is built lazily on the first search, kept current by the news
+services on create, update and delete, and rebuilt after
+``refresh_interval`` seconds to pick up writes made by other workers.
+Builds are single-flight: the first one blocks the searches waiting for it,
+a refresh runs in a background thread while searches use the current
+matrix.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..models.news import EMBEDDING_DIM
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vector, dim: int) -> Optional[np.ndarray]:
+    v = np.asarray(vector, dtype=np.float32)
+    if v.shape != (dim,):
+        return None
+    norm = np.linalg.norm(v)
+    return v / norm if norm else None
+
+
+class EmbeddingIndex:
+    def __init__(self, dim: int = EMBEDDING_DIM, refresh_interval: Optional[float] = None):
+        self.dim = dim
+        self.refresh_interval = refresh_interval
+        self.built_at: Optional[float] = None
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._ids: List[uuid.UUID] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def needs_build(self) -> bool:
+        if self.built_at is None:
+            return True
+        return bool(self.refresh_interval) and time.monotonic() - self.built_at > self.refresh_interval
+
+    def build(self, rows: Iterable[Tuple[uuid.UUID, Sequence[float]]]) -> None:
+        """Replace the index contents with ``(news_id, embedding)`` rows."""
+        ids, vectors = [], []
+        for news_id, embedding in rows:
+            v = _normalize(embedding, self.dim) if embedding is not None else None
+            if v is not None:
+                ids.append(news_id)
+                vectors.append(v)
+        matrix = np.vstack(vectors) if vectors else np.empty((0, self.dim), dtype=np.float32)
+        with self._lock:
+            self._matrix = matrix
+            self._ids = ids
+            self._rows = {news_id: i for i, news_id in enumerate(ids)}
+            self.built_at = time.monotonic()
+
+    def ensure_built(self, load_rows: Callable[[], Iterable[Tuple[uuid.UUID, Sequence[float]]]]) -> None:
+        """
+        Build from ``load_rows()`` if the index is missing; if it is only
+        stale, start one background refresh and return straight away.
+        ``load_rows`` must open its own session for the background case.
+        """
+        if not self.needs_build:
+            return
+        if self.built_at is not None:
+            self._refresh_in_background(load_rows)
+            return
+        with self._build_lock:
+            if self.built_at is None:
+                self.build(load_rows())
+
+    def _refresh_in_background(self, load_rows) -> None:
+        # Whoever holds the build lock is already building
+        if not self._build_lock.acquire(blocking=False):
+            return
+
+        def refresh():
+            try:
+                if self.needs_build:
+                    self.build(load_rows())
+            except Exception:
+                logger.exception("Embedding index refresh failed; keeping the current index")
+            finally:
+                self._build_lock.release()
+
+        threading.Thread(target=refresh, name="embedding-index-refresh", daemon=True).start()
+
+    def upsert(self, news_id: uuid.UUID, embedding: Optional[Sequence[float]]) -> None:
+        v = _normalize(embedding, self.dim) if embedding is not None else None
+        if v is None:
+            self.remove(news_id)
+            return
+        with self._lock:
+            if self.built_at is None:
+                return  # Picked up by the lazy build
+            row = self._rows.get(news_id)
+            if row is not None:
+                self._matrix[row] = v
+                return
+            size = len(self._ids)
+            if size == len(self._matrix):
+                # Grow geometrically so appends are amortized O(dim)
+                grown = np.empty((max(16, size * 2), self.dim), dtype=np.float32)
+                grown[:size] = self._matrix[:size]
+                self._matrix = grown
+            self._matrix[size] = v
+            self._ids.append(news_id)
+            self._rows[news_id] = size
+
+    def remove(self, news_id: uuid.UUID) -> None:
+        with self._lock:
+            row = self._rows.pop(news_id, None)
+            if row is None:
+                return
+            # Move the last row into the gap
+            last = len(self._ids) - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = self._ids[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+
+    def search(self, vector: Sequence[float], k: int, exclude: Iterable[uuid.UUID] = ()) -> List[Tuple[uuid.UUID, float]]:
+        """The ``k`` most cosine-similar ``(news_id, similarity)`` pairs, best first."""
+        q = _normalize(vector, self.dim)
+        if q is None or k <= 0:
+            return []
+        exclude = set(exclude)
+        with self._lock:
+            size = len(self._ids)
+            if not size:
+                return []
+            scores = self._matrix[:size] @ q
+            n = min(k + len(exclude), size)
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top])]
+            hits = [(self._ids[i], float(scores[i])) for i in top]
+        return [hit for hit in hits if hit[0] not in exclude][:k]
+
+
+embedding_index = EmbeddingIndex(refresh_interval=settings.get("EMBEDDING_INDEX_REFRESH", 300))
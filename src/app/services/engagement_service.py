@@ -0,0 +1,207 @@
+"""
+Write-behind ingestion of user engagement events (views, likes, shares).
+
+Events are queued in memory and written in batches with one multi-row
+INSERT, so the primary sees one statement per flush instead of one per
+event. A flush happens when ``batch_size`` events are waiting or
+``flush_interval`` seconds after the first one arrived, whichever comes
+first. A failed write is retried ``max_retries`` times with exponential
+backoff before the batch is dropped (counted in ``dropped``); while it
+retries the queue keeps filling, so submit() raises BufferFull and the
+route answers 503 so clients back off. Events still queued at shutdown are
+drained by stop().
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.engagement import UserEngagement
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFull(Exception):
+    """The engagement buffer cannot take more events right now."""
+
+
+def write_engagements(rows: List[dict]) -> None:
+    """Insert a batch of user_engagements rows in one multi-row INSERT."""
+    with SessionLocal() as db:
+        db.execute(insert(UserEngagement), rows)
+        db.commit()
+
+
+class EngagementBuffer:
+    def __init__(
+        self,
+        writer: Callable[[List[dict]], None] = write_engagements,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.writer = writer
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.dropped = 0
+        self.retries = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        # One extra slot for the stop sentinel
+        self._queue = asyncio.Queue(maxsize=self.max_size + 1)
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="engagement-flush")
+
+    async def stop(self) -> None:
+        """Stop accepting events and wait until everything queued is written."""
+        if not self.running:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+
+    def submit(self, events: Sequence[dict]) -> int:
+        """Queue events for writing. All or none are accepted."""
+        if not self.running or self._closing:
+            raise BufferFull("Engagement buffer is not running")
+        if self._queue.qsize() + len(events) > self.max_size:
+            self.rejected += len(events)
+            raise BufferFull("Engagement buffer is full")
+        received_at = time.monotonic()
+        for event in events:
+            self._queue.put_nowait((received_at, event))
+        self.accepted += len(events)
+        return len(events)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+            deadline = item[0] + self.flush_interval
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                if self._queue.empty():
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+            # None is the stop sentinel; it is queued after the last event
+            stopping = item is None
+            await self._flush(batch)
+
+    async def _flush(self, batch: list) -> None:
+        if not batch:
+            return
+        rows = [event for _, event in batch]
+        start = time.monotonic()
+        if not await self._write(rows):
+            self.dropped += len(rows)
+            return
+        end = time.monotonic()
+
+        flush_ms = (end - start) * 1000
+        lag_ms = (end - min(received_at for received_at, _ in batch)) * 1000
+        self.flushes += 1
+        self.written += len(rows)
+        self.last_flush_ms = flush_ms
+        self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+        self._total_flush_ms += flush_ms
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    async def _write(self, rows: List[dict]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Blocking DB write; keep it off the event loop
+                await asyncio.to_thread(self.writer, rows)
+                return True
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception("Failed to write %d engagement events after %d attempts; dropping them", len(rows), attempt + 1)
+                    return False
+                logger.warning("Failed to write %d engagement events; retrying", len(rows), exc_info=True)
+                self.retries += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_size": self.max_size,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "flushes": self.flushes,
+            "flush_latency_ms": {
+                "last": self.last_flush_ms,
+                "avg": self._total_flush_ms / self.flushes if self.flushes else 0.0,
+                "max": self.max_flush_ms,
+            },
+            # Time from an event being accepted to being committed, oldest in batch
+            "ingest_lag_ms": {
+                "last": self.last_lag_ms,
+                "max": self.max_lag_ms,
+            },
+        }
+
+
+def engagement_row(event, user_id) -> dict:
+    """user_engagements row for an accepted UserEngagementCreate."""
+    return {
+        "user_id": user_id,
+        "event_type": event.event_type,
+        "entity_type": event.entity_type,
+        "entity_id": event.entity_id,
+        "meta_data": event.meta_data,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+engagement_buffer = EngagementBuffer(
+    max_size=settings.get("ENGAGEMENT_BUFFER_SIZE", 10000),
+    batch_size=settings.get("ENGAGEMENT_BATCH_SIZE", 500),
+    flush_interval=settings.get("ENGAGEMENT_FLUSH_INTERVAL", 1.0),
+    max_retries=settings.get("ENGAGEMENT_FLUSH_RETRIES", 3),
+    retry_backoff=settings.get("ENGAGEMENT_RETRY_BACKOFF", 0.5),
+)
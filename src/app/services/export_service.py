@@ -0,0 +1,112 @@
+"""
+Streaming export of news as NDJSON or CSV.
+
+Rows are read through a server-side cursor (``yield_per``) and encoded one
+partition at a time, so memory stays flat however many rows match. The
+export opens its own session: the request-scoped one is closed before a
+streamed body is finished.
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Sequence, Union
+
+from sqlalchemy import select
+
+from ..config import settings
+from ..database import ASYNC_DB, AsyncReadSessionLocal, ReadSessionLocal
+from ..models.news import News as NewsModel
+from ..schemas.news import NewsFilter
+from .news_service import _apply_filters
+
+EXPORT_BATCH_SIZE = settings.get("NEWS_EXPORT_BATCH_SIZE", 1000)
+
+# Plain columns only: no ORM objects, relationships or embeddings
+EXPORT_COLUMNS = (
+    NewsModel.id,
+    NewsModel.headline,
+    NewsModel.content,
+    NewsModel.categories,
+    NewsModel.url,
+    NewsModel.language,
+    NewsModel.created_by,
+    NewsModel.created_at,
+    NewsModel.updated_at,
+    NewsModel.likes_count,
+    NewsModel.comments_count,
+    NewsModel.shares_count,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_query(filter_params: NewsFilter):
+    stmt = _apply_filters(select(*EXPORT_COLUMNS), filter_params)
+    return stmt.order_by(NewsModel.created_at.desc(), NewsModel.id.desc()).execution_options(
+        yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(rows: Sequence) -> str:
+    return "".join(json.dumps(row._asdict(), default=_json_default) + "\n" for row in rows)
+
+
+def encode_csv(rows: Sequence, header: bool = False) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow([
+            ";".join(value) if isinstance(value, list) else
+            value.isoformat() if isinstance(value, datetime) else
+            value
+            for value in row
+        ])
+    return out.getvalue()
+
+
+def _encode(rows: Sequence, format: str, first: bool) -> str:
+    if format == "csv":
+        return encode_csv(rows, header=first)
+    return encode_ndjson(rows)
+
+
+def _stream_sync(filter_params: NewsFilter, format: str) -> Iterator[str]:
+    # StreamingResponse pulls a sync iterator from the threadpool
+    with ReadSessionLocal() as db:
+        first = True
+        for partition in db.execute(export_query(filter_params)).partitions():
+            yield _encode(partition, format, first)
+            first = False
+        if first and format == "csv":
+            yield encode_csv([], header=True)
+
+
+async def _stream_async(filter_params: NewsFilter, format: str) -> AsyncIterator[str]:
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(export_query(filter_params))
+        first = True
+        async for partition in result.partitions():
+            yield _encode(partition, format, first)
+            first = False
+        if first and format == "csv":
+            yield encode_csv([], header=True)
+
+
+def stream_export(filter_params: NewsFilter, format: str = "ndjson") -> Union[Iterator[str], AsyncIterator[str]]:
+    if ASYNC_DB:
+        return _stream_async(filter_params, format)
+    return _stream_sync(filter_params, format)
@@ -0,0 +1,66 @@
+"""
+Location hierarchy lookups for the local news feed.
+
+Locations are flat rows: a state row has no district or mandal_or_village, a
+district row has no mandal_or_village. The ``locations_ancestors`` trigger
+stores each row's path as ``ancestor_ids`` ([state, district, self], outermost
+first) and news copy it into ``news.location_ancestors``, so "everything in
+this district" is one GIN-indexed array test instead of a walk up the
+hierarchy. Paths change only when locations are added, so they are cached
+here for ``LOCATION_CACHE_TTL`` seconds.
+"""
+
+import uuid
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.location import Location
+
+_ancestors = TTLCache(
+    maxsize=settings.get("LOCATION_CACHE_SIZE", 10000),
+    ttl=settings.get("LOCATION_CACHE_TTL", 300),
+)
+
+
+def _ancestors_query(location_id: uuid.UUID):
+    return select(Location.ancestor_ids).where(Location.id == location_id)
+
+
+def _path(location_id: uuid.UUID, row) -> Optional[Tuple[uuid.UUID, ...]]:
+    if row is None:
+        return None
+    if not row.ancestor_ids:
+        # Not filled by the trigger yet: match its own stories, but look again
+        # next time instead of caching the partial path
+        return (location_id,)
+    path = tuple(row.ancestor_ids)
+    _ancestors.set(location_id, path)
+    return path
+
+
+def ancestor_ids(db: Session, location_id: uuid.UUID) -> Optional[Tuple[uuid.UUID, ...]]:
+    """Path of ``location_id``, outermost first; None if there is no such location."""
+    path = _ancestors.get(location_id)
+    if path is None:
+        path = _path(location_id, db.execute(_ancestors_query(location_id)).first())
+    return path
+
+
+async def ancestor_ids_async(db: AsyncSession, location_id: uuid.UUID) -> Optional[Tuple[uuid.UUID, ...]]:
+    path = _ancestors.get(location_id)
+    if path is None:
+        path = _path(location_id, (await db.execute(_ancestors_query(location_id))).first())
+    return path
+
+
+def clear() -> None:
+    _ancestors.clear()
+
+
+def stats() -> dict:
+    return _ancestors.stats()
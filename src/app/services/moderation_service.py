@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from ..models.news import NewsModeration, News
 from ..schemas.news import NewsModerationCreate
+from .article_cache import article_cache
 from datetime import datetime
 import uuid
 
@@ -35,5 +38,36 @@ class ModerationService:
             db.add(db_mod)
             
         db.commit()
+        article_cache.invalidate(news_id)
         db.refresh(db_mod)
         return db_mod
+
+class AsyncModerationService:
+    async def moderate_news(self, db: AsyncSession, news_id: uuid.UUID, mod_data: NewsModerationCreate):
+        news = (await db.execute(select(News.id).where(News.id == news_id))).first()
+        if not news:
+            return None
+
+        # Single current status per article, same as ModerationService
+        existing_mod = (await db.execute(
+            select(NewsModeration).where(NewsModeration.news_id == news_id)
+        )).scalars().first()
+        if existing_mod:
+            existing_mod.status = mod_data.status
+            existing_mod.reason = mod_data.reason
+            existing_mod.acted_by = mod_data.acted_by
+            existing_mod.acted_at = datetime.utcnow()
+            db_mod = existing_mod
+        else:
+            db_mod = NewsModeration(
+                news_id=news_id,
+                status=mod_data.status,
+                reason=mod_data.reason,
+                acted_by=mod_data.acted_by
+            )
+            db.add(db_mod)
+
+        await db.commit()
+        await article_cache.invalidate_async(news_id)
+        await db.refresh(db_mod)
+        return db_mod
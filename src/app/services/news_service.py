@@ -1,94 +1,434 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
-from datetime import datetime
-from ..models.news import News as NewsModel, NewsMedia
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, tuple_, func, literal, case
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import json
+import uuid
+from ..config import settings
+from ..database import ReadSessionLocal
+from ..models.news import News as NewsModel, NewsMedia, NewsModeration, PGVECTOR_ENABLED
+from ..schemas import news as news_schemas
 from ..schemas.news import NewsCreate, NewsUpdate, NewsFilter
+from .article_cache import article_cache
+from .embedding_index import embedding_index
+from . import location_service
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Relationships the News response schema serializes, loaded up front
+def _news_load_options():
+    return (
+        selectinload(NewsModel.media),
+        joinedload(NewsModel.moderation),
+    )
+
+# --- Full-text search ---
+# Postgres text-search configuration per language code. Languages without a
+# stemmer fall back to 'simple'. Keep in sync with news_search_config() in
+# the a61d0e93c5f8 migration, which the indexing trigger uses.
+TEXT_SEARCH_CONFIGS = {
+    "en": "english",
+    "es": "spanish",
+    "fr": "french",
+    "de": "german",
+    "it": "italian",
+    "pt": "portuguese",
+    "ru": "russian",
+}
+SEARCH_CONFIGS = (*dict.fromkeys(TEXT_SEARCH_CONFIGS.values()), "simple")
+
+def _search_tsquery(filter_params: NewsFilter):
+    """Search terms parsed with every config a document can be indexed with.
+
+    A constant, so ``search_vector @@`` can use the GIN index whatever the
+    language of each row.
+    """
+    if not filter_params.search_query:
+        return None
+    queries = [func.websearch_to_tsquery(literal(config, REGCONFIG), filter_params.search_query) for config in SEARCH_CONFIGS]
+    tsquery = queries[0]
+    for query in queries[1:]:
+        tsquery = tsquery.op("||")(query)
+    return tsquery
+
+def _row_tsquery(filter_params: NewsFilter):
+    """Search terms parsed with the row's own config, as its search_vector was."""
+    return func.websearch_to_tsquery(func.news_search_config(NewsModel.language), filter_params.search_query)
+
+# Works on both a legacy Query and a 2.0 select() since both expose .filter()
+def _apply_filters(query, filter_params: NewsFilter):
+    query = query.filter(NewsModel.deleted_at.is_(None))
+
+    if filter_params.categories:
+        # Check if ANY of the categories match (array overlap)
+        # Use param binding for safety with custom op, implies array parameters
+        query = query.filter(NewsModel.categories.op("&&")(filter_params.categories))
+
+    if filter_params.start_date:
+        query = query.filter(NewsModel.created_at >= filter_params.start_date)
+
+    if filter_params.end_date:
+        query = query.filter(NewsModel.created_at <= filter_params.end_date)
+
+    tsquery = _search_tsquery(filter_params)
+    if tsquery is not None:
+        # Served by the GIN index on search_vector; the candidates are then
+        # rechecked against the terms stemmed the way each row was indexed
+        query = query.filter(
+            NewsModel.search_vector.op("@@")(tsquery),
+            NewsModel.search_vector.op("@@")(_row_tsquery(filter_params)),
+        )
+
+    if filter_params.created_by:
+        query = query.filter(NewsModel.created_by == filter_params.created_by)
+
+    return query
+
+# --- Keyset pagination ---
+# The feed is ordered by (created_at, id) descending; a cursor is the sort key
+# of the last row served, so the next page is a range scan on
+# ix_news_feed instead of an OFFSET that reads and discards skipped rows.
+
+def encode_cursor(news) -> str:
+    """Cursor after ``news``: a News row or a dict from the fast list path."""
+    if isinstance(news, dict):
+        created_at, news_id = news["created_at"], news["id"]
+    else:
+        created_at, news_id = news.created_at, news.id
+    raw = json.dumps([created_at.isoformat(), str(news_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """Return the (created_at, id) sort key in ``cursor``; ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, news_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(news_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def _apply_page(query, skip: int, limit: int, cursor: Optional[str] = None, filter_params: Optional[NewsFilter] = None):
+    if filter_params and filter_params.search_query:
+        # Search results are ranked by relevance, so they page by offset
+        rank = func.ts_rank(NewsModel.search_vector, _row_tsquery(filter_params))
+        return query.order_by(rank.desc(), NewsModel.created_at.desc(), NewsModel.id.desc()).offset(skip).limit(limit)
+    if cursor:
+        query = query.filter(tuple_(NewsModel.created_at, NewsModel.id) < tuple_(*decode_cursor(cursor)))
+    # A legacy Query rejects order_by() once OFFSET/LIMIT is applied
+    query = query.order_by(NewsModel.created_at.desc(), NewsModel.id.desc())
+    if not cursor:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+# --- Fast list path ---
+# Selects just the columns the News response schema needs and builds plain
+# dicts, skipping ORM identity-map bookkeeping and pydantic validation of
+# every row; the route encodes the result with orjson. Keep the field lists
+# in sync with schemas/news.py.
+
+NEWS_LIST_COLUMNS = (
+    NewsModel.id, NewsModel.headline, NewsModel.content, NewsModel.categories,
+    NewsModel.url, NewsModel.created_by, NewsModel.language, NewsModel.location_id, NewsModel.created_at,
+    NewsModel.updated_at, NewsModel.deleted_at, NewsModel.likes_count,
+    NewsModel.comments_count, NewsModel.shares_count,
+)
+MODERATION_COLUMNS = (
+    NewsModeration.id, NewsModeration.status, NewsModeration.reason,
+    NewsModeration.acted_by, NewsModeration.acted_at,
+)
+MEDIA_COLUMNS = (
+    NewsMedia.id, NewsMedia.news_id, NewsMedia.media_type, NewsMedia.url,
+    NewsMedia.metadata_, NewsMedia.created_at,
+)
+
+def _rows_select():
+    # Moderation is one row per article, so it rides along on an outer join
+    moderation = [c.label(f"moderation_{c.key}") for c in MODERATION_COLUMNS]
+    return select(*NEWS_LIST_COLUMNS, *moderation).outerjoin(
+        NewsModeration, NewsModeration.news_id == NewsModel.id
+    )
+
+def _list_rows_query(filter_params: NewsFilter, skip: int, limit: int, cursor: Optional[str] = None):
+    return _apply_page(_apply_filters(_rows_select(), filter_params), skip, limit, cursor, filter_params)
+
+# --- Local feed ---
+# Every story tagged anywhere in the reader's state shares the state id in
+# location_ancestors, so one overlap test on the GIN index finds them all;
+# the deepest level shared with the reader ranks them: their own mandal,
+# then their district, then the rest of the state. Tiers break the
+# (created_at, id) order, so the feed pages by offset.
+
+LOCAL_FEED_DAYS = settings.get("NEWS_LOCAL_FEED_DAYS", 30)
+
+def _local_tier(ancestors: Sequence[uuid.UUID]):
+    # ancestors run outermost first; the reader's own location is tier 0
+    return case(
+        *[(NewsModel.location_ancestors.op("@>")([a]), tier) for tier, a in enumerate(reversed(ancestors))],
+        else_=len(ancestors),
+    )
+
+def _local_rows_query(ancestors: Sequence[uuid.UUID], skip: int, limit: int, days: Optional[int] = LOCAL_FEED_DAYS):
+    stmt = _rows_select().where(
+        NewsModel.deleted_at.is_(None),
+        NewsModel.location_ancestors.op("&&")(list(ancestors)),
+    )
+    if days:
+        # Bounds how much of a busy state is sorted per page
+        stmt = stmt.where(NewsModel.created_at >= datetime.now(timezone.utc) - timedelta(days=days))
+    return stmt.order_by(
+        _local_tier(ancestors), NewsModel.created_at.desc(), NewsModel.id.desc()
+    ).offset(skip).limit(limit)
+
+# Only what the HTTP validators need; see app/http_cache.py
+def _validators_query(news_id):
+    return select(
+        NewsModel.id, NewsModel.created_at, NewsModel.updated_at,
+        NewsModel.likes_count, NewsModel.comments_count, NewsModel.shares_count,
+        NewsModeration.acted_at.label("moderation_acted_at"),
+    ).outerjoin(NewsModeration, NewsModeration.news_id == NewsModel.id).where(
+        NewsModel.id == news_id,
+        NewsModel.deleted_at.is_(None)
+    )
+
+def _media_query(news_ids):
+    return select(*MEDIA_COLUMNS).where(NewsMedia.news_id.in_(news_ids)).order_by(NewsMedia.created_at)
+
+def build_news_dicts(rows, media_rows) -> List[dict]:
+    media_by_news = {}
+    for m in media_rows:
+        media_by_news.setdefault(m.news_id, []).append({
+            "media_type": m.media_type,
+            "url": m.url,
+            "metadata_": m.metadata_,
+            "id": m.id,
+            "news_id": m.news_id,
+            "created_at": m.created_at,
+        })
+
+    pending_counts = news_schemas.pending_counts
+    items = []
+    for row in rows:
+        item = {c.key: getattr(row, c.key) for c in NEWS_LIST_COLUMNS}
+        item["media"] = media_by_news.get(row.id, [])
+        item["moderation"] = None if row.moderation_id is None else {
+            "status": row.moderation_status,
+            "reason": row.moderation_reason,
+            "acted_by": row.moderation_acted_by,
+            "id": row.moderation_id,
+            "news_id": row.id,
+            "acted_at": row.moderation_acted_at,
+        }
+        deltas = pending_counts(row.id) if pending_counts else None
+        if deltas:
+            for field, delta in deltas.items():
+                item[field] = (item[field] or 0) + delta
+        items.append(item)
+    return items
+
+# --- Vector similarity ---
+# With pgvector, Postgres ranks by cosine distance (<=>) using the HNSW index.
+# With JSONB embeddings, the in-process embedding_index ranks and Postgres
+# only loads the winning rows.
+
+def _with_embedding(query, exclude_id=None):
+    query = query.filter(NewsModel.deleted_at.is_(None), NewsModel.embedding.isnot(None))
+    if exclude_id is not None:
+        query = query.filter(NewsModel.id != exclude_id)
+    return query
+
+def _rank_by_distance(query, embedding, limit: int, exclude_id=None):
+    return _with_embedding(query, exclude_id).order_by(NewsModel.embedding.cosine_distance(embedding)).limit(limit)
+
+def _in_order(rows, ids):
+    by_id = {row.id: row for row in rows}
+    return [by_id[news_id] for news_id in ids if news_id in by_id]
+
+def _embedding_rows():
+    # Its own session: a background refresh outlives the request that started it
+    with ReadSessionLocal() as db:
+        yield from _with_embedding(db.query(NewsModel.id, NewsModel.embedding)).yield_per(1000)
+
+# Concurrent first searches on the event loop wait here for one build,
+# instead of each taking a threadpool thread to wait on the index's lock
+_index_build_lock = asyncio.Lock()
+
+async def _ensure_index_async():
+    if not embedding_index.needs_build:
+        return
+    if embedding_index.built_at is not None:
+        # Stale: starts the background refresh without blocking
+        embedding_index.ensure_built(_embedding_rows)
+        return
+    async with _index_build_lock:
+        # Loading and building are blocking; keep them off the event loop
+        await asyncio.to_thread(embedding_index.ensure_built, _embedding_rows)
+
+def _index_embedding(news_id, embedding):
+    # Keep the JSONB-mode index in step with writes made by this process
+    if not PGVECTOR_ENABLED:
+        embedding_index.upsert(news_id, embedding)
+
+def _unindex(news_id):
+    if not PGVECTOR_ENABLED:
+        embedding_index.remove(news_id)
+
+def _new_news(news_data: NewsCreate) -> NewsModel:
+    return NewsModel(
+        headline=news_data.headline,
+        content=news_data.content,
+        categories=news_data.categories,
+        url=news_data.url,
+        created_by=news_data.created_by,
+        language=news_data.language,
+        location_id=news_data.location_id,
+        embedding=news_data.embedding
+    )
+
+def _new_media(news_id, m) -> NewsMedia:
+    return NewsMedia(
+        news_id=news_id,
+        media_type=m.media_type,
+        url=m.url,
+        metadata_=m.metadata_ # Pydantic alias handling might differ, keeping simple for now
+    )
+
+# --- Bulk ingestion ---
+# One multi-row INSERT ... RETURNING per table and batch, instead of the
+# add/flush/commit/refresh round trips of create_news per article.
+
+def _bulk_news_insert():
+    # sort_by_parameter_order pairs each returned id with its input row
+    return insert(NewsModel).returning(NewsModel.id, sort_by_parameter_order=True)
+
+def _bulk_news_rows(batch: List[NewsCreate]) -> List[dict]:
+    return [
+        {
+            "headline": n.headline,
+            "content": n.content,
+            "categories": n.categories,
+            "url": n.url,
+            "created_by": n.created_by,
+            "language": n.language,
+            "location_id": n.location_id,
+            "embedding": n.embedding,
+        }
+        for n in batch
+    ]
+
+def _bulk_media_rows(ids, batch: List[NewsCreate]) -> List[dict]:
+    return [
+        {"news_id": news_id, "media_type": m.media_type, "url": m.url, "metadata_": m.metadata_}
+        for news_id, n in zip(ids, batch)
+        for m in n.media or ()
+    ]
+
+def _index_bulk(ids, batch: List[NewsCreate]):
+    for news_id, n in zip(ids, batch):
+        if n.embedding is not None:
+            _index_embedding(news_id, n.embedding)
+
+def _apply_update(db_news: NewsModel, news_data: NewsUpdate):
+    if news_data.headline is not None:
+        db_news.headline = news_data.headline
+    if news_data.content is not None:
+        db_news.content = news_data.content
+    if news_data.categories is not None:
+        db_news.categories = news_data.categories
+    if news_data.url is not None:
+        db_news.url = news_data.url
+    if news_data.language is not None:
+        db_news.language = news_data.language
+    if news_data.location_id is not None:
+        db_news.location_id = news_data.location_id
+    if news_data.embedding is not None:
+        db_news.embedding = news_data.embedding
+
 class NewsService:
+    # Re-read a written article with its relationships in two queries,
+    # instead of refresh() followed by a lazy load per relationship
+    def _reload(self, db: Session, news_id):
+        return db.query(NewsModel).options(*_news_load_options()).filter(
+            NewsModel.id == news_id
+        ).populate_existing().first()
+
     # 1. Create News
     def create_news(self, db: Session, news_data: NewsCreate):
         # 1. Create News Object
-        db_news = NewsModel(
-            headline=news_data.headline,
-            content=news_data.content,
-            categories=news_data.categories,
-            url=news_data.url,
-            created_by=news_data.created_by
-        )
+        db_news = _new_news(news_data)
         db.add(db_news)
         db.flush() # Flush to get ID for media
-        
+
         # 2. Add Media if provided
         if news_data.media:
             for m in news_data.media:
-                db_media = NewsMedia(
-                    news_id=db_news.id,
-                    media_type=m.media_type,
-                    url=m.url,
-                    metadata_=m.metadata_ # Pydantic alias handling might differ, keeping simple for now
-                )
-                db.add(db_media)
+                db.add(_new_media(db_news.id, m))
 
         db.commit()
-        db.refresh(db_news)
-        return db_news
+        if news_data.embedding is not None:
+            _index_embedding(db_news.id, news_data.embedding)
+        return self._reload(db, db_news.id)
+
+    # 1b. Bulk Create News (one transaction per batch; returns ids in input order)
+    def bulk_create_news(self, db: Session, batch: List[NewsCreate]):
+        try:
+            ids = db.execute(_bulk_news_insert(), _bulk_news_rows(batch)).scalars().all()
+            media_rows = _bulk_media_rows(ids, batch)
+            if media_rows:
+                db.execute(insert(NewsMedia), media_rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _index_bulk(ids, batch)
+        return ids
 
     # 2. Get All News (with Filters)
-    def get_all_news(self, db: Session, filter_params: NewsFilter, skip: int = 0, limit: int = 100):
-        query = db.query(NewsModel).filter(NewsModel.deleted_at.is_(None))
-        
-        if filter_params.categories:
-            # Check if ANY of the categories match (array overlap)
-            # Use param binding for safety with custom op, implies array parameters
-            query = query.filter(NewsModel.categories.op("&&")(filter_params.categories))
-            
-        if filter_params.start_date:
-            query = query.filter(NewsModel.created_at >= filter_params.start_date)
-            
-        if filter_params.end_date:
-            query = query.filter(NewsModel.created_at <= filter_params.end_date)
-            
-        if filter_params.search_query:
-            search = f"%{filter_params.search_query}%"
-            query = query.filter(
-                or_(
-                    NewsModel.headline.ilike(search),
-                    NewsModel.content.ilike(search)
-                )
-            )
-            
-        if filter_params.created_by:
-            query = query.filter(NewsModel.created_by == filter_params.created_by)
+    # Pass `cursor` for keyset pagination; `skip` is only used without one
+    def get_all_news(self, db: Session, filter_params: NewsFilter, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        query = _apply_filters(db.query(NewsModel).options(*_news_load_options()), filter_params)
+        return _apply_page(query, skip, limit, cursor, filter_params).all()
+
+    # 2b. Get All News as plain dicts (fast list path, two queries)
+    def list_news_rows(self, db: Session, filter_params: NewsFilter, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        rows = db.execute(_list_rows_query(filter_params, skip, limit, cursor)).all()
+        media_rows = db.execute(_media_query([r.id for r in rows])).all() if rows else []
+        return build_news_dicts(rows, media_rows)
 
-        return query.order_by(NewsModel.created_at.desc()).offset(skip).limit(limit).all()
+    # 2c. Local feed around a location as plain dicts; None if it does not exist
+    def list_local_news_rows(self, db: Session, location_id, skip: int = 0, limit: int = 100):
+        ancestors = location_service.ancestor_ids(db, location_id)
+        if ancestors is None:
+            return None
+        rows = db.execute(_local_rows_query(ancestors, skip, limit)).all()
+        media_rows = db.execute(_media_query([r.id for r in rows])).all() if rows else []
+        return build_news_dicts(rows, media_rows)
 
     # 3. Get News by ID
     def get_news_by_id(self, db: Session, news_id):
-        return db.query(NewsModel).filter(
+        return db.query(NewsModel).options(*_news_load_options()).filter(
             NewsModel.id == news_id,
             NewsModel.deleted_at.is_(None)
         ).first()
 
+    # 3b. Version metadata of an article for conditional GETs (no full load)
+    def get_news_validators(self, db: Session, news_id):
+        return db.execute(_validators_query(news_id)).first()
+
     # 4. Update News
     def update_news(self, db: Session, news_id, news_data: NewsUpdate):
         db_news = self.get_news_by_id(db, news_id)
         if not db_news:
             return None
-            
+
         # Update basics
-        if news_data.headline is not None:
-            db_news.headline = news_data.headline
-        if news_data.content is not None:
-            db_news.content = news_data.content
-        if news_data.categories is not None:
-            db_news.categories = news_data.categories
-        if news_data.url is not None:
-            db_news.url = news_data.url
-            
+        _apply_update(db_news, news_data)
+
         # Update Media (Full replacement approach for simplicity, or append?)
         # For simplicity, if media is provided, we replace.
         # Ideally we'd have add_media/remove_media endpoints.
@@ -96,30 +436,204 @@ class NewsService:
         if news_data.media is not None:
             # Delete existing media
             db.query(NewsMedia).filter(NewsMedia.news_id == news_id).delete()
+            # Media lives in its own table; mark the article itself as changed
+            db_news.updated_at = datetime.utcnow()
             # Add new
             for m in news_data.media:
-                db_media = NewsMedia(
-                    news_id=db_news.id,
-                    media_type=m.media_type,
-                    url=m.url,
-                    metadata_=m.metadata_ 
-                )
-                db.add(db_media)
+                db.add(_new_media(db_news.id, m))
 
         db.commit()
-        db.refresh(db_news)
-        return db_news
+        article_cache.invalidate(news_id)
+        if news_data.embedding is not None:
+            _index_embedding(news_id, news_data.embedding)
+        return self._reload(db, news_id)
 
     # 5. Soft Delete News
     def delete_news(self, db: Session, news_id, deleted_by_id=None):
         db_news = self.get_news_by_id(db, news_id)
         if not db_news:
             return False
-            
+
         # Use simple manual soft delete if mixin not fully compatible or to be explicit
         db_news.deleted_at = datetime.utcnow()
         if deleted_by_id:
             db_news.deleted_by = deleted_by_id
-            
+
         db.commit()
+        article_cache.invalidate(news_id)
+        _unindex(news_id)
         return True
+
+    # 6. Related News (nearest neighbours of the article's embedding)
+    # None if the article does not exist, [] if it has no embedding
+    def related_news(self, db: Session, news_id, limit: int = 10):
+        target = db.query(NewsModel.embedding).filter(
+            NewsModel.id == news_id,
+            NewsModel.deleted_at.is_(None)
+        ).first()
+        if target is None:
+            return None
+        if target.embedding is None:
+            return []
+        return self.semantic_search(db, target.embedding, limit, exclude_id=news_id)
+
+    # 7. Semantic Search (most similar articles to an embedding)
+    def semantic_search(self, db: Session, embedding: Sequence[float], limit: int = 10, exclude_id=None):
+        if PGVECTOR_ENABLED:
+            query = db.query(NewsModel).options(*_news_load_options())
+            return _rank_by_distance(query, embedding, limit, exclude_id).all()
+
+        embedding_index.ensure_built(_embedding_rows)
+        exclude = [exclude_id] if exclude_id is not None else []
+        ids = [news_id for news_id, _ in embedding_index.search(embedding, limit, exclude)]
+        if not ids:
+            return []
+        rows = db.query(NewsModel).options(*_news_load_options()).filter(
+            NewsModel.id.in_(ids),
+            NewsModel.deleted_at.is_(None)
+        ).all()
+        return _in_order(rows, ids)
+
+class AsyncNewsService:
+    """NewsService for AsyncSession. Relationships must be eager-loaded here,
+    an AsyncSession cannot lazy-load them while the response is serialized."""
+
+    async def _reload(self, db: AsyncSession, news_id):
+        stmt = (
+            select(NewsModel)
+            .options(*_news_load_options())
+            .where(NewsModel.id == news_id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.execute(stmt)).scalars().first()
+
+    # 1. Create News
+    async def create_news(self, db: AsyncSession, news_data: NewsCreate):
+        db_news = _new_news(news_data)
+        db.add(db_news)
+        await db.flush() # Flush to get ID for media
+
+        if news_data.media:
+            for m in news_data.media:
+                db.add(_new_media(db_news.id, m))
+
+        await db.commit()
+        if news_data.embedding is not None:
+            _index_embedding(db_news.id, news_data.embedding)
+        return await self._reload(db, db_news.id)
+
+    # 1b. Bulk Create News
+    async def bulk_create_news(self, db: AsyncSession, batch: List[NewsCreate]):
+        try:
+            ids = (await db.execute(_bulk_news_insert(), _bulk_news_rows(batch))).scalars().all()
+            media_rows = _bulk_media_rows(ids, batch)
+            if media_rows:
+                await db.execute(insert(NewsMedia), media_rows)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        _index_bulk(ids, batch)
+        return ids
+
+    # 2. Get All News (with Filters)
+    async def get_all_news(self, db: AsyncSession, filter_params: NewsFilter, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        stmt = _apply_filters(select(NewsModel), filter_params).options(*_news_load_options())
+        stmt = _apply_page(stmt, skip, limit, cursor, filter_params)
+        return (await db.execute(stmt)).scalars().all()
+
+    # 2b. Get All News as plain dicts
+    async def list_news_rows(self, db: AsyncSession, filter_params: NewsFilter, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        rows = (await db.execute(_list_rows_query(filter_params, skip, limit, cursor))).all()
+        media_rows = (await db.execute(_media_query([r.id for r in rows]))).all() if rows else []
+        return build_news_dicts(rows, media_rows)
+
+    # 2c. Local feed around a location
+    async def list_local_news_rows(self, db: AsyncSession, location_id, skip: int = 0, limit: int = 100):
+        ancestors = await location_service.ancestor_ids_async(db, location_id)
+        if ancestors is None:
+            return None
+        rows = (await db.execute(_local_rows_query(ancestors, skip, limit))).all()
+        media_rows = (await db.execute(_media_query([r.id for r in rows]))).all() if rows else []
+        return build_news_dicts(rows, media_rows)
+
+    # 3. Get News by ID
+    async def get_news_by_id(self, db: AsyncSession, news_id):
+        stmt = select(NewsModel).options(*_news_load_options()).where(
+            NewsModel.id == news_id,
+            NewsModel.deleted_at.is_(None)
+        )
+        return (await db.execute(stmt)).scalars().first()
+
+    # 3b. Version metadata of an article
+    async def get_news_validators(self, db: AsyncSession, news_id):
+        return (await db.execute(_validators_query(news_id))).first()
+
+    # 4. Update News
+    async def update_news(self, db: AsyncSession, news_id, news_data: NewsUpdate):
+        db_news = await self.get_news_by_id(db, news_id)
+        if not db_news:
+            return None
+
+        _apply_update(db_news, news_data)
+
+        # Same full-replacement semantics as the sync service
+        if news_data.media is not None:
+            await db.execute(delete(NewsMedia).where(NewsMedia.news_id == news_id))
+            db_news.updated_at = datetime.utcnow()
+            for m in news_data.media:
+                db.add(_new_media(db_news.id, m))
+
+        await db.commit()
+        await article_cache.invalidate_async(news_id)
+        if news_data.embedding is not None:
+            _index_embedding(news_id, news_data.embedding)
+        return await self._reload(db, news_id)
+
+    # 5. Soft Delete News
+    async def delete_news(self, db: AsyncSession, news_id, deleted_by_id=None):
+        db_news = await self.get_news_by_id(db, news_id)
+        if not db_news:
+            return False
+
+        db_news.deleted_at = datetime.utcnow()
+        if deleted_by_id:
+            db_news.deleted_by = deleted_by_id
+
+        await db.commit()
+        await article_cache.invalidate_async(news_id)
+        _unindex(news_id)
+        return True
+
+    # 6. Related News
+    async def related_news(self, db: AsyncSession, news_id, limit: int = 10):
+        target = (await db.execute(
+            select(NewsModel.embedding).where(
+                NewsModel.id == news_id,
+                NewsModel.deleted_at.is_(None)
+            )
+        )).first()
+        if target is None:
+            return None
+        if target.embedding is None:
+            return []
+        return await self.semantic_search(db, target.embedding, limit, exclude_id=news_id)
+
+    # 7. Semantic Search
+    async def semantic_search(self, db: AsyncSession, embedding: Sequence[float], limit: int = 10, exclude_id=None):
+        if PGVECTOR_ENABLED:
+            stmt = _rank_by_distance(select(NewsModel).options(*_news_load_options()), embedding, limit, exclude_id)
+            return (await db.execute(stmt)).scalars().all()
+
+        await _ensure_index_async()
+        # The matrix product is CPU-bound; keep it off the event loop
+        exclude = [exclude_id] if exclude_id is not None else []
+        hits = await run_in_threadpool(embedding_index.search, embedding, limit, exclude)
+        ids = [news_id for news_id, _ in hits]
+        if not ids:
+            return []
+        stmt = select(NewsModel).options(*_news_load_options()).where(
+            NewsModel.id.in_(ids),
+            NewsModel.deleted_at.is_(None)
+        )
+        return _in_order((await db.execute(stmt)).scalars().all(), ids)
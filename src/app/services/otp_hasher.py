@@ -0,0 +1,144 @@
+"""
+OTP hashing.
+
+OTPs are 6 digits and live for 5 minutes. A slow password KDF costs more
+CPU per request than it buys here: the 10^6 keyspace falls to offline
+brute force either way. What matters is that stored hashes are useless
+without the server secret. The default hasher is therefore a keyed
+HMAC-SHA256 with a per-OTP salt. The passlib KDF is kept for existing
+hashes (and as an option), and it runs in a small bounded executor so an
+OTP storm cannot take every core.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Protocol
+
+from passlib.context import CryptContext
+
+from ..config import settings
+
+
+class OTPHasher(Protocol):
+    # True if hashing costs enough CPU to belong off the request thread
+    expensive: bool
+
+    def hash(self, otp: str) -> str: ...
+
+    def verify(self, otp: str, otp_hash: str) -> bool: ...
+
+    def identify(self, otp_hash: str) -> bool: ...
+
+
+class HMACOTPHasher:
+    """``$hmac-sha256$<salt>$<hex digest>`` keyed by a server secret."""
+
+    prefix = "$hmac-sha256$"
+    expensive = False
+
+    def __init__(self, secret: bytes):
+        self._secret = secret
+
+    def _digest(self, salt: str, otp: str) -> str:
+        return hmac.new(self._secret, f"{salt}:{otp}".encode(), hashlib.sha256).hexdigest()
+
+    def hash(self, otp: str) -> str:
+        salt = secrets.token_hex(16)
+        return f"{self.prefix}{salt}${self._digest(salt, otp)}"
+
+    def verify(self, otp: str, otp_hash: str) -> bool:
+        if not self.identify(otp_hash):
+            return False
+        salt, _, digest = otp_hash[len(self.prefix):].partition("$")
+        return hmac.compare_digest(self._digest(salt, otp), digest)
+
+    def identify(self, otp_hash: str) -> bool:
+        return otp_hash.startswith(self.prefix)
+
+
+class PasslibOTPHasher:
+    """Slow KDF hashing through passlib (the original pbkdf2_sha256 scheme)."""
+
+    expensive = True
+
+    def __init__(self, context: CryptContext):
+        self._context = context
+
+    def hash(self, otp: str) -> str:
+        return self._context.hash(otp)
+
+    def verify(self, otp: str, otp_hash: str) -> bool:
+        return self._context.verify(otp, otp_hash)
+
+    def identify(self, otp_hash: str) -> bool:
+        return self._context.identify(otp_hash) is not None
+
+
+@lru_cache(maxsize=1)
+def _hashers() -> Dict[str, OTPHasher]:
+    secret = settings.get("OTP_HMAC_SECRET") or settings.secret_key
+    return {
+        "hmac": HMACOTPHasher(secret.encode()),
+        "pbkdf2": PasslibOTPHasher(CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")),
+    }
+
+
+def get_hasher() -> OTPHasher:
+    """Hasher for new OTPs, selected by the OTP_HASHER setting."""
+    return _hashers()[settings.get("OTP_HASHER", "hmac")]
+
+
+def _hasher_for(otp_hash: str) -> Optional[OTPHasher]:
+    # Verify with whichever scheme produced the hash, so OTPs issued before
+    # a switch of OTP_HASHER stay valid until they expire
+    for hasher in _hashers().values():
+        if hasher.identify(otp_hash):
+            return hasher
+    return None
+
+
+# Bounds how many cores the expensive hashers can occupy at once
+_executor = ThreadPoolExecutor(
+    max_workers=settings.get("OTP_HASH_WORKERS", 2),
+    thread_name_prefix="otp-hash",
+)
+
+
+def _run(hasher: OTPHasher, fn, *args):
+    if hasher.expensive:
+        return _executor.submit(fn, *args).result()
+    return fn(*args)
+
+
+async def _run_async(hasher: OTPHasher, fn, *args):
+    if hasher.expensive:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    return fn(*args)
+
+
+def hash_otp(otp: str) -> str:
+    hasher = get_hasher()
+    return _run(hasher, hasher.hash, otp)
+
+
+def verify_otp(otp: str, otp_hash: str) -> bool:
+    hasher = _hasher_for(otp_hash)
+    if hasher is None:
+        return False
+    return _run(hasher, hasher.verify, otp, otp_hash)
+
+
+async def hash_otp_async(otp: str) -> str:
+    hasher = get_hasher()
+    return await _run_async(hasher, hasher.hash, otp)
+
+
+async def verify_otp_async(otp: str, otp_hash: str) -> bool:
+    hasher = _hasher_for(otp_hash)
+    if hasher is None:
+        return False
+    return await _run_async(hasher, hasher.verify, otp, otp_hash)
@@ -0,0 +1,95 @@
+"""
+Cache of authenticated principals, so get_current_user does not need a
+``users`` lookup on every request.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The fields of a user that authorization and the read paths need."""
+
+    id: uuid.UUID
+    role: str
+    is_active: bool = True
+    deleted_at: Optional[datetime] = None
+    preferred_language: str = "en"
+    location_id: Optional[uuid.UUID] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            deleted_at=user.deleted_at,
+            preferred_language=user.preferred_language,
+            location_id=user.location_id,
+        )
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+
+_principals = TTLCache(
+    maxsize=settings.get("PRINCIPAL_CACHE_SIZE", 50000),
+    ttl=settings.get("PRINCIPAL_CACHE_TTL", 30),
+)
+
+
+def get(user_id: uuid.UUID) -> Optional[Principal]:
+    return _principals.get(user_id)
+
+
+def generation() -> int:
+    """Read before loading a user; pass to put() so stale loads are dropped."""
+    return _principals.generation
+
+
+def put(principal: Principal, generation: Optional[int] = None) -> None:
+    _principals.set(principal.id, principal, generation=generation)
+
+
+def invalidate(user_id: uuid.UUID) -> None:
+    _principals.delete(user_id)
+
+
+def clear() -> None:
+    _principals.clear()
+
+
+def stats() -> dict:
+    return _principals.stats()
+
+
+# Any committed change to a users row (PATCH /users, role assignment, soft
+# delete) evicts that user. Ids are collected at flush and evicted only after
+# the commit, so a concurrent request cannot re-cache the old row in between.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
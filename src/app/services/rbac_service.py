@@ -1,52 +1,157 @@
 import casbin
 import casbin_sqlalchemy_adapter
+from casbin.util.rwlock import RWLockWrite
 from casbin_sqlalchemy_adapter import CasbinRule
 from sqlalchemy.orm import Session
+from typing import Iterable, List, Tuple
+from ..cache import TTLCache
 from ..database import engine
 from ..config import settings
+from .rbac_watcher import PolicyWatcher, PostgresNotifier
 import os
 
 _enforcer = None
+_watcher = None
+
+# casbin.Enforcer is not thread-safe: sync routes enforce from the threadpool
+# while the policy watcher's listener thread applies deltas from other
+# workers. Decisions and reads take the read side; local mutations and the
+# watcher's apply and reload paths take the write side.
+_policy_lock = RWLockWrite()
+_read_lock = _policy_lock.gen_rlock()
+_write_lock = _policy_lock.gen_wlock()
+
+# Enforcement decisions keyed by (sub, obj, act). Cleared on every policy
+# mutation in this process and on every delta applied by the policy watcher;
+# the TTL bounds staleness for changes made elsewhere (direct DB edits).
+_decision_cache = TTLCache(
+    maxsize=settings.get("RBAC_CACHE_SIZE", 10000),
+    ttl=settings.get("RBAC_CACHE_TTL", 60),
+)
+
+class BatchAdapter(casbin_sqlalchemy_adapter.Adapter):
+    """Adapter whose batch writes share one transaction (upstream opens one per rule)."""
+
+    def add_policies(self, sec, ptype, rules):
+        with self._session_scope() as session:
+            for rule in rules:
+                self._save_policy_line(ptype, rule, session=session)
 
 def get_enforcer():
     global _enforcer
     if _enforcer is None:
         # Use the absolute path for the model file
         model_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rbac', 'rbac_model.conf')
-        
+
         # Initialize the adapter
-        adapter = casbin_sqlalchemy_adapter.Adapter(engine)
-        
-        # Initialize the enforcer
+        adapter = BatchAdapter(engine)
+
+        # Initialize the enforcer. auto_save (on by default) persists each
+        # mutation as a single-row adapter write, so we never call
+        # save_policy(), which rewrites the whole casbin_rule table.
         _enforcer = casbin.Enforcer(model_path, adapter)
-        
+
     return _enforcer
 
+def enforce(sub: str, obj: str, act: str) -> bool:
+    """Cached ``enforcer.enforce(sub, obj, act)``."""
+    key = (sub, obj, act)
+    allowed = _decision_cache.get(key)
+    if allowed is None:
+        generation = _decision_cache.generation
+        enforcer = get_enforcer()
+        with _read_lock:
+            allowed = bool(enforcer.enforce(sub, obj, act))
+        _decision_cache.set(key, allowed, generation=generation)
+    return allowed
+
+def invalidate_decision_cache():
+    """Drop all cached decisions. Call after any change to the policy."""
+    _decision_cache.clear()
+
+def get_decision_cache_stats() -> dict:
+    return _decision_cache.stats()
+
 def init_rbac():
     """Ensure RBAC policies are set up or default roles exist."""
     # Ensure table exists
     CasbinRule.metadata.create_all(engine)
-    
-    e = get_enforcer()
 
-    e.save_policy()
+    get_enforcer()
+    invalidate_decision_cache()
+
+    if settings.get("RBAC_POLICY_SYNC", False):
+        start_policy_sync()
+
+def start_policy_sync(notifier=None) -> PolicyWatcher:
+    """Apply policy changes made by other workers to this worker's enforcer.
+
+    Uses Postgres LISTEN/NOTIFY unless another notifier is given.
+    """
+    global _watcher
+    if _watcher is None:
+        notifier = notifier or PostgresNotifier(engine, channel=settings.get("RBAC_POLICY_SYNC_CHANNEL", "casbin_policy"))
+        _watcher = PolicyWatcher(notifier, on_change=invalidate_decision_cache, lock=_write_lock).attach(get_enforcer())
+    return _watcher
+
+def stop_policy_sync():
+    global _watcher
+    if _watcher is not None:
+        _watcher.close()
+        _watcher = None
 
 def add_policy_to_role(role: str, obj: str, action: str) -> bool:
     e = get_enforcer()
-    res = e.add_policy(role, obj, action)
-    e.save_policy()
+    with _write_lock:
+        res = e.add_policy(role, obj, action)
+    invalidate_decision_cache()
     return res
 
+def add_policies(policies: Iterable[Tuple[str, str, str]]) -> int:
+    """Add (role, obj, action) rules in one transaction; returns how many were new."""
+    e = get_enforcer()
+    with _write_lock:
+        # Casbin rejects the whole batch if any rule exists, so skip those first
+        new_rules = _unique([list(p) for p in policies if not e.has_policy(*p)])
+        if new_rules:
+            e.add_policies(new_rules)
+    if new_rules:
+        invalidate_decision_cache()
+    return len(new_rules)
+
 def add_role_to_user(user_id: str, role: str) -> bool:
     e = get_enforcer()
-    res = e.add_grouping_policy(user_id, role)
-    e.save_policy()
+    with _write_lock:
+        res = e.add_grouping_policy(user_id, role)
+    invalidate_decision_cache()
     return res
 
+def add_roles_to_users(assignments: Iterable[Tuple[str, str]]) -> int:
+    """Add (user_id, role) links in one transaction; returns how many were new."""
+    e = get_enforcer()
+    with _write_lock:
+        new_rules = _unique([list(a) for a in assignments if not e.has_grouping_policy(*a)])
+        if new_rules:
+            e.add_grouping_policies(new_rules)
+    if new_rules:
+        invalidate_decision_cache()
+    return len(new_rules)
+
+def _unique(rules: List[List[str]]) -> List[List[str]]:
+    seen = set()
+    unique = []
+    for rule in rules:
+        if tuple(rule) not in seen:
+            seen.add(tuple(rule))
+            unique.append(rule)
+    return unique
+
 def get_all_policies():
     e = get_enforcer()
-    return e.get_policy()
+    with _read_lock:
+        return e.get_policy()
 
 def get_all_grouping_policies():
     e = get_enforcer()
-    return e.get_grouping_policy()
+    with _read_lock:
+        return e.get_grouping_policy()
@@ -0,0 +1,267 @@
+"""
+Cross-worker Casbin policy synchronization.
+
+Every worker holds its own enforcer. When one worker changes the policy, its
+PolicyWatcher publishes the delta (the rules added or removed) through a
+notifier, and the watchers in the other workers apply that delta to their
+in-memory model. No worker needs a full load_policy() for these changes.
+
+Notifiers:
+    PostgresNotifier  LISTEN/NOTIFY on the application database
+    LocalNotifier     in-process stand-in, for tests and single-node setups
+"""
+
+import json
+import logging
+import select
+import threading
+import uuid
+from typing import Callable, List, Optional
+
+from casbin.model.policy_op import PolicyOp
+from casbin.persist.watcher_ex import WatcherEx
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more, so rule lists are
+# sent in chunks; a chunk that still does not fit degrades to a full reload.
+MAX_PAYLOAD_BYTES = 7900
+RULES_PER_MESSAGE = 50
+
+
+class LocalNotifier:
+    """In-process publish/subscribe bus standing in for LISTEN/NOTIFY."""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[str], None]] = []
+
+    def publish(self, payload: str) -> None:
+        for callback in list(self._subscribers):
+            callback(payload)
+
+    def subscribe(self, callback: Callable[[str], None], on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+
+class PostgresNotifier:
+    """
+    LISTEN/NOTIFY transport on ``engine``'s database.
+
+    A daemon thread holds one dedicated connection LISTENing on ``channel``.
+    NOTIFY is not durable: messages sent while that connection is down are
+    lost, so ``on_reconnect`` is called after reconnecting and the watcher
+    reloads the full policy then.
+    """
+
+    def __init__(self, engine, channel: str = "casbin_policy", poll_interval: float = 5.0):
+        self.engine = engine
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._callbacks: List[Callable[[str], None]] = []
+        self._on_reconnect: List[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, payload: str) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            conn.commit()
+
+    def subscribe(self, callback: Callable[[str], None], on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        self._callbacks.append(callback)
+        if on_reconnect:
+            self._on_reconnect.append(on_reconnect)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen_forever, name="casbin-policy-listener", daemon=True)
+            self._thread.start()
+
+    def unsubscribe(self, callback: Callable[[str], None]) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+        if not self._callbacks:
+            self._stop.set()
+
+    def _listen_forever(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                raw = self.engine.raw_connection()
+                # Keep this connection out of the pool; the listener owns it
+                raw.detach()
+                dbapi_conn = raw.dbapi_connection
+                dbapi_conn.autocommit = True
+                cursor = dbapi_conn.cursor()
+                cursor.execute(f'LISTEN "{self.channel}"')
+                if connected_before:
+                    for callback in self._on_reconnect:
+                        callback()
+                connected_before = True
+                try:
+                    self._drain(dbapi_conn)
+                finally:
+                    dbapi_conn.close()
+            except Exception:
+                logger.exception("Policy listener connection failed; retrying")
+                self._stop.wait(self.poll_interval)
+
+    def _drain(self, dbapi_conn) -> None:
+        while not self._stop.is_set():
+            if hasattr(dbapi_conn, "poll"):
+                # psycopg2
+                if select.select([dbapi_conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    self._dispatch(dbapi_conn.notifies.pop(0).payload)
+            else:
+                # psycopg 3
+                for notify in dbapi_conn.notifies(timeout=self.poll_interval):
+                    self._dispatch(notify.payload)
+
+    def _dispatch(self, payload: str) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Failed to apply policy notification")
+
+
+class PolicyWatcher(WatcherEx):
+    """
+    Casbin watcher that ships policy deltas between workers.
+
+    The WatcherEx hooks publish what this worker changed; ``_on_message``
+    applies what other workers changed, straight into the model and role
+    links. ``on_change`` runs after every applied message (used to clear the
+    decision cache). ``lock`` is held while a message or reload is applied;
+    pass the lock that readers of the enforcer take, so no decision is made
+    against a half-applied delta.
+    """
+
+    def __init__(self, notifier, on_change: Optional[Callable[[], None]] = None, lock=None):
+        self.notifier = notifier
+        self.on_change = on_change
+        self.origin = uuid.uuid4().hex
+        self.enforcer = None
+        self._callback = None
+        self._lock = lock or threading.Lock()
+
+    def attach(self, enforcer) -> "PolicyWatcher":
+        self.enforcer = enforcer
+        enforcer.set_watcher(self)
+        self.notifier.subscribe(self._on_message, on_reconnect=self._reload)
+        return self
+
+    # --- Publishing (called by the enforcer after a persisted change) ---
+
+    def set_update_callback(self, func: Callable) -> None:
+        self._callback = func
+
+    def update(self):
+        self._publish({"op": "reload"})
+
+    def update_for_add_policy(self, sec, ptype, *params):
+        self._publish_rules("add", sec, ptype, _as_rules(params))
+
+    def update_for_add_policies(self, sec, ptype, *rules):
+        self._publish_rules("add", sec, ptype, _as_rules(rules))
+
+    def update_for_remove_policy(self, sec, ptype, *params):
+        self._publish_rules("remove", sec, ptype, _as_rules(params))
+
+    def update_for_remove_policies(self, sec, ptype, *rules):
+        self._publish_rules("remove", sec, ptype, _as_rules(rules))
+
+    def update_for_remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        self._publish({
+            "op": "remove_filtered", "sec": sec, "ptype": ptype,
+            "field_index": field_index, "field_values": list(field_values),
+        })
+
+    def update_for_save_policy(self, model):
+        self.update()
+
+    def close(self):
+        self.notifier.unsubscribe(self._on_message)
+
+    def _publish_rules(self, op: str, sec: str, ptype: str, rules: List[List[str]]) -> None:
+        for i in range(0, len(rules), RULES_PER_MESSAGE):
+            self._publish({"op": op, "sec": sec, "ptype": ptype, "rules": rules[i:i + RULES_PER_MESSAGE]})
+
+    def _publish(self, message: dict) -> None:
+        message["origin"] = self.origin
+        payload = json.dumps(message)
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps({"op": "reload", "origin": self.origin})
+        try:
+            self.notifier.publish(payload)
+        except Exception:
+            # The change is already persisted; other workers converge at the
+            # latest on their next reload.
+            logger.exception("Failed to publish policy change")
+
+    # --- Applying changes from other workers ---
+
+    def _on_message(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message.get("origin") == self.origin or self.enforcer is None:
+            return
+
+        with self._lock:
+            op = message["op"]
+            if op == "add":
+                self._apply_add(message["sec"], message["ptype"], message["rules"])
+            elif op == "remove":
+                self._apply_remove(message["sec"], message["ptype"], message["rules"])
+            elif op == "remove_filtered":
+                self._apply_remove_filtered(
+                    message["sec"], message["ptype"], message["field_index"], message["field_values"]
+                )
+            else:
+                self.enforcer.load_policy()
+
+        if self._callback:
+            self._callback(message)
+        if self.on_change:
+            self.on_change()
+
+    def _reload(self) -> None:
+        with self._lock:
+            self.enforcer.load_policy()
+        if self.on_change:
+            self.on_change()
+
+    def _apply_add(self, sec, ptype, rules):
+        model = self.enforcer.model
+        added = [rule for rule in rules if model.add_policy(sec, ptype, rule)]
+        self._update_role_links(PolicyOp.Policy_add, sec, ptype, added)
+
+    def _apply_remove(self, sec, ptype, rules):
+        model = self.enforcer.model
+        removed = [rule for rule in rules if model.remove_policy(sec, ptype, rule)]
+        self._update_role_links(PolicyOp.Policy_remove, sec, ptype, removed)
+
+    def _apply_remove_filtered(self, sec, ptype, field_index, field_values):
+        removed = self.enforcer.model.remove_filtered_policy_returns_effects(sec, ptype, field_index, *field_values)
+        self._update_role_links(PolicyOp.Policy_remove, sec, ptype, removed)
+
+    def _update_role_links(self, op, sec, ptype, rules):
+        if sec == "g" and rules:
+            self.enforcer.model.build_incremental_role_links(self.enforcer.rm_map[ptype], op, sec, ptype, rules)
+
+
+def _as_rules(params) -> List[List[str]]:
+    """Normalize the watcher hook arguments to a list of rules.
+
+    Casbin passes either one rule (a list of strings) or a list of rules.
+    """
+    if len(params) == 1 and isinstance(params[0], (list, tuple)):
+        params = params[0]
+    if params and isinstance(params[0], (list, tuple)):
+        return [list(rule) for rule in params]
+    return [list(params)]
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# Helpers for pinning the number of SQL statements a code path issues, so an
+# N+1 relationship load shows up as a failing test instead of a slow page.
+
+@contextmanager
+def count_queries(engine):
+    """Collect every statement executed on ``engine`` inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@contextmanager
+def assert_max_queries(engine, limit: int):
+    """Fail if the block executes more than ``limit`` statements on ``engine``."""
+    with count_queries(engine) as statements:
+        yield statements
+    assert len(statements) <= limit, (
+        f"Expected at most {limit} queries, got {len(statements)}:\n" + "\n".join(statements)
+    )
@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+from src.app.cache import TTLCache
+from src.app.models.news import News, NewsMedia, NewsModeration
+from src.app.schemas import news as news_schemas
+from src.app.services.article_cache import ArticleCache, snapshot
+
+# Run this script with pytest
+# pytest src/tests/test_article_cache.py
+
+class FakeRedis:
+    """The subset of redis-py the cache uses, backed by a dict."""
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def get(self, key):
+        if self.down:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+def _article():
+    now = datetime(2026, 3, 1, 8, 15, 30)
+    news = News(id=uuid.uuid4(), headline="h", content="c", categories=["a"], url=None, created_by=uuid.uuid4(),
+                language="en", created_at=now, updated_at=None, deleted_at=None,
+                likes_count=5, comments_count=0, shares_count=0)
+    news.media = [NewsMedia(id=uuid.uuid4(), news_id=news.id, media_type="image", url="u", metadata_={"w": 1}, created_at=now)]
+    news.moderation = NewsModeration(id=uuid.uuid4(), news_id=news.id, status="approved", reason=None, acted_by=uuid.uuid4(), acted_at=now)
+    return news
+
+def test_shared_tier_fills_other_workers():
+    remote = FakeRedis()
+    worker_a = ArticleCache(TTLCache(maxsize=10), remote)
+    worker_b = ArticleCache(TTLCache(maxsize=10), remote)
+    news = _article()
+    entry = snapshot(news)
+
+    worker_a.put(news.id, entry)
+    assert worker_b.get(news.id) == entry
+    assert worker_b.get(news.id) == entry
+    stats = worker_b.stats()
+    assert stats["remote_hits"] == 1 and stats["local_hits"] == 1 and stats["hit_ratio"] == 1.0
+
+    worker_a.invalidate(news.id)
+    assert remote.data == {}
+
+def test_stale_load_is_not_cached_after_invalidation():
+    cache = ArticleCache(TTLCache(maxsize=10))
+    news = _article()
+    generation = cache.generation()
+    cache.invalidate(news.id)
+    cache.put(news.id, snapshot(news), generation)
+    assert cache.get(news.id) is None
+
+def test_backend_errors_fall_back_to_misses():
+    remote = FakeRedis()
+    remote.down = True
+    cache = ArticleCache(TTLCache(maxsize=1), remote)
+    assert cache.get(uuid.uuid4()) is None
+    cache.put(uuid.uuid4(), {"id": 1})
+    cache.put(uuid.uuid4(), {"id": 2})
+    stats = cache.stats()
+    assert stats["remote_errors"] == 1 and stats["evictions"] == 1 and stats["size"] == 1
+
+def test_entries_keep_stored_counts(monkeypatch):
+    news = _article()
+    monkeypatch.setattr(news_schemas, "pending_counts", lambda news_id: {"likes_count": 2})
+    entry = snapshot(news)
+    assert entry["likes_count"] == 5
+    assert news_schemas.News.model_validate(entry).likes_count == 7
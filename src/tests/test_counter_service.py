@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from src.app.database import engine
+from src.app.models.engagement import UserEngagement
+from src.app.models.news import News
+from src.app.models.user import User
+from src.app.schemas import news as news_schemas
+from src.app.services import counter_service
+from src.app.services.counter_service import ReconcileLeader, ShardedCounter, build_flush_statement
+
+# Run this script with pytest
+# pytest src/tests/test_counter_service.py
+
+def test_sharded_counter_accumulates_and_drains():
+    counter = ShardedCounter(shards=4)
+    a, b = uuid.uuid4(), uuid.uuid4()
+    counter.add(a, "likes_count")
+    counter.add(a, "likes_count")
+    counter.add(a, "likes_count", -1)
+    counter.add(b, "shares_count")
+    assert counter.pending(a) == {"likes_count": 1}
+
+    drained = counter.drain()
+    assert drained[b] == {"shares_count": 1}
+    assert counter.pending(a) is None
+
+    counter.restore(drained)
+    assert counter.pending(a) == {"likes_count": 1}
+
+def test_flush_is_one_update_from_values():
+    sql = str(build_flush_statement({uuid.uuid4(): {"likes_count": 3}, uuid.uuid4(): {"comments_count": 1}})
+              .compile(dialect=postgresql.dialect()))
+    assert sql.count("UPDATE news") == 1
+    assert "FROM (VALUES" in sql
+    assert "updated_at=news.updated_at" in sql
+
+def test_news_schema_merges_pending_counts(monkeypatch):
+    news_id = uuid.uuid4()
+    payload = dict(
+        id=news_id, headline="h", content="c", categories=["x"], url=None, created_by=uuid.uuid4(),
+        created_at=datetime.utcnow(), updated_at=None, deleted_at=None,
+        likes_count=10, comments_count=0, shares_count=2,
+    )
+    monkeypatch.setattr(news_schemas, "pending_counts", lambda i: {"likes_count": 5} if i == news_id else None)
+    news = news_schemas.News(**payload)
+    assert (news.likes_count, news.shares_count) == (15, 2)
+
+def test_reconcile_recounts_settled_stories_and_evicts_them(monkeypatch):
+    # Needs the app database; rolled back at the end
+    with engine.connect() as conn:
+        trans = conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        suffix = uuid.uuid4().hex[:10]
+        user = User(username=f"counter-{suffix}", mobile_e164=f"+{int(suffix, 16) % 10**12:012d}")
+        db.add(user)
+        db.flush()
+        liked = News(headline="liked", content="c", categories=["x"], created_by=user.id, likes_count=7)
+        orphaned = News(headline="orphaned", content="c", categories=["x"], created_by=user.id, likes_count=5, shares_count=2)
+        # The row of its latest like is in, its delta not flushed yet
+        busy = News(headline="busy", content="c", categories=["x"], created_by=user.id, likes_count=1)
+        db.add_all([liked, orphaned, busy])
+        db.flush()
+        hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.execute(insert(UserEngagement), [
+            {"user_id": user.id, "event_type": event, "entity_type": "news", "entity_id": liked.id, "created_at": hour_ago}
+            for event in ("like", "like", "unlike", "share")
+        ] + [
+            {"user_id": user.id, "event_type": "like", "entity_type": "news", "entity_id": busy.id, "created_at": created_at}
+            for created_at in (hour_ago, datetime.now(timezone.utc))
+        ])
+        ids = liked.id, orphaned.id, busy.id
+
+        evicted = []
+        monkeypatch.setattr(counter_service, "SessionLocal", lambda: db)
+        monkeypatch.setattr(counter_service.reconcile_leader, "acquire", lambda: True)
+        monkeypatch.setattr(counter_service.article_cache, "invalidate", lambda *ids: evicted.extend(ids))
+        assert counter_service.reconcile_counters(settle=60) == 2
+        assert set(evicted) == set(ids[:2])
+
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        liked, orphaned, busy = (db.get(News, news_id) for news_id in ids)
+        assert (liked.likes_count, liked.shares_count) == (1, 1)
+        assert (orphaned.likes_count, orphaned.shares_count) == (0, 0)
+        assert busy.likes_count == 1
+        db.close()
+        trans.rollback()
+
+def test_one_reconcile_leader_at_a_time():
+    # Needs the app database
+    first, second = ReconcileLeader(engine), ReconcileLeader(engine)
+    try:
+        assert first.acquire() and first.acquire()
+        assert not second.acquire()
+        first.release()
+        assert second.acquire()
+    finally:
+        first.release()
+        second.release()
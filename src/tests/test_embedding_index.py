@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+import uuid
+import numpy as np
+from src.app.services import news_service
+from src.app.services.embedding_index import EmbeddingIndex
+
+# Run this script with pytest
+# pytest src/tests/test_embedding_index.py
+
+def _unit(i, dim=8):
+    v = np.zeros(dim, dtype=np.float32)
+    v[i] = 1.0
+    return v
+
+def test_search_ranks_by_cosine_and_excludes():
+    index = EmbeddingIndex(dim=8)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index.build([(a, _unit(0)), (b, _unit(0) + _unit(1)), (c, _unit(2)), (uuid.uuid4(), None)])
+    assert len(index) == 3
+
+    hits = index.search(_unit(0), k=2)
+    assert [news_id for news_id, _ in hits] == [a, b]
+    assert hits[0][1] == 1.0
+    assert [news_id for news_id, _ in index.search(_unit(0), k=2, exclude=[a])] == [b, c]
+
+def test_incremental_upsert_and_remove():
+    index = EmbeddingIndex(dim=8)
+    # Writes before the lazy build are left to the build
+    index.upsert(uuid.uuid4(), _unit(3))
+    assert len(index) == 0
+
+    a, b = uuid.uuid4(), uuid.uuid4()
+    index.ensure_built(lambda: [(a, _unit(0))])
+    index.upsert(b, _unit(1))
+    assert index.search(_unit(1), k=1)[0][0] == b
+
+    index.upsert(b, _unit(2))
+    assert index.search(_unit(2), k=1)[0][0] == b
+
+    index.remove(a)
+    assert [news_id for news_id, _ in index.search(_unit(0), k=5)] == [b]
+
+class SlowLoader:
+    def __init__(self, rows, delay=0.05):
+        self.rows = rows
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.rows
+
+def test_first_build_is_single_flight():
+    index = EmbeddingIndex(dim=8)
+    load = SlowLoader([(uuid.uuid4(), _unit(0))])
+    threads = [threading.Thread(target=index.ensure_built, args=(load,)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert load.calls == 1 and len(index) == 1
+
+def test_stale_index_refreshes_in_background():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    index = EmbeddingIndex(dim=8, refresh_interval=0.01)
+    index.build([(a, _unit(0))])
+    time.sleep(0.02)
+
+    load = SlowLoader([(b, _unit(1))], delay=0.1)
+    for _ in range(5):
+        index.ensure_built(load)
+    # Callers are not held up; the current matrix keeps serving meanwhile
+    assert index.search(_unit(0), k=1)[0][0] == a
+    time.sleep(0.3)
+    assert load.calls == 1
+    assert index.search(_unit(1), k=1)[0][0] == b
+
+def test_async_first_build_is_single_flight(monkeypatch):
+    index = EmbeddingIndex(dim=8)
+    load = SlowLoader([(uuid.uuid4(), _unit(0))])
+    monkeypatch.setattr(news_service, "embedding_index", index)
+    monkeypatch.setattr(news_service, "_embedding_rows", load)
+    monkeypatch.setattr(news_service, "_index_build_lock", asyncio.Lock())
+
+    async def searches():
+        await asyncio.gather(*[news_service._ensure_index_async() for _ in range(5)])
+
+    asyncio.run(searches())
+    assert load.calls == 1 and len(index) == 1
@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.app.dependencies import get_current_user
+from src.app.routes import engagements as engagement_routes
+from src.app.services import rbac_service
+from src.app.services.engagement_service import BufferFull, EngagementBuffer
+from src.app.services.principal_cache import Principal
+
+# Run this script with pytest
+# pytest src/tests/test_engagement_buffer.py
+
+class FakeWriter:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, rows):
+        self.batches.append(list(rows))
+
+def _events(n):
+    return [{"event_type": "view", "n": i} for i in range(n)]
+
+def test_flushes_by_size_and_by_time():
+    async def scenario():
+        writer = FakeWriter()
+        buffer = EngagementBuffer(writer, max_size=100, batch_size=3, flush_interval=0.05)
+        buffer.start()
+        buffer.submit(_events(4))
+        await asyncio.sleep(0.02)
+        # Full batch written right away, the remainder waits for the interval
+        assert [len(b) for b in writer.batches] == [3]
+        await asyncio.sleep(0.1)
+        assert [len(b) for b in writer.batches] == [3, 1]
+        await buffer.stop()
+        return buffer.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["written"] == 4 and stats["flushes"] == 2
+    assert stats["ingest_lag_ms"]["max"] >= 50
+
+def test_rejects_when_full_and_drains_on_stop():
+    async def scenario():
+        writer = FakeWriter()
+        buffer = EngagementBuffer(writer, max_size=5, batch_size=100, flush_interval=60)
+        buffer.start()
+        buffer.submit(_events(4))
+        with pytest.raises(BufferFull):
+            buffer.submit(_events(2))
+        await buffer.stop()
+        with pytest.raises(BufferFull):
+            buffer.submit(_events(1))
+        return writer, buffer.stats()
+
+    writer, stats = asyncio.run(scenario())
+    assert [len(b) for b in writer.batches] == [4]
+    assert stats["rejected"] == 2 and stats["queued"] == 0
+
+class FlakyWriter(FakeWriter):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def __call__(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("server closed the connection")
+        super().__call__(rows)
+
+def test_failed_write_is_retried_then_dropped():
+    async def scenario(failures):
+        writer = FlakyWriter(failures)
+        buffer = EngagementBuffer(writer, max_size=10, batch_size=10, flush_interval=0.01, max_retries=2, retry_backoff=0)
+        buffer.start()
+        buffer.submit(_events(3))
+        await buffer.stop()
+        return writer, buffer.stats()
+
+    writer, stats = asyncio.run(scenario(failures=2))
+    assert [len(b) for b in writer.batches] == [3]
+    assert (stats["written"], stats["retries"], stats["dropped"]) == (3, 2, 0)
+
+    writer, stats = asyncio.run(scenario(failures=3))
+    assert writer.batches == []
+    assert (stats["written"], stats["retries"], stats["dropped"]) == (0, 2, 3)
+
+def test_stats_route_needs_the_metrics_permission(monkeypatch):
+    admin, reader = uuid.uuid4(), uuid.uuid4()
+    monkeypatch.setattr(rbac_service, "enforce", lambda sub, obj, act: (sub, obj, act) == (str(admin), "metrics", "read"))
+    app = FastAPI()
+    app.include_router(engagement_routes.router)
+    client = TestClient(app)
+
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=reader, role="user")
+    assert client.get("/engagements/stats").status_code == 403
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=admin, role="admin")
+    response = client.get("/engagements/stats")
+    assert response.status_code == 200 and "ingest_lag_ms" in response.json()
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from src.app.schemas.news import NewsFilter
+from src.app.services import export_service
+
+# Run this script with pytest
+# pytest src/tests/test_export_service.py
+
+def test_export_query_streams_plain_columns():
+    stmt = export_service.export_query(NewsFilter(categories=["sports"]))
+    assert stmt.get_execution_options()["yield_per"] == export_service.EXPORT_BATCH_SIZE
+    sql = str(stmt)
+    assert "embedding" not in sql and "news_media" not in sql
+
+def test_sync_stream_encodes_each_partition(monkeypatch):
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table("rows", metadata, Column("id", Integer, primary_key=True), Column("headline", String))
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"id": i, "headline": f"h{i}"} for i in range(5)])
+
+    monkeypatch.setattr(export_service, "ReadSessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(export_service, "EXPORT_FIELDS", ["id", "headline"])
+    monkeypatch.setattr(export_service, "export_query", lambda f: select(table).order_by(table.c.id).execution_options(yield_per=2))
+
+    chunks = list(export_service.stream_export(NewsFilter(), "ndjson"))
+    assert len(chunks) == 3
+    assert [json.loads(line)["id"] for line in "".join(chunks).splitlines()] == [0, 1, 2, 3, 4]
+
+    rows = list(csv.reader(io.StringIO("".join(export_service.stream_export(NewsFilter(), "csv")))))
+    assert rows[0] == ["id", "headline"] and rows[-1] == ["4", "h4"]
+
+def test_ndjson_encodes_uuids_and_datetimes():
+    class Row(tuple):
+        def _asdict(self):
+            return {"id": self[0], "created_at": self[1]}
+    news_id = uuid.uuid4()
+    line = export_service.encode_ndjson([Row((news_id, datetime(2026, 1, 1, tzinfo=timezone.utc)))])
+    assert json.loads(line) == {"id": str(news_id), "created_at": "2026-01-01T00:00:00+00:00"}
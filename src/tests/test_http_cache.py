@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from src.app import http_cache
+from src.app.models.news import News, NewsModeration
+
+# Run this script with pytest
+# pytest src/tests/test_http_cache.py
+
+NOW = datetime(2026, 3, 1, 8, 15, 30, 123456)
+
+def _article(**overrides):
+    values = dict(id=uuid.uuid4(), created_at=NOW, updated_at=None, likes_count=1, comments_count=0, shares_count=0)
+    values.update(overrides)
+    return News(**values)
+
+def test_metadata_row_and_full_article_share_validators():
+    news = _article()
+    news.moderation = NewsModeration(news_id=news.id, status="approved", acted_at=NOW + timedelta(minutes=5))
+    row = SimpleNamespace(id=news.id, created_at=NOW, updated_at=None, likes_count=1, comments_count=0,
+                          shares_count=0, moderation_acted_at=NOW + timedelta(minutes=5))
+    validators = http_cache.article_validators(news)
+    assert validators == http_cache.article_validators(row)
+    assert validators.last_modified == datetime(2026, 3, 1, 8, 20, 30, tzinfo=timezone.utc)
+    assert not validators.etag.startswith("W/")
+
+def test_etag_changes_with_updates_and_counters():
+    news = _article()
+    before = http_cache.article_validators(news).etag
+    news.likes_count = 2
+    assert http_cache.article_validators(news).etag != before
+
+def test_if_none_match_takes_precedence():
+    validators = http_cache.article_validators(_article())
+    stale = "Sun, 01 Jan 2006 00:00:00 GMT"
+    assert http_cache.is_not_modified({"if-none-match": f'"other", {validators.etag}'}, validators)
+    assert http_cache.is_not_modified({"if-none-match": "*"}, validators)
+    assert not http_cache.is_not_modified({"if-none-match": '"other"', "if-modified-since": "Sun, 01 Jan 2034 00:00:00 GMT"}, validators)
+    assert not http_cache.is_not_modified({"if-modified-since": stale}, validators)
+
+def test_if_modified_since_uses_second_precision():
+    validators = http_cache.Validators(etag='"x"', last_modified=datetime(2026, 3, 1, 8, 15, 30, tzinfo=timezone.utc))
+    assert http_cache.is_not_modified({"if-modified-since": validators.headers()["Last-Modified"]}, validators)
+    assert not http_cache.is_not_modified({"if-modified-since": "not a date"}, validators)
+
+def test_if_modified_since_is_ignored_for_articles():
+    news = _article()
+    since = http_cache.article_validators(news).headers()["Last-Modified"]
+    news.likes_count = 2
+    validators = http_cache.article_validators(news)
+    # Same Last-Modified, but the counters changed
+    assert validators.headers()["Last-Modified"] == since
+    assert not http_cache.is_not_modified({"if-modified-since": since}, validators)
+
+def test_list_etag_is_weak_and_matches_strong_form():
+    rows = [_article(), _article()]
+    validators = http_cache.list_validators(rows, "cursor")
+    assert validators.etag.startswith('W/"') and validators.last_modified is None
+    assert http_cache.is_not_modified({"if-none-match": validators.etag[2:]}, validators)
+    assert http_cache.list_validators(rows, None).etag != validators.etag
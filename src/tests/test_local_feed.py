@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from src.app.controllers.news_controller import NewsController
+from src.app.database import get_read_session
+from src.app.dependencies import get_read_principal
+from src.app.routes import news as news_routes
+from src.app.schemas import news as news_schemas
+from src.app.services import location_service
+from src.app.services.news_service import NEWS_LIST_COLUMNS, _local_rows_query, build_news_dicts
+from src.app.services.principal_cache import Principal
+
+# Run this script with pytest
+# pytest src/tests/test_local_feed.py
+
+class FakeSession:
+    def __init__(self, row):
+        self.row = row
+        self.calls = 0
+
+    def execute(self, stmt):
+        self.calls += 1
+        return SimpleNamespace(first=lambda: self.row)
+
+def test_local_query_is_one_overlap_test_ranked_by_depth():
+    state, district, mandal = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    compiled = _local_rows_query((state, district, mandal), 0, 20).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert sql.count("news.location_ancestors &&") == 1
+    assert "ORDER BY CASE WHEN (news.location_ancestors @>" in sql
+    assert "embedding" not in sql and "location_ancestors," not in sql.split("FROM")[0]
+    # Tier 0 is the reader's own mandal, then the district, then the state
+    containment = [v for k, v in compiled.params.items() if k.startswith("location_ancestors") and len(v) == 1]
+    assert containment == [[mandal], [district], [state]]
+
+def test_local_query_without_day_bound():
+    sql = str(_local_rows_query((uuid.uuid4(),), 0, 20, days=0).compile(dialect=postgresql.dialect()))
+    assert "news.created_at >=" not in sql
+
+def test_ancestor_ids_are_cached():
+    location_service.clear()
+    location_id, state = uuid.uuid4(), uuid.uuid4()
+    db = FakeSession(SimpleNamespace(ancestor_ids=[state, location_id]))
+    assert location_service.ancestor_ids(db, location_id) == (state, location_id)
+    assert location_service.ancestor_ids(db, location_id) == (state, location_id)
+    assert db.calls == 1
+
+def test_ancestor_ids_of_unknown_and_unfilled_locations():
+    location_service.clear()
+    location_id = uuid.uuid4()
+    assert location_service.ancestor_ids(FakeSession(None), location_id) is None
+    unfilled = FakeSession(SimpleNamespace(ancestor_ids=None))
+    assert location_service.ancestor_ids(unfilled, location_id) == (location_id,)
+    # The fallback is not cached
+    assert location_service.ancestor_ids(unfilled, location_id) == (location_id,)
+    assert unfilled.calls == 2
+
+def test_local_feed_needs_a_location():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(NewsController().local_news(None, None))
+    assert exc.value.status_code == 400
+
+def test_local_feed_counts_live_deltas_once(monkeypatch):
+    row = SimpleNamespace(**{c.key: None for c in NEWS_LIST_COLUMNS})
+    row.__dict__.update(
+        id=uuid.uuid4(), headline="h", content="c", categories=["local"], created_by=uuid.uuid4(),
+        language="en", created_at=datetime(2026, 3, 1, tzinfo=timezone.utc),
+        likes_count=3, comments_count=0, shares_count=0, moderation_id=None,
+    )
+    # COUNTER_LIVE_READS on: two likes not yet flushed
+    monkeypatch.setattr(news_schemas, "pending_counts", lambda news_id: {"likes_count": 2})
+
+    async def local_news(db, location_id, skip, limit):
+        return build_news_dicts([row], [])
+
+    monkeypatch.setattr(news_routes.controller, "local_news", local_news)
+    monkeypatch.setattr(news_routes, "FAST_LIST", False)
+    app = FastAPI()
+    app.include_router(news_routes.router)
+    app.dependency_overrides[get_read_session] = lambda: None
+    app.dependency_overrides[get_read_principal] = lambda: Principal(id=uuid.uuid4(), role="user", location_id=uuid.uuid4())
+    app.dependency_overrides[news_routes.read_news_permission] = lambda: None
+
+    response = TestClient(app).get("/news/local")
+    assert response.status_code == 200
+    assert response.json()[0]["likes_count"] == 5
@@ -0,0 +1,63 @@
+import json
+import logging
+import uuid
+from logging.handlers import RotatingFileHandler
+from src.app import logger as app_logger
+from src.app.logger import BoundedQueueHandler, JsonFormatter, RequestIdFilter, SampleFilter
+from src.app.request_context import RequestContext, current_request
+
+# Run this script with pytest
+# pytest src/tests/test_logger.py
+
+def _record(msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("src.app.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_carries_request_id_and_extras():
+    request_id = uuid.uuid4()
+    token = current_request.set(RequestContext(request_id=request_id))
+    try:
+        record = _record(route="/news/")
+        RequestIdFilter().filter(record)
+    finally:
+        current_request.reset(token)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["request_id"] == str(request_id)
+    assert entry["route"] == "/news/" and entry["level"] == "INFO"
+
+def test_drop_policy_counts_records_when_full():
+    handler = BoundedQueueHandler(maxsize=2, policy="drop")
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
+
+def test_sample_filter_rates():
+    assert not any(SampleFilter(0).filter(_record()) for _ in range(100))
+    assert all(SampleFilter(1).filter(_record()) for _ in range(100))
+
+def test_production_server_logs_to_stdout_only(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_logger.settings, "SERVER_MODE", "production", raising=False)
+    handlers = app_logger._output_handlers(logging.INFO)
+    assert len(handlers) == 1 and not isinstance(handlers[0], RotatingFileHandler)
+    assert not (tmp_path / "logs").exists()
+
+    monkeypatch.setattr(app_logger.settings, "LOG_FILES", True, raising=False)
+    handlers = app_logger._output_handlers(logging.INFO)
+    assert sum(isinstance(h, RotatingFileHandler) for h in handlers) == 2
+    for handler in handlers:
+        handler.close()
+
+def test_pool_checkouts_are_not_logged_at_debug():
+    from src.app.database import engine
+    package = logging.getLogger(app_logger.__package__)
+    level = package.level
+    package.setLevel(logging.DEBUG)
+    try:
+        assert engine.pool.logger.name.startswith(f"{app_logger.__package__}.database.")
+        assert not engine.pool.logger.isEnabledFor(logging.DEBUG)
+        assert logging.getLogger(f"{app_logger.__package__}.services").isEnabledFor(logging.DEBUG)
+    finally:
+        package.setLevel(level)
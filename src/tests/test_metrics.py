@@ -0,0 +1,35 @@
+import threading
+from sqlalchemy import create_engine, text
+from src.app import database, metrics
+
+# Run this script with pytest
+# pytest src/tests/test_metrics.py
+
+def test_histogram_merges_thread_shards():
+    histogram = metrics.Histogram("test_merge_seconds", "test", ["route"], buckets=(0.1, 1.0))
+    threads = [threading.Thread(target=lambda: [histogram.observe(0.5, ("/a",)) for _ in range(100)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    histogram.observe(5.0, ("/a",))
+    lines = list(histogram.render())
+    assert 'test_merge_seconds_bucket{route="/a",le="0.1"} 0' in lines
+    assert 'test_merge_seconds_bucket{route="/a",le="1.0"} 400' in lines
+    assert 'test_merge_seconds_bucket{route="/a",le="+Inf"} 401' in lines
+    assert 'test_merge_seconds_count{route="/a"} 401' in lines
+
+def test_engine_hooks_record_queries_and_pool(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/m.db", poolclass=database.TimedQueuePool, pool_logging_name="test_engine")
+    database.instrument_engine(engine, "test_engine")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+    engine.dispose()
+
+    output = metrics.render()
+    assert 'db_query_duration_seconds_count{engine="test_engine",statement="select"} 1' in output
+    assert 'db_query_duration_seconds_count{engine="test_engine",statement="other"} 1' in output
+    assert 'db_pool_checkout_wait_seconds_count{engine="test_engine"} 1' in output
+    assert 'db_connection_lifetime_seconds_count{engine="test_engine"} 1' in output
+    assert 'db_pool_checked_out{engine="test_engine"} 0' in output
@@ -0,0 +1,33 @@
+from sqlalchemy import create_engine, text
+from src.app import migrations
+
+# Run this script with pytest
+# pytest src/tests/test_migrations.py
+
+def _engine(tmp_path, version=None):
+    engine = create_engine(f"sqlite:///{tmp_path}/schema.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        if version:
+            conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": version})
+    return engine
+
+def test_current_schema_skips_upgrade(tmp_path, monkeypatch):
+    head, = migrations.script_heads(migrations.alembic_config())
+    calls = []
+    monkeypatch.setattr(migrations.command, "upgrade", lambda *args: calls.append(args))
+
+    timings = migrations.ensure_schema(_engine(tmp_path, head), before_upgrade=lambda: calls.append("init"))
+    assert calls == [] and "upgrade_ms" not in timings and "schema_check_ms" in timings
+
+def test_outdated_schema_upgrades_on_the_shared_connection(tmp_path, monkeypatch):
+    seen = {}
+
+    def upgrade(config, revision):
+        seen.update(config.attributes, revision=revision)
+    monkeypatch.setattr(migrations.command, "upgrade", upgrade)
+
+    timings = migrations.ensure_schema(_engine(tmp_path, "d8fca14cd7d8"), before_upgrade=lambda: seen.setdefault("init", True))
+    assert seen["revision"] == "head" and seen["init"]
+    assert seen["connection"] is not None and seen["configure_logger"] is False
+    assert "upgrade_ms" in timings
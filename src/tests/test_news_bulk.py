@@ -0,0 +1,54 @@
+import asyncio
+import json
+import uuid
+from src.app.controllers import news_controller
+from src.app.controllers.news_controller import NewsController, ndjson_lines
+
+# Run this script with pytest
+# pytest src/tests/test_news_bulk.py
+
+def _stream(*chunks):
+    async def gen():
+        for chunk in chunks:
+            yield chunk
+    return gen()
+
+def _article(headline):
+    return json.dumps({"headline": headline, "content": "c", "categories": ["x"], "created_by": str(uuid.uuid4())}).encode()
+
+def test_ndjson_lines_split_across_chunks():
+    async def collect():
+        return [item async for item in ndjson_lines(_stream(b'{"a":', b'1}\n\n{"b"', b":2}"))]
+    assert asyncio.run(collect()) == [(1, b'{"a":1}'), (3, b'{"b":2}')]
+
+def test_bulk_create_batches_and_reports_per_row(monkeypatch):
+    monkeypatch.setattr(news_controller, "BULK_BATCH_SIZE", 2)
+    batches = []
+
+    async def fake_news(method, db, batch):
+        assert method == "bulk_create_news"
+        batches.append([n.headline for n in batch])
+        if any(n.headline == "bad" for n in batch):
+            raise ValueError("violates foreign key")
+        return [uuid.uuid4() for _ in batch]
+
+    controller = NewsController()
+    monkeypatch.setattr(controller, "_news", fake_news)
+    body = b"\n".join([_article("a"), b"{not json", _article("bad"), _article("b")])
+    result = asyncio.run(controller.bulk_create_news(None, _stream(body)))
+
+    assert [r["status"] for r in result["results"]] == ["created", "error", "error", "created"]
+    assert (result["created"], result["failed"]) == (2, 2)
+    # The failed batch was retried row by row
+    assert batches == [["a", "bad"], ["a"], ["bad"], ["b"]]
+
+def test_bulk_single_row_batch_failure_is_reported(monkeypatch):
+    async def fake_news(method, db, batch):
+        raise RuntimeError("violates foreign key")
+
+    controller = NewsController()
+    monkeypatch.setattr(controller, "_news", fake_news)
+    result = asyncio.run(controller.bulk_create_news(None, _stream(_article("bad"))))
+
+    assert result["results"] == [{"line": 1, "status": "error", "errors": "violates foreign key"}]
+    assert (result["created"], result["failed"]) == (0, 1)
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.dialects import postgresql
+from src.app.models.news import News, NewsMedia, NewsModeration
+from src.app.schemas.news import News as NewsSchema, NewsFilter
+from src.app.services.news_service import (
+    NEWS_LIST_COLUMNS, build_news_dicts, encode_cursor, _list_rows_query
+)
+
+# Run this script with pytest
+# pytest src/tests/test_news_fast_list.py
+
+def _article():
+    now = datetime(2026, 3, 1, 8, 15, 30, 123456, tzinfo=timezone.utc)
+    news = News(
+        id=uuid.uuid4(), headline="h", content="c", categories=["a", "b"], url=None,
+        created_by=uuid.uuid4(), language="en", location_id=uuid.uuid4(), created_at=now, updated_at=None, deleted_at=None,
+        likes_count=3, comments_count=0, shares_count=1,
+    )
+    news.media = [NewsMedia(id=uuid.uuid4(), news_id=news.id, media_type="image", url="u", metadata_={"w": 1}, created_at=now)]
+    news.moderation = NewsModeration(id=uuid.uuid4(), news_id=news.id, status="approved", reason=None, acted_by=uuid.uuid4(), acted_at=now)
+    return news
+
+def _as_rows(news):
+    row = SimpleNamespace(**{c.key: getattr(news, c.key) for c in NEWS_LIST_COLUMNS})
+    for key in ("id", "status", "reason", "acted_by", "acted_at"):
+        setattr(row, f"moderation_{key}", getattr(news.moderation, key))
+    media = [SimpleNamespace(**{k: getattr(m, k) for k in ("id", "news_id", "media_type", "url", "metadata_", "created_at")}) for m in news.media]
+    return [row], media
+
+def test_fast_path_matches_schema_serialization():
+    news = _article()
+    expected = TypeAdapter(List[NewsSchema]).dump_json([news])
+    fast = orjson.dumps(build_news_dicts(*_as_rows(news)), option=orjson.OPT_UTC_Z)
+    assert orjson.loads(fast) == orjson.loads(expected)
+
+def test_fast_path_query_selects_columns_and_joins_moderation():
+    sql = str(_list_rows_query(NewsFilter(), 0, 100).compile(dialect=postgresql.dialect()))
+    assert "LEFT OUTER JOIN news_moderation" in sql
+    assert "embedding" not in sql and "search_vector" not in sql
+
+def test_cursor_from_fast_path_row():
+    news = _article()
+    assert encode_cursor(build_news_dicts(*_as_rows(news))[0]) == encode_cursor(news)
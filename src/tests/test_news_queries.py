@@ -0,0 +1,66 @@
+import uuid
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from src.app.database import engine
+from src.app.models.news import News, NewsMedia, NewsModeration
+from src.app.models.user import User
+from src.app.schemas.news import News as NewsSchema, NewsFilter
+from src.app.services.news_service import NewsService
+from .query_counter import assert_max_queries, count_queries
+
+# Run this script with pytest
+# pytest src/tests/test_news_queries.py
+
+def test_count_queries_collects_statements():
+    sqlite = create_engine("sqlite://")
+    with count_queries(sqlite) as statements:
+        with sqlite.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    assert len(statements) == 2
+
+def test_assert_max_queries_fails_over_limit():
+    sqlite = create_engine("sqlite://")
+    with pytest.raises(AssertionError):
+        with assert_max_queries(sqlite, 1):
+            with sqlite.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+@pytest.fixture
+def db():
+    # Needs the app database; everything written here is rolled back
+    with engine.connect() as conn:
+        trans = conn.begin()
+        with Session(bind=conn, join_transaction_mode="create_savepoint") as session:
+            yield session
+        trans.rollback()
+
+def _seed_page(db, count: int):
+    suffix = uuid.uuid4().hex[:10]
+    user = User(username=f"reader-{suffix}", mobile_e164=f"+{int(suffix, 16) % 10**12:012d}")
+    db.add(user)
+    db.flush()
+    for i in range(count):
+        news = News(headline=f"h{i}", content="c", categories=["local"], created_by=user.id)
+        news.media = [NewsMedia(media_type="image", url=f"u{i}")]
+        news.moderation = NewsModeration(status="approved", acted_by=user.id)
+        db.add(news)
+    db.flush()
+    db.expire_all()
+
+def test_list_news_page_is_not_n_plus_one(db):
+    # One query for news + joined moderation, one selectin query for media,
+    # however many articles are on the page.
+    _seed_page(db, 20)
+    with assert_max_queries(engine, 2):
+        rows = NewsService().get_all_news(db, NewsFilter(categories=["local"]), limit=100)
+        items = [NewsSchema.model_validate(row) for row in rows]
+    assert len(items) >= 20 and all(item.media and item.moderation for item in items[:20])
+
+def test_fast_list_page_is_two_queries(db):
+    _seed_page(db, 20)
+    with assert_max_queries(engine, 2):
+        rows = NewsService().list_news_rows(db, NewsFilter(categories=["local"]), limit=100)
+    assert len(rows) >= 20 and all(row["media"] for row in rows[:20])
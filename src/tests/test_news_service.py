@@ -0,0 +1,63 @@
+import uuid
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
+from src.app.models.news import News
+from src.app.schemas.news import NewsFilter
+from src.app.services.news_service import (
+    encode_cursor, decode_cursor, SEARCH_CONFIGS, _apply_filters, _apply_page
+)
+
+# Run this script with pytest
+# pytest src/tests/test_news_service.py
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+def test_cursor_round_trip():
+    news = News(id=uuid.uuid4(), created_at=datetime(2026, 1, 4, 10, 30, tzinfo=timezone.utc))
+    cursor = encode_cursor(news)
+
+    assert decode_cursor(cursor) == (news.created_at, news.id)
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_cursor_page_uses_keyset_instead_of_offset():
+    news = News(id=uuid.uuid4(), created_at=datetime(2026, 1, 4, tzinfo=timezone.utc))
+
+    sql = _compile(_apply_page(select(News.id), 0, 20, encode_cursor(news)))
+    assert "(news.created_at, news.id) <" in sql
+    assert "OFFSET" not in sql
+
+    sql = _compile(_apply_page(select(News.id), 40, 20))
+    assert "OFFSET" in sql
+    assert "ORDER BY news.created_at DESC, news.id DESC" in sql
+
+def test_offset_page_on_legacy_query():
+    # NewsService.get_all_news pages a Query, which is stricter than select()
+    query = _apply_page(Session().query(News), 40, 20)
+    sql = _compile(query.statement)
+    assert "ORDER BY news.created_at DESC, news.id DESC" in sql
+    assert "OFFSET" in sql
+
+def test_search_uses_full_text_index_and_rank():
+    filters = NewsFilter(search_query="flood relief")
+
+    sql = _compile(_apply_page(_apply_filters(select(News.id), filters), 0, 20, filter_params=filters))
+    assert "news.search_vector @@ ((" in sql
+    assert "ORDER BY ts_rank(news.search_vector, websearch_to_tsquery(news_search_config(news.language)" in sql
+    assert "ILIKE" not in sql
+
+def test_search_matches_each_document_language():
+    filters = NewsFilter(search_query="flood relief")
+    compiled = _apply_filters(select(News.id), filters).compile(dialect=postgresql.dialect())
+    # One query per config any row can be indexed with, ORed for the index...
+    configs = [v for k, v in compiled.params.items() if k.startswith("param")]
+    assert configs == list(SEARCH_CONFIGS) and "simple" in configs
+    assert str(compiled).count(" || websearch_to_tsquery") == len(SEARCH_CONFIGS) - 1
+    # ...and the row's own config for the exact match
+    assert "news.search_vector @@ websearch_to_tsquery(news_search_config(news.language)" in str(compiled)
@@ -0,0 +1,30 @@
+import asyncio
+from passlib.context import CryptContext
+from src.app.services import otp_hasher
+from src.app.services.otp_hasher import HMACOTPHasher, PasslibOTPHasher
+
+# Run this script with pytest
+# pytest src/tests/test_otp_hasher.py
+
+def test_hmac_hash_round_trip_and_salting():
+    hasher = HMACOTPHasher(b"server-secret")
+    first, second = hasher.hash("123456"), hasher.hash("123456")
+    assert first != second
+    assert hasher.verify("123456", first)
+    assert not hasher.verify("654321", first)
+    # A different server secret cannot verify the stored hash
+    assert not HMACOTPHasher(b"other-secret").verify("123456", first)
+
+def test_verify_dispatches_on_stored_scheme(monkeypatch):
+    hashers = {
+        "hmac": HMACOTPHasher(b"server-secret"),
+        "pbkdf2": PasslibOTPHasher(CryptContext(schemes=["pbkdf2_sha256"])),
+    }
+    monkeypatch.setattr(otp_hasher, "_hashers", lambda: hashers)
+    hmac_hash = hashers["hmac"].hash("111111")
+    pbkdf2_hash = hashers["pbkdf2"].hash("222222")
+    assert otp_hasher.verify_otp("111111", hmac_hash)
+    # Hashes issued before switching to HMAC still verify
+    assert otp_hasher.verify_otp("222222", pbkdf2_hash)
+    assert asyncio.run(otp_hasher.verify_otp_async("222222", pbkdf2_hash))
+    assert not otp_hasher.verify_otp("222222", "plain-text")
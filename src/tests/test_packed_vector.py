@@ -0,0 +1,34 @@
+import numpy as np
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from src.app.models.news import News
+from src.app.models.types import PackedVector
+
+# Run this script with pytest
+# pytest src/tests/test_packed_vector.py
+
+def test_packed_vector_round_trip_and_mixed_dtypes():
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    vectors = Table(
+        "vectors", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("v32", PackedVector(4, "float32")),
+        Column("v16", PackedVector(4, "float16")),
+    )
+    metadata.create_all(engine)
+    value = [0.5, -1.25, 2.0, 0.0]
+    with engine.begin() as conn:
+        conn.execute(insert(vectors), {"id": 1, "v32": value, "v16": value})
+        row = conn.execute(select(vectors)).one()
+
+    assert row.v32.dtype == np.dtype(">f4") and row.v16.dtype == np.dtype(">f2")
+    np.testing.assert_array_equal(row.v32, value)
+    np.testing.assert_array_equal(row.v16, value)
+    # Zero-copy view over the fetched bytes
+    assert not row.v32.flags.writeable
+
+    # A float32 column still decodes rows written as float16, and vice versa
+    assert PackedVector(4, "float32").process_result_value(np.float16(value).astype(">f2").tobytes(), None).dtype == np.dtype(">f2")
+
+def test_embedding_is_not_loaded_with_news_rows():
+    assert "embedding" not in str(select(News))
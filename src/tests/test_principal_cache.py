@@ -0,0 +1,49 @@
+import uuid
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.app.models.user import User
+from src.app.services import principal_cache
+from src.app.services.principal_cache import Principal
+
+# Run this script with pytest
+# pytest src/tests/test_principal_cache.py
+
+def _users_db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    return engine
+
+def _add_user(db: Session) -> User:
+    user = User(id=uuid.uuid4(), username="reader", mobile_e164="+919999900000", role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    return user
+
+def test_committed_user_change_evicts_principal():
+    with Session(_users_db()) as db:
+        user = _add_user(db)
+        principal_cache.put(Principal.from_user(user))
+        assert principal_cache.get(user.id).role == "user"
+
+        user.role = "admin"
+        db.flush()
+        # Not evicted until the change is committed
+        assert principal_cache.get(user.id) is not None
+        db.commit()
+        assert principal_cache.get(user.id) is None
+
+def test_soft_delete_evicts_principal():
+    with Session(_users_db()) as db:
+        user = _add_user(db)
+        principal_cache.put(Principal.from_user(user))
+
+        user.soft_delete()
+        db.commit()
+        assert principal_cache.get(user.id) is None
+
+def test_load_racing_an_eviction_is_not_cached():
+    user_id = uuid.uuid4()
+    generation = principal_cache.generation()
+    principal_cache.invalidate(user_id)
+    principal_cache.put(Principal(id=user_id, role="user"), generation)
+    assert principal_cache.get(user_id) is None
@@ -0,0 +1,77 @@
+import time
+from src.app.cache import TTLCache
+from src.app.services import rbac_service
+
+# Run this script with pytest
+# pytest src/tests/test_rbac_cache.py
+
+class CountingEnforcer:
+    def __init__(self, allowed):
+        self.allowed = allowed
+        self.calls = 0
+
+    def enforce(self, sub, obj, act):
+        self.calls += 1
+        return (sub, obj, act) in self.allowed
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_ttl_cache_drops_writes_from_before_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None
+
+def test_ttl_cache_delete_only_drops_writes_for_its_key():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.delete("a")
+    cache.set("a", 1, generation=generation)
+    cache.set("b", 2, generation=generation)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    # Loads started after the delete are cached
+    cache.set("a", 3, generation=cache.generation)
+    assert cache.get("a") == 3
+
+def test_enforce_caches_decisions_until_policy_changes(monkeypatch):
+    enforcer = CountingEnforcer({("u1", "news", "read")})
+    monkeypatch.setattr(rbac_service, "_enforcer", enforcer)
+    rbac_service.invalidate_decision_cache()
+
+    assert rbac_service.enforce("u1", "news", "read") is True
+    assert rbac_service.enforce("u1", "news", "read") is True
+    assert rbac_service.enforce("u1", "news", "delete") is False
+    assert rbac_service.enforce("u1", "news", "delete") is False
+    assert enforcer.calls == 2
+
+    rbac_service.invalidate_decision_cache()
+    rbac_service.enforce("u1", "news", "read")
+    assert enforcer.calls == 3
+
+def test_policy_mutation_invalidates_cache(monkeypatch):
+    enforcer = CountingEnforcer(set())
+    enforcer.add_policy = lambda *rule: enforcer.allowed.add(rule) or True
+    enforcer.save_policy = lambda: None
+    monkeypatch.setattr(rbac_service, "_enforcer", enforcer)
+    rbac_service.invalidate_decision_cache()
+
+    assert rbac_service.enforce("editor", "news", "update") is False
+    rbac_service.add_policy_to_role("editor", "news", "update")
+    assert rbac_service.enforce("editor", "news", "update") is True
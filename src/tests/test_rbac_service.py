@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+import casbin
+from casbin_sqlalchemy_adapter import CasbinRule
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from src.app.services import rbac_service
+from src.app.services.rbac_watcher import LocalNotifier, PolicyWatcher
+
+# Run this script with pytest
+# pytest src/tests/test_rbac_service.py
+
+MODEL_PATH = os.path.join(os.path.dirname(rbac_service.__file__), "..", "rbac", "rbac_model.conf")
+
+def _sqlite_enforcer():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CasbinRule.metadata.create_all(engine)
+    return engine, casbin.Enforcer(MODEL_PATH, rbac_service.BatchAdapter(engine))
+
+def _rule_count(engine) -> int:
+    with Session(engine) as db:
+        return db.scalar(select(func.count()).select_from(CasbinRule))
+
+def test_role_assignment_is_written_incrementally(monkeypatch):
+    engine, enforcer = _sqlite_enforcer()
+    monkeypatch.setattr(rbac_service, "_enforcer", enforcer)
+
+    def fail_save_policy():
+        raise AssertionError("save_policy rewrites the whole casbin_rule table")
+
+    monkeypatch.setattr(enforcer, "save_policy", fail_save_policy)
+
+    assert rbac_service.add_role_to_user("u1", "user")
+    assert rbac_service.add_policy_to_role("user", "news", "read")
+    assert _rule_count(engine) == 2
+
+def test_batch_apis_skip_existing_rules(monkeypatch):
+    engine, enforcer = _sqlite_enforcer()
+    monkeypatch.setattr(rbac_service, "_enforcer", enforcer)
+    rbac_service.add_role_to_user("u1", "user")
+
+    added = rbac_service.add_roles_to_users([("u1", "user"), ("u2", "user"), ("u2", "user"), ("u3", "editor")])
+    assert added == 2
+    assert rbac_service.add_policies([("editor", "news", "update"), ("editor", "news", "create")]) == 2
+    assert _rule_count(engine) == 5
+    assert enforcer.enforce("u3", "news", "update")
+
+def test_policy_deltas_reach_other_workers():
+    # Two "workers" sharing one database, connected by the local notifier
+    engine, worker_a = _sqlite_enforcer()
+    worker_b = casbin.Enforcer(MODEL_PATH, rbac_service.BatchAdapter(engine))
+    notifier = LocalNotifier()
+    changes = []
+    PolicyWatcher(notifier).attach(worker_a)
+    PolicyWatcher(notifier, on_change=lambda: changes.append(1)).attach(worker_b)
+
+    # Stop B from silently reloading from the database
+    reloads = []
+    worker_b.load_policy = lambda: reloads.append(1)
+
+    worker_a.add_policy("user", "news", "read")
+    worker_a.add_grouping_policies([["u1", "user"], ["u2", "user"]])
+    assert worker_b.enforce("u1", "news", "read")
+    assert worker_b.enforce("u2", "news", "read")
+
+    worker_a.remove_grouping_policy("u2", "user")
+    assert not worker_b.enforce("u2", "news", "read")
+
+    worker_a.remove_filtered_policy(0, "user")
+    assert not worker_b.enforce("u1", "news", "read")
+
+    assert reloads == []
+    assert len(changes) == 4
+
+def test_enforce_never_sees_a_half_applied_delta(monkeypatch):
+    engine, enforcer = _sqlite_enforcer()
+    monkeypatch.setattr(rbac_service, "_enforcer", enforcer)
+    rbac_service.invalidate_decision_cache()
+    notifier = LocalNotifier()
+    watcher = PolicyWatcher(notifier, on_change=rbac_service.invalidate_decision_cache, lock=rbac_service._write_lock)
+    watcher.attach(enforcer)
+
+    applying = threading.Event()
+    overlaps = []
+    apply_add = watcher._apply_add
+
+    def slow_apply_add(sec, ptype, rules):
+        applying.set()
+        time.sleep(0.001)
+        apply_add(sec, ptype, rules)
+        applying.clear()
+
+    monkeypatch.setattr(watcher, "_apply_add", slow_apply_add)
+    enforce = enforcer.enforce
+
+    def checked_enforce(*rvals):
+        if applying.is_set():
+            overlaps.append(rvals)
+        return enforce(*rvals)
+
+    monkeypatch.setattr(enforcer, "enforce", checked_enforce)
+    done = threading.Event()
+
+    def readers():
+        while not done.is_set():
+            rbac_service.enforce("u1", "news", "read")
+            rbac_service.invalidate_decision_cache()
+
+    threads = [threading.Thread(target=readers) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    # Deltas from another worker, delivered on the listener thread
+    for i in range(50):
+        notifier.publish(json.dumps({"op": "add", "sec": "g", "ptype": "g", "rules": [[f"u{i}", "user"]], "origin": "other"}))
+    notifier.publish(json.dumps({"op": "add", "sec": "p", "ptype": "p", "rules": [["user", "news", "read"]], "origin": "other"}))
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert rbac_service.enforce("u1", "news", "read")
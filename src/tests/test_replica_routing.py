@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from src.app.replicas import Replica, ReplicaSet, RoutingSession
+
+# Run this script with pytest
+# pytest src/tests/test_replica_routing.py
+
+metadata = MetaData()
+items = Table("items", metadata, Column("id", Integer, primary_key=True), Column("source", String))
+
+def _engine(source):
+    # Two separate in-memory databases stand in for a primary and a replica
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(items), [{"id": 1, "source": source}])
+    return engine
+
+def _setup(lag=0.0):
+    primary, replica = _engine("primary"), _engine("replica")
+    replicas = ReplicaSet([Replica(name="replica", engine=replica)], max_lag=5.0, probe=lambda engine: lag)
+    factory = sessionmaker(class_=RoutingSession, replicas=replicas, bind=primary)
+    return factory, replicas
+
+def _source(db):
+    return db.execute(select(items.c.source).where(items.c.id == 1)).scalar()
+
+def test_reads_go_to_replica_until_a_write():
+    factory, _ = _setup()
+    with factory() as db:
+        assert _source(db) == "replica"
+        db.execute(insert(items).values(id=2, source="primary"))
+        assert db.on_primary
+        assert _source(db) == "primary"
+    with factory() as db:
+        assert _source(db) == "replica"
+
+def test_locking_reads_use_the_primary():
+    factory, _ = _setup()
+    with factory() as db:
+        assert db.execute(select(items.c.source).with_for_update()).scalar() == "primary"
+
+def test_lagging_or_failing_replica_falls_back_to_primary():
+    factory, replicas = _setup(lag=30.0)
+    replicas.check()
+    assert replicas.stats() == [{"name": "replica", "healthy": False, "lag": 30.0}]
+    with factory() as db:
+        assert _source(db) == "primary"
+
+    def broken(engine):
+        raise ConnectionError("replica down")
+    replicas.probe = broken
+    replicas.check()
+    assert replicas.choose() is None
+
+    replicas.probe = lambda engine: 0.5
+    replicas.check()
+    with factory() as db:
+        assert _source(db) == "replica"
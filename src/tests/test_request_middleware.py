@@ -0,0 +1,57 @@
+import logging
+import uuid
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from src.app import database, metrics
+from src.app.middleware import RequestInstrumentationMiddleware
+from src.app.request_context import get_request_id, span
+
+# Run this script with pytest
+# pytest src/tests/test_request_middleware.py
+
+def _app(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/r.db", poolclass=database.TimedQueuePool, pool_logging_name="request_test")
+    database.instrument_engine(engine, "request_test")
+    app = FastAPI()
+    app.add_middleware(RequestInstrumentationMiddleware, slow_request_threshold=0.000001)
+
+    # Sync endpoint: SQL runs in the threadpool
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with span("auth"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 2"))
+        return {"request_id": str(get_request_id())}
+
+    return app
+
+def test_request_id_sql_cost_and_slow_log(tmp_path, caplog):
+    client = TestClient(_app(tmp_path))
+    # App loggers do not propagate to root once the logging pipeline is set up
+    middleware_logger = logging.getLogger("src.app.middleware")
+    middleware_logger.addHandler(caplog.handler)
+    try:
+        response = client.get("/items/7")
+    finally:
+        middleware_logger.removeHandler(caplog.handler)
+
+    request_id = response.headers["x-request-id"]
+    assert response.json()["request_id"] == request_id
+    entry = caplog.records[-1].slow_request
+    assert entry["request_id"] == request_id and entry["route"] == "/items/{item_id}"
+    assert entry["db_statements"] == 2 and entry["status"] == 200
+    assert entry["spans"]["auth"]["db_ms"] <= entry["db_ms"]
+
+    output = metrics.render()
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 1' in output
+    assert 'http_request_db_statements_bucket{method="GET",route="/items/{item_id}",le="2"} 1' in output
+
+def test_incoming_request_id_is_kept(tmp_path):
+    client = TestClient(_app(tmp_path))
+    request_id = str(uuid.uuid4())
+    assert client.get("/items/1", headers={"X-Request-ID": request_id}).headers["x-request-id"] == request_id
+    assert client.get("/items/1", headers={"X-Request-ID": "not-a-uuid"}).headers["x-request-id"] != "not-a-uuid"
+    assert client.get("/missing").headers["x-request-id"]
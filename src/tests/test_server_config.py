@@ -0,0 +1,29 @@
+import os
+import pytest
+from sqlalchemy import create_engine, text
+from src.app import database
+
+# Run this script with pytest
+# pytest src/tests/test_server_config.py
+
+def test_pool_limits_split_the_connection_budget():
+    assert database.pool_limits(4, 5, 10, 0) == (5, 10)
+    assert database.pool_limits(8, 5, 10, 80) == (5, 5)
+    assert database.pool_limits(16, 5, 10, 80) == (5, 0)
+    assert database.pool_limits(40, 5, 10, 80) == (2, 0)
+    assert database.pool_limits(100, 5, 10, 80) == (1, 0)
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_worker_gets_fresh_pools(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fork.db", poolclass=database.TimedQueuePool, pool_logging_name="fork_test")
+    database.instrument_engine(engine, "fork_test")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    parent_pool = engine.pool
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if engine.pool is not parent_pool and engine.pool.checkedin() == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert engine.pool is parent_pool and parent_pool.checkedin() == 1